@@ -5,12 +5,27 @@ This module compiles the main functions used for the CausetSimulation classes in
 the creation of the causet, and allows to work with them aftewards, analycing its causal estructure and determining geodesics within this framework.
 
 Functions:
+    SeedStream: Given a seed (or a random generator), this function returns the numpy SeedSequence from which every random stream is derived.
+    ChildSeed: Given a SeedSequence and a key, this function derives the SeedSequence of an independent (child) random stream.
+    RandomStream: Given a SeedSequence and a key, this function returns the random generator of the corresponding child stream.
     SetCauset: Given a set of parameters for the simulation through a CausetSimulation class, this function creates a Causet.
+    CellVolumes: Given a manifold metric and the edges of a spacetime grid, this function computes the volume of every cell at once.
+    SprinkleCells: Given the edges and expected number of points of a block of grid cells, this function sprinkles points inside them.
+    SprinklePoints: Given a number of points, this function samples their positions from the exact (grid-free) point density.
+    SprinkleCauset: Vectorized version of SetCauset, returning the sprinkled points as a (N,2) array (grid or exact grid-free sampling).
     IsCausal: Given a manifold metric and two points, this function determines if they are causally connected.
     ChronologicalFuture: Given a causet, a manifold metric and a point, this functions computes all points in the causall future of the original.
     GetLinks: Given a CausetSimulation class, this functions creates a dictionary specifying the causal relation between points.
     GetGraph: Given a link dictionary describing the causal relation between points, this function creates a directed graph describing the same info.
+    LongestChainTable: Given a causal dictionary of links and a source point, this function computes the maximal chain length to every later point.
+    GeodesicLength: Given a causal dictionary of links, and two points, this function computes the length of the maximal chains between them.
+    GetMaximalChain: Given a causal dictionary of links, and two points, this function computes one maximal chain between said points.
+    MaximalChains: Given a causal dictionary of links, and two points, this function lazily generates every maximal chain between said points.
     GetGeodesic: Given a causal dictionary of links, and two points, this function computes all posible geodesic between said points.
+    LongestChainArray: Given a CSR adjacency of links and a source id, this function computes the maximal chain length to every later point.
+    LongestChainStream: Given a stream of the links arriving at each point, this function computes the maximal chain lengths from a source id.
+    MaximalChainIds: Given the past adjacency and chain lengths of a causet, this function lazily generates the maximal chains to a target id.
+    BatchMaximalChains: Given a CSR adjacency of links and many (source, target) id pairs, this function computes their maximal chains.
 
 Author: Cano Jones, Alejandro
 linkedin: www.linkedin.com/in/alejandro-cano-jones-5b20a7136
@@ -23,12 +38,14 @@ from __future__ import annotations #Dedicated to function typing
 from typing import TYPE_CHECKING #Dedicated to function typing
 if TYPE_CHECKING:
     from .Class_Objects import *
+    import networkx as nx
 
-from numpy.random import poisson, uniform #Random generator for Causet sprinkling
-from math import sin, asin, sinh, asinh, cos #Trigonometric functions
-from scipy.optimize import newton #Root solver f(x)=0
-from scipy.integrate import quad #Numerical integration
-import networkx as nx #Graph analysis
+import numpy as np #Vectorized computations, random generators for Causet sprinkling
+from concurrent.futures import ProcessPoolExecutor #Parallel sprinkling
+from math import sin, asin, sinh, asinh, pi #Trigonometric functions
+from scipy.optimize import minimize_scalar #Bounded maximization of the scale factor
+from .Causal_Structure import SortCauset, CausalMatrixBlocks, GetLinksCSR, LinksFromCSR #Vectorized causal structure
+from .Metric_Module import SpaceIntegral #Closed form space integral of the volume element
 
 
 ###################################
@@ -36,6 +53,72 @@ import networkx as nx #Graph analysis
 
 
 
+def SeedStream(seed: 'int | np.random.SeedSequence | np.random.Generator' = None) -> np.random.SeedSequence:
+    """
+    SeedStream function
+        Converts the seed of a simulation into the numpy SeedSequence from which all its random streams are derived. A random generator is
+        accepted too: the SeedSequence is then seeded with numbers drawn from it.
+
+    Parameters:
+        seed (int, SeedSequence or Generator): seed of the simulation.
+
+    Returns:
+        _ (SeedSequence): root of the random streams of the simulation (None if no seed is given, the global numpy state is used then).
+    """
+
+    if seed is None or isinstance(seed, np.random.SeedSequence): return seed
+    if isinstance(seed, np.random.Generator): return np.random.SeedSequence(seed.integers(2**32, size=4))
+    return np.random.SeedSequence(seed)
+
+
+###################################
+
+
+
+def ChildSeed(seq: np.random.SeedSequence, *key: int) -> np.random.SeedSequence:
+    """
+    ChildSeed function
+        Derives the SeedSequence of an independent random stream, identified by a key (a tuple of integers appended to the spawn key of the
+        parent, as SeedSequence.spawn does). Unlike spawn, the stream of a given key does not depend on how many streams were derived before,
+        so every block of a sprinkling (key (0, block)) and every replica of an ensemble (key (1, replica)) has always the same stream.
+
+    Parameters:
+        seq (SeedSequence): parent SeedSequence.
+        key (int): key of the child stream.
+
+    Returns:
+        _ (SeedSequence): SeedSequence of the child stream.
+    """
+
+    return np.random.SeedSequence(seq.entropy, spawn_key=tuple(seq.spawn_key)+key, pool_size=seq.pool_size)
+
+
+###################################
+
+
+
+def RandomStream(seq: np.random.SeedSequence, *key: int) -> np.random.Generator:
+    """
+    RandomStream function
+        Returns the random generator of the child stream of a SeedSequence with a given key (see ChildSeed). If there is no SeedSequence, the
+        global numpy random module is returned instead (it has the same poisson and uniform functions).
+
+    Parameters:
+        seq (SeedSequence): parent SeedSequence (or None).
+        key (int): key of the child stream.
+
+    Returns:
+        _ (Generator): random generator of the stream (numpy.random module if seq is None).
+    """
+
+    if seq is None: return np.random
+    return np.random.default_rng(ChildSeed(seq, *key))
+
+
+###################################
+
+
+
 def SetCauset(sim: CausetSimulation) -> set:
     """
     SetCauset function
@@ -51,6 +134,7 @@ def SetCauset(sim: CausetSimulation) -> set:
     
     #This rho parameter is the (const) point number density to be used throughout the manifold
     rho=sim.PointNumber/sim.Metric.ComputeVolume(sim.TimeRange, sim.SpaceRange) #Density = # of points / Volume 
+    random=RandomStream(sim.SeedSequence) #Random generator of the simulation (global numpy state if it has no seed)
     
     Causet=set() #Empty set to be added
 
@@ -59,6 +143,11 @@ def SetCauset(sim: CausetSimulation) -> set:
     Delta_T = (sim.TimeRange[1]-sim.TimeRange[0])/sim.Divisions[0]
     Delta_S = (sim.SpaceRange[1]-sim.SpaceRange[0])/sim.Divisions[1]
 
+    #The volumes of every submanifold are computed at once (the volume element is separable, see CellVolumes)
+    TimeEdges = np.array([sim.TimeRange[0]+i*Delta_T for i in range(sim.Divisions[0]+1)])
+    SpaceEdges = np.array([sim.SpaceRange[0]+j*Delta_S for j in range(sim.Divisions[1]+1)])
+    Volumes = CellVolumes(sim.Metric, TimeEdges, SpaceEdges)
+
     #Now we will cicle through each submanifold, computing its volume and determining how many (and where) points will have
     for i in range(sim.Divisions[0]):
         for j in range(sim.Divisions[1]):
@@ -67,17 +156,224 @@ def SetCauset(sim: CausetSimulation) -> set:
             TRange=(sim.TimeRange[0]+i*Delta_T, sim.TimeRange[0]+(i+1)*Delta_T)
             SRange=(sim.SpaceRange[0]+j*Delta_S, sim.SpaceRange[0]+(j+1)*Delta_S)
 
-            Vol=sim.Metric.ComputeVolume(TRange, SRange) #Volume of submanifold
-            N=poisson(rho*Vol) #The number of points inside this region of spacetime is given by a poisson random distribution
+            Vol=Volumes[i, j] #Volume of submanifold
+            N=random.poisson(rho*Vol) #The number of points inside this region of spacetime is given by a poisson random distribution
 
             #We "sprinkle" those N points inside the region, in a uniform random distribution, then add them to the causet
             for _ in range(N):
-                Causet.add((uniform(TRange[0],TRange[1]), (uniform(SRange[0],SRange[1]))))
+                Causet.add((random.uniform(TRange[0],TRange[1]), (random.uniform(SRange[0],SRange[1]))))
 
     return Causet
 
 
 ###################################
+
+
+
+def CellVolumes(Metric: MetricTensor, TimeEdges: np.ndarray, SpaceEdges: np.ndarray) -> np.ndarray:
+    """
+    CellVolumes function
+        The FLRW volume element a(t)/sqrt(1-k*r^2) is separable, so the volume of a rectangular cell is the product of a time integral and a
+        space integral. The space integral is r, asinh(r) or asin(r) (see SpaceIntegral) and the time integral is a difference of the
+        cumulative integral of the scale factor (closed form, or tabulated once, see MetricTensor.CumulativeScale), so the volumes of every
+        cell of a grid are computed at once, without any quadrature per cell.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        TimeEdges (float array): edges of the grid in the time direction (length Divisions[0]+1).
+        SpaceEdges (float array): edges of the grid in the space direction (length Divisions[1]+1).
+
+    Returns:
+        Volumes (2D float array): volume of each cell, with shape (Divisions[0], Divisions[1]).
+    """
+
+    TimeEdges, SpaceEdges = np.asarray(TimeEdges, dtype=np.float64), np.asarray(SpaceEdges, dtype=np.float64)
+    A = np.diff(Metric.CumulativeScale(TimeEdges)) #Time integral of the scale factor over each time row
+    R = np.diff(SpaceIntegral(Metric.kappa, SpaceEdges)) #Space integral of the spacial part of the volume element over each space column
+
+    return np.outer(A, R) #Volume of each cell
+
+
+###################################
+
+
+
+def SprinkleCells(TimeEdges: np.ndarray, SpaceEdges: np.ndarray, Expected: np.ndarray, random: np.random.Generator = np.random) -> np.ndarray:
+    """
+    SprinkleCells function
+        Sprinkles points inside a block of grid cells: the number of points of each cell is drawn from a Poisson distribution, and their
+        positions are uniformly distributed inside the cell.
+
+    Parameters:
+        TimeEdges (float array): edges of the block of cells in the time direction.
+        SpaceEdges (float array): edges of the block of cells in the space direction.
+        Expected (2D float array): expected number of points of each cell (density times volume).
+        random (Generator): random generator (or the numpy.random module).
+
+    Returns:
+        Points (2D float array): (N,2) array of sprinkled points, each row being (t, r).
+    """
+
+    N = random.poisson(Expected).ravel() #Number of points inside each submanifold
+    cells = np.repeat(np.arange(N.size), N) #Submanifold of each point
+    i, j = np.divmod(cells, Expected.shape[1]) #Time and space index of the submanifold of each point
+
+    #Uniform random position of each point inside its submanifold
+    T = random.uniform(TimeEdges[i], TimeEdges[i+1])
+    X = random.uniform(SpaceEdges[j], SpaceEdges[j+1])
+
+    return np.column_stack((T, X))
+
+
+###################################
+
+
+
+def SprinklePoints(Metric: MetricTensor, TimeRange: tuple[float], SpaceRange: tuple[float], a_max: float, N: int,
+                   random: np.random.Generator = np.random) -> np.ndarray:
+    """
+    SprinklePoints function
+        Samples the positions of N points from the exact (grid-free) point density a(t)/sqrt(1-k*r^2). Since it is separable, the space
+        coordinate is sampled by inverting its (closed form) cumulative distribution, while the time coordinate is sampled by rejection against
+        the maximum of the scale factor.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        TimeRange (2D float tuple): lower and upper time bounds of the region.
+        SpaceRange (2D float tuple): lower and upper space bounds of the region.
+        a_max (float): maximum of the scale factor inside TimeRange.
+        N (int): number of points.
+        random (Generator): random generator (or the numpy.random module).
+
+    Returns:
+        Points (2D float array): (N,2) array of sprinkled points, each row being (t, r).
+    """
+
+    T_inf, T_sup = TimeRange
+    S_inf, S_sup = SpaceRange
+
+    #Space coordinate: the cumulative distribution of 1/sqrt(1-k*r^2) is r, asinh(r) or asin(r), which are inverted in closed form
+    if Metric.kappa == 0:
+        X = random.uniform(S_inf, S_sup, N)
+    elif Metric.kappa == -1:
+        X = np.sinh(random.uniform(np.arcsinh(S_inf), np.arcsinh(S_sup), N))
+    else:
+        X = np.sin(random.uniform(np.arcsin(S_inf), np.arcsin(S_sup), N))
+
+    #Time coordinate: rejection sampling with density proportional to a(t)
+    if Metric.ScaleType == 'constant': #Constant scale factor, uniform distribution
+        T = random.uniform(T_inf, T_sup, N)
+    else:
+        T = np.empty(0)
+        while T.size < N: #Candidates are drawn in batches until enough of them are accepted
+            candidates = random.uniform(T_inf, T_sup, 2*(N-T.size)+16)
+            accepted = random.uniform(0, a_max, candidates.size) <= Metric.ScaleFactor(candidates)
+            T = np.concatenate((T, candidates[accepted]))
+        T = T[:N]
+
+    return np.column_stack((T, X))
+
+
+###################################
+
+
+
+def _SprinkleCellsBlock(TimeEdges: np.ndarray, SpaceEdges: np.ndarray, Expected: np.ndarray, seq: np.random.SeedSequence,
+                        block: int) -> np.ndarray:
+    """
+    _SprinkleCellsBlock function
+        SprinkleCells with the random stream of a block (key (0, block)), used by the worker processes.
+    """
+    return SprinkleCells(TimeEdges, SpaceEdges, Expected, RandomStream(seq, 0, block))
+
+
+def _SprinklePointsBlock(Metric: MetricTensor, TimeRange: tuple[float], SpaceRange: tuple[float], a_max: float, N: int,
+                         seq: np.random.SeedSequence, block: int) -> np.ndarray:
+    """
+    _SprinklePointsBlock function
+        SprinklePoints with the random stream of a block (key (0, block)), used by the worker processes.
+    """
+    return SprinklePoints(Metric, TimeRange, SpaceRange, a_max, N, RandomStream(seq, 0, block))
+
+
+###################################
+
+
+
+def SprinkleCauset(sim: CausetSimulation, method: str = 'vectorized', workers: int = 1) -> np.ndarray:
+    """
+    SprinkleCauset function
+        Vectorized "sprinkling" algorithm. Two methods are available:
+            'vectorized': same grid algorithm as SetCauset, but all cell volumes, Poisson numbers and uniform coordinates are drawn at once.
+            'exact': grid free sampling. The total number of points is drawn from a Poisson distribution, and since the point density
+                a(t)/sqrt(1-k*r^2) is separable, the space coordinate is sampled by inverting its (closed form) cumulative distribution,
+                while the time coordinate is sampled by rejection against the maximum of the scale factor.
+        If the simulation has a seed, the grid (or the points) is split into blocks of fixed size, each one with its own random stream (see
+        ChildSeed); blocks can then be sprinkled by a pool of processes, and the causet is the same for any number of workers.
+
+    Parameters:
+        sim (CausetSimulation class): set of parameters describing the model to be considered.
+        method (str): sprinkling method, 'vectorized' or 'exact'.
+        workers (int): number of processes sprinkling the blocks (a simulation without seed uses a fresh random seed if workers > 1).
+
+    Returns:
+        Points (2D float array): contiguous (N,2) array of sprinkled points, each row being (t, r).
+    """
+
+    T_inf, T_sup = sim.TimeRange
+    seq = sim.SeedSequence
+    if seq is None and workers > 1: seq = np.random.SeedSequence() #Workers need independent streams
+
+    if method == 'vectorized':
+        #Edges of the submanifolds (divisions) of the spacetime region
+        TimeEdges = np.linspace(T_inf, T_sup, sim.Divisions[0]+1)
+        SpaceEdges = np.linspace(*sim.SpaceRange, sim.Divisions[1]+1)
+
+        Vol = CellVolumes(sim.Metric, TimeEdges, SpaceEdges) #Volume of every submanifold
+        rho = sim.PointNumber/Vol.sum() #Density = # of points / Volume
+        Expected = rho*Vol #Expected number of points inside each submanifold
+
+        if seq is None: #Single draw from the global numpy random state
+            return np.ascontiguousarray(SprinkleCells(TimeEdges, SpaceEdges, Expected), dtype=np.float64)
+
+        rows = max(1, 2**16//sim.Divisions[1]) #Time rows of each block (fixed, so blocks do not depend on the number of workers)
+        blocks = [(TimeEdges[i:i+rows+1], SpaceEdges, Expected[i:i+rows], seq, b) for b, i in enumerate(range(0, sim.Divisions[0], rows))]
+        Sprinkle = _SprinkleCellsBlock
+
+    elif method == 'exact':
+        if sim.Metric.ScaleType in ('constant', 'power', 'exponential'): #Monotonic scale factors reach their maximum at the time boundaries
+            a_max = max(sim.Metric.a(T_inf), sim.Metric.a(T_sup))
+        else:
+            #The maximum of the scale factor on a fine grid is refined with a bounded maximization around it
+            grid = np.linspace(T_inf, T_sup, 1025)
+            values = sim.Metric.ScaleFactor(grid)
+            m = int(np.argmax(values))
+            bounds = (grid[max(m-1, 0)], grid[min(m+1, grid.size-1)])
+            refined = minimize_scalar(lambda t: -sim.Metric.a(t), bounds=bounds, method='bounded')
+            a_max = max(values[m], -refined.fun)
+
+        N = RandomStream(seq).poisson(sim.PointNumber) #Total number of points inside the region
+
+        if seq is None: #Single draw from the global numpy random state
+            return np.ascontiguousarray(SprinklePoints(sim.Metric, sim.TimeRange, sim.SpaceRange, a_max, N), dtype=np.float64)
+
+        size = 2**16 #Points of each block (fixed, so blocks do not depend on the number of workers)
+        blocks = [(sim.Metric, sim.TimeRange, sim.SpaceRange, a_max, min(size, N-i), seq, b) for b, i in enumerate(range(0, N, size))]
+        Sprinkle = _SprinklePointsBlock
+
+    else:
+        raise ValueError(f"Unknown sprinkling method '{method}', use 'vectorized' or 'exact'")
+
+    if workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            points = list(pool.map(Sprinkle, *zip(*blocks))) #Blocks are returned in order
+    else:
+        points = [Sprinkle(*block) for block in blocks]
+
+    return np.ascontiguousarray(np.concatenate(points) if points else np.empty((0, 2)), dtype=np.float64) #(N,2) array of points
+
+
+###################################
     
 
 def IsCausal(Metric: MetricTensor, point1: tuple[float], point2: tuple[float]) -> bool:
@@ -99,77 +395,36 @@ def IsCausal(Metric: MetricTensor, point1: tuple[float], point2: tuple[float]) -
     if point2[0]<point1[0]: return False
 
 
-    #To determine if there is a timelike geodesic between the two points, knowing if the scale factor is a constant will save computational power.
-    def a_IsConstant(Metric) -> bool: 
-        """
-        a_IsConstant function
-            Given a MetricTensor class, this function determines if the scale factor of the (1+1) FLRW metric is constant in time.
-        Parameters:
-            Metric (MetricTensor class): class describing the metric manifold.
-        """
-
-        from sympy import simplify, symbols #Symbolic computation library functions
-
-        is_it = None #Boolean variable, if true, the scale factor will be constant
+    #Conformal time elapsed between point1 and a time t; the MetricTensor class uses its closed form, or its conformal time table, so that
+    #no numerical integration is needed.
+    Conformal = lambda t: Metric.ConformalInterval(point1[0], t)
 
-        #To determine if the scale factor is a constant, we will check if its derivative (saved into the MetricTensor class) is zero.
-
-        try:
-            is_it = (simplify(Metric.da(symbols('t')))==0) #Convert the derivative of scale factor to symbolic function and check if its zero
-        except:
-            is_it = False
-            
-        return is_it
-    
-    inv_a = lambda t: 1/Metric.a(t) #This function will become handy afterwards
     r"""
     To be able to determine if there is a timelike geodesic between the two points, we will trace a null geodesic starting at point1 and
     ending at the same temporal coordinate as point2; and then checking whether point2 is in the lightcone of point1. To be able to do that, we
     solve for the differential equation 
-    $\frac{\td r}{\td t}=\pm\frac{c}{a(t)}\sqrt{1-\kappa r^2}\frac{\td r}{\td t}=\pm\frac{c}{a(t)}\sqrt{1-\kappa r^2}$
+    $\frac{\td r}{\td t}=\pm\frac{c}{a(t)}\sqrt{1-\kappa r^2}$
     which has different forms for each value of kappa (-1,0,1); described bellow.
     """
     
     if Metric.kappa == 0: #Flat space
+        #Trajectories of light are of the form $r(t)=r_1\pm \int \frac{\text{d}t}{a(t)}$ (linear if the scale factor is constant)
+        DeltaR = point2[1]-point1[1] #Spacial distance between points
+        Int_inv_a = Conformal(point2[0]) #Maximum distance travelled by light
 
-        if a_IsConstant(Metric=Metric): #Minkowskian spacetime
-            #Geodesics are linear
-
-            DeltaR = point2[1]-point1[1] #Spacial distance between points
-            DeltaTxinv_a = (point2[0]-point1[0])*inv_a(point1[0]) #Maximum distance travelled by light
-
-            #If the distance between the two points is less than the maximum distance travelled by light, they must be causally conected.
-            if DeltaR <= DeltaTxinv_a and DeltaR >= -DeltaTxinv_a:  return True
-            else: return False
-
-        else:
-            #Similar method as previous analysis, this time, trajectories are not linear, integration is needed to account for scale factor
-            DeltaR = point2[1]-point1[1]
-            Int_inv_a = quad(inv_a, point1[0], point2[0])[0] #Maximum distance travelled by light
-
-             #If the distance between the two points is less than the maximum distance travelled by light, they must be causally conected.
-            if DeltaR <= Int_inv_a and DeltaR >= -Int_inv_a:  return True
-            else: return False
+        #If the distance between the two points is less than the maximum distance travelled by light, they must be causally conected.
+        if DeltaR <= Int_inv_a and DeltaR >= -Int_inv_a:  return True
+        else: return False
     
     elif Metric.kappa == -1: #Hyperbolic space
-        #solutions of trajectory of the form $\asin(r(t))=\pm \int \frac{\text{d}t}{a(t)}$
-        if a_IsConstant(Metric=Metric):
-            #If scale factor constant, easy integration, we compute the maximum distance for a point to have travelled (each direction)
-            Right = sinh(asinh(point1[1])+(point2[0]-point1[0])*inv_a(point1[0]))
-            Left = sinh(asinh(point1[1])-(point2[0]-point1[0])*inv_a(point1[0]))
-
-            #If the second point is between those maximum distances, the two points are causally connected
-            if point2[1] <= Right and point2[1] >= Left: return True
-            else: return False
-
-        else:
-            #Non constant, numerical integration needed to compute maximum distance for light
-            Right = sinh(asinh(point1[1])+quad(inv_a, point1[0], point2[0])[0])
-            Left = sinh(asinh(point1[1])-quad(inv_a, point1[0], point2[0])[0])
-
-            #If the second point is between those maximum distances, the two points are causally connected
-            if point2[1] <= Right and point2[1] >= Left: return True
-            else: return False
+        #solutions of trajectory of the form $\asinh(r(t))=\pm \int \frac{\text{d}t}{a(t)}$
+        #We compute the maximum distance for a point to have travelled (each direction)
+        Right = sinh(asinh(point1[1])+Conformal(point2[0]))
+        Left = sinh(asinh(point1[1])-Conformal(point2[0]))
+
+        #If the second point is between those maximum distances, the two points are causally connected
+        if point2[1] <= Right and point2[1] >= Left: return True
+        else: return False
     
     elif Metric.kappa == 1: #Spherical space, can be circumnavigated
         r"""
@@ -178,71 +433,25 @@ def IsCausal(Metric: MetricTensor, point1: tuple[float], point2: tuple[float]) -
         ray will arrive at the r=\pm 1 mark, then check wether point2 time coordinate is passed that time (then any timelike trajectory would be
         able to arrive there); if this is not the case, we will need to check case by case the relative position of point2 in relation to this 
         null geodesic.
-        To be able to find the solution of r(t)=\pm 1 we will use the Newton-Raphson method, which uses the derivative of r(t).
+        The light rays arrive at r=1 and r=-1 (conformal distance \pm\pi/2) once the elapsed conformal time is \pi/2-\asin(r_1) and
+        \pi/2+\asin(r_1) respectively, so these horizon times t_right, t_left are known analytically (see HorizonTimes) and no root finding is
+        needed. Since the conformal time grows with t, comparing the time of point2 with them is comparing conformal times.
         """
 
-        if a_IsConstant(Metric=Metric):
-            #Constant scale factor, easy integration
-
-            #Functions f(t)=0 used for the Newton-Raphson method, each for r(t)=1 and r(t)=-1
-            def F_Rifght(t):
-                if t<point1[0]: return 1e6 #Penalization function to ensure that the solution found is at a future time
-                return sin(asin(point1[1])+(t-point1[0])*Metric.a(t))-1
-            def F_Left(t):
-                if t<point1[0]: return 1e6 #Penalization function to ensure that the solution found is at a future time
-                return sin(asin(point1[1])-(t-point1[0])*Metric.a(t))+1
-
-            #Derivatives of f(t) used for the Newton-Raphson method, each for r(t)=1 and r(t)=-1
-            def DerF_Right(t):
-                return cos(asin(point1[1])+(t-point1[0])*Metric.a(t))*inv_a(t)
-            def DerF_Left(t):
-                return -cos(asin(point1[1])-(t-point1[0])*Metric.a(t))*inv_a(t)
-
-            #We usethe Newton-Raphson method to find the solution of r(t)=\pm 1
-            t_right=newton(F_Rifght, point1[0], DerF_Right)
-            t_left=newton(F_Left, point1[0], DerF_Left)
-
-            #If point2 is passed the time at which r(t)=\pm 1, there must be a timelike geodesic connecting the two points
-            if point2[0]>t_right and point2[0]>t_left: return True    
-
-            #If point2 is not passed that time, we must check the relative position
-            s_Right=sin(asin(point1[1])+(point2[0]-point1[0])*Metric.a(point2[0]))
-            if point2[0]>t_left and point2[1]<s_Right: return True
-            
-            s_Left=sin(asin(point1[1])-(point2[0]-point1[0])*Metric.a(point2[0]))
-            if point2[0]>t_right and point2[1]>s_Left: return True
+        chi1 = asin(point1[1]) #Conformal distance of point1
+        DeltaEta = Conformal(point2[0]) #Conformal time elapsed until the time of point2
+        Right = DeltaEta > pi/2-chi1 #point2 is passed the time at which r(t)=1
+        Left = DeltaEta > pi/2+chi1 #point2 is passed the time at which r(t)=-1
 
-        else:
-            #Non constant scale factor, integration needed 
-
-            #Functions f(t)=0 used for the Newton-Raphson method, each for r(t)=1 and r(t)=-1
-            def F_Rifght(t):
-                if t<point1[0]: return 1e6 #Penalization function to ensure that the solution found is at a future time
-                return sin(asin(point1[1])+quad(inv_a, point1[0], t)[0])-1
-            def F_Left(t):
-                if t<point1[0]: return 1e6 #Penalization function to ensure that the solution found is at a future time
-                return sin(asin(point1[1])-quad(inv_a, point1[0], t)[0])+1
-            
-            #Derivatives of f(t) used for the Newton-Raphson method, each for r(t)=1 and r(t)=-1
-            def DerF_Right(t):
-                return cos(asin(point1[1])+quad(inv_a, point1[0], t)[0])*inv_a(t)
-            def DerF_Left(t):
-                return -cos(asin(point1[1])-quad(inv_a, point1[0], t)[0])*inv_a(t)
-            
-
-            #We usethe Newton-Raphson method to find the solution of r(t)=\pm 1
-            t_right=newton(F_Rifght, point1[0], DerF_Right)
-            t_left=newton(F_Left, point1[0], DerF_Left)
-
-            #If point2 is passed the time at which r(t)=\pm 1, there must be a timelike geodesic connecting the two points
-            if point2[0]>t_right and point2[0]>t_left: return True    
-
-            #If point2 is not passed that time, we must check the relative position
-            s_Right=sin(asin(point1[1])+quad(inv_a, point1[0], point2[0])[0])
-            if point2[0]>t_left and point2[1]<s_Right: return True
-            
-            s_Left=sin(asin(point1[1])-quad(inv_a, point1[0], point2[0])[0])
-            if point2[0]>t_right and point2[1]>s_Left: return True
+        #If point2 is passed the time at which r(t)=\pm 1, there must be a timelike geodesic connecting the two points
+        if Right and Left: return True
+
+        #If point2 is not passed that time, we must check the relative position
+        s_Right=sin(chi1+DeltaEta)
+        if Left and point2[1]<s_Right: return True
+        
+        s_Left=sin(chi1-DeltaEta)
+        if Right and point2[1]>s_Left: return True
     
     return False #If no True value has been returned, then the two points cannot be causally conected
 
@@ -275,7 +484,7 @@ def ChronologicalFuture(point: tuple[float], Causet: set[tuple[float]], metric:
 
 
 
-def GetLinks(sim: CausetSimulation) -> dict:
+def GetLinks(sim: CausetSimulation, method: str = 'sets') -> dict:
     """
     GetLinks function:
         This function will describe the causal structure of a causet in a particular way: it will create a dictionary, in which the keys are
@@ -283,14 +492,37 @@ def GetLinks(sim: CausetSimulation) -> dict:
         causet such that p<g<qi.
     Parameters:
         sim (CausetSimulation class): set of parameters describing the model to be considered.
+        method (str): 'sets' tests the causal relation pair by pair (IsCausal); 'matrix' computes the causal future of every point from
+            the vectorized causal matrix (CausalMatrixBlocks); 'reduction' computes the links directly with a transitive reduction of the
+            causal matrix (GetLinksCSR), without storing the future of every point.
     Returns:
         link_dic (dic): dictiornary encoding causal structure of a causet.
     """
 
+    if method == 'reduction':
+        Points = SortCauset(sim.Causet) #Points sorted by time
+        indptr, indices = GetLinksCSR(sim.Metric, Points, TimeRange=sim.TimeRange) #Links as a CSR adjacency
+        return LinksFromCSR(Points, indptr, indices)
+
     dic={} #Empty (auxiliary) dictionary to be completed
     
-    for p in sim.Causet: #Loop for each point in causet
-        dic[p]=ChronologicalFuture(p,sim.Causet,sim.Metric) #We add a new entry in the dictionary with key as a point, and value as a set of its causal future
+    if method == 'sets':
+        for p in sim.Causet: #Loop for each point in causet
+            dic[p]=ChronologicalFuture(p,sim.Causet,sim.Metric) #We add a new entry in the dictionary with key as a point, and value as a set of its causal future
+
+    elif method == 'matrix':
+        Points = SortCauset(sim.Causet) #Points sorted by time
+        keys = list(map(tuple, Points.tolist())) #Points as tuples
+        N = len(keys)
+
+        #The causal matrix is computed (and consumed) by blocks of rows
+        for start, block in CausalMatrixBlocks(sim.Metric, Points, TimeRange=sim.TimeRange):
+            rows = np.unpackbits(block, axis=1, count=N).astype(bool)
+            for i, row in enumerate(rows):
+                dic[keys[start+i]] = {keys[j] for j in np.flatnonzero(row)} #Causal future of each point
+
+    else:
+        raise ValueError(f"Unknown method '{method}', use 'sets', 'matrix' or 'reduction'")
     
     link_dic={} #Empty dictionary to be completed
 
@@ -320,6 +552,8 @@ def GetGraph(Links: dict[tuple, set]) -> nx.digraph:
         G (nx.digraph): Graph nx data structure describing direct causal structure of a causet. 
     """
 
+    import networkx as nx #Graph analysis (only needed to export the causal structure)
+
     G=nx.DiGraph() #Empty graph data structure to be completed
 
     keys = Links.keys() #Causet
@@ -339,6 +573,137 @@ def GetGraph(Links: dict[tuple, set]) -> nx.digraph:
 
 
 
+def LongestChainTable(links: dict[tuple, set], source: tuple[float], target: tuple[float] = None) -> tuple[dict, dict]:
+    """
+    LongestChainTable function:
+        Computes, by dynamic programming over the (direct) causal graph, the length of the longest chain from a source point to every point
+        in its future. The time coordinate of the points is used as a topological order of the graph (a link always points to the future),
+        so every point is visited once and every link is relaxed once; the cost is O(N + links) after sorting.
+    Parameters:
+        links (dict): dictionary describing (direct) causal structure of the causet.
+        source (2D float tuple): starting point of the chains.
+        target (2D float tuple): if given, points later than the target are not considered.
+    Returns:
+        length (dict): for every point reachable from source, number of points in the longest chain from source to it.
+        parents (dict): for every point reachable from source, list of previous points along its longest chains.
+    """
+
+    length = {source: 1} #The source is a chain of a single point
+    parents = {source: []} #The source has no previous point
+
+    T_sup = target[0] if target is not None else float('inf') #Points after this time cannot be part of a chain to the target
+
+    #Only points between source and target (in time) can be part of the chains; sorting them by time yields a topological order
+    order = sorted(p for p in links if source[0] <= p[0] <= T_sup)
+
+    for p in order: #Loop for each point, in chronological order
+        if p not in length: continue #Points not reachable from source are ignored
+
+        new = length[p]+1 #Length of the chains going through p to its direct future
+        for q in links[p]: #Each link from p is relaxed
+            if q[0] > T_sup: continue
+            old = length.get(q, 0)
+            if new > old: #A longer chain has been found
+                length[q] = new
+                parents[q] = [p]
+            elif new == old: #Another chain with the same (maximal) length
+                parents[q].append(p)
+
+    return length, parents
+
+
+##################################
+
+
+
+def GeodesicLength(links: dict[tuple, set], source: tuple[float], target: tuple[float]) -> int:
+    """
+    GeodesicLength function:
+        Computes the length (number of points) of the maximal chains between two points of a causet.
+    Parameters:
+        links (dict): dictionary describing (direct) causal structure of the causet.
+        source (2D float tuple): starting point in the geodesic.
+        target (2D float tuple): ending point of the geodesic.
+    Returns:
+        _ (int): number of points in the maximal chains between source and target (0 if they are not causally connected).
+    """
+
+    length, _ = LongestChainTable(links, source, target)
+    return length.get(target, 0)
+
+
+##################################
+
+
+
+def GetMaximalChain(links: dict[tuple, set], source: tuple[float], target: tuple[float]) -> list:
+    """
+    GetMaximalChain function:
+        Computes one maximal chain (a single geodesic) between two points of a causet, avoiding the enumeration of all of them.
+    Parameters:
+        links (dict): dictionary describing (direct) causal structure of the causet.
+        source (2D float tuple): starting point in the geodesic.
+        target (2D float tuple): ending point of the geodesic.
+    Returns:
+        chain (list of 2D tuples): ordered points of a maximal chain from source to target (empty if they are not causally connected).
+    """
+
+    length, parents = LongestChainTable(links, source, target)
+    if target not in length: return [] #No chain between source and target
+
+    #The chain is recovered walking backwards from the target through any of its longest-chain parents
+    chain = [target]
+    while chain[-1] != source:
+        chain.append(parents[chain[-1]][0])
+
+    return chain[::-1]
+
+
+##################################
+
+
+
+def MaximalChains(links: dict[tuple, set], source: tuple[float], target: tuple[float]):
+    """
+    MaximalChains function:
+        Lazy generator over all maximal chains between two points of a causet. The number of maximal chains can grow quickly with the size
+        of the causet, with this generator they are produced one by one (depth-first over the longest-chain parents of the target).
+    Parameters:
+        links (dict): dictionary describing (direct) causal structure of the causet.
+        source (2D float tuple): starting point in the geodesic.
+        target (2D float tuple): ending point of the geodesic.
+    Yields:
+        chain (list of 2D tuples): ordered points of a maximal chain from source to target.
+    """
+
+    length, parents = LongestChainTable(links, source, target)
+    if target not in length: return #No chain between source and target
+    if target == source:
+        yield [source]
+        return
+
+    path = [target] #Current (reversed) partial chain
+    stack = [iter(parents[target])] #Parents still to be explored for each point in path
+
+    while stack:
+        p = next(stack[-1], None)
+        if p is None: #Every parent of the last point has been explored
+            stack.pop()
+            path.pop()
+            continue
+
+        path.append(p)
+        if p == source: #A complete chain has been found
+            yield path[::-1]
+            path.pop()
+        else:
+            stack.append(iter(parents[p]))
+
+
+##################################
+
+
+
 def GetGeodesic(links: dict[tuple, set], source: tuple[float], target: tuple[float]) -> list:
     """
     GetGeodesic function:
@@ -352,21 +717,181 @@ def GetGeodesic(links: dict[tuple, set], source: tuple[float], target: tuple[flo
         longest_paths (list of lists of 2D tuples): list containing all possible geodesics between source and target.
     """
 
-    G=GetGraph(links) #nx graph data structure encoding causal structure of the causet
+    #The longest paths are obtained from the longest chain table (dynamic programming), instead of enumerating every path of the graph
+    return list(MaximalChains(links, source=source, target=target))
 
-    longest_paths = [] #Empty list of paths in the geodesic from  soruce to target
 
-    
-    paths = nx.all_simple_paths(G, source=source, target=target) #List of all posible paths between source and target
-
-    longest_path_length = 0 #Auxiliary variable (encounter with longest path will upgrade this value)
-    #In the following loop we will select only the paths with maximal length
-    for path in paths:
-        if len(path) > longest_path_length: #If the path has a larger length than previously found
-            longest_path_length = len(path)
-            longest_paths.clear()
-            longest_paths.append(path)
-        elif len(path) == longest_path_length: #If it has the same length as the longest
-            longest_paths.append(path)
-
-    return longest_paths
+
+##################################
+
+
+
+def LongestChainArray(indptr: np.ndarray, indices: np.ndarray, source: int, target: int = None, BlockSize: int = 2**16) -> np.ndarray:
+    """
+    LongestChainArray function:
+        Array version of LongestChainTable, working directly on a CSR adjacency of links over time sorted ids (see CausetArray), so no graph
+        has to be built. Since ids are sorted by time they are a topological order, and the longest chains are computed with a single sweep.
+        The adjacency is read in consecutive (time ordered) blocks of points, so memory mapped links are streamed from disk only once.
+    Parameters:
+        indptr (int array): CSR index pointer of the links.
+        indices (int array): CSR indices of the links.
+        source (int): id of the starting point of the chains.
+        target (int): if given, the sweep stops at this id (lengths of later points are not computed).
+        BlockSize (int): number of points whose links are read at once.
+    Returns:
+        length (int array): for every id, number of points in the longest chain from source to it (0 if not reachable).
+    """
+
+    N = len(indptr)-1
+    stop = N if target is None else target+1 #Points after the target can not be part of a chain to it
+
+    length = np.zeros(N, dtype=np.int64)
+    length[source] = 1 #The source is a chain of a single point
+
+    for start in range(source, stop, BlockSize): #Blocks of points, in chronological order
+        end = min(start+BlockSize, stop)
+        ptr = np.array(indptr[start:end+1]) #Links of the block, copied into memory
+        links = np.array(indices[ptr[0]:ptr[-1]])
+        ptr -= ptr[0]
+
+        for i in range(start, end): #Loop for each point, in chronological order
+            l = length[i]
+            if l == 0: continue #Points not reachable from source are ignored
+            future = links[ptr[i-start]:ptr[i-start+1]] #Links from i
+            length[future] = np.maximum(length[future], l+1) #Every link from i is relaxed at once
+
+    length[stop:] = 0 #Lengths after the target are not final
+    return length
+
+
+##################################
+
+
+
+def LongestChainStream(stream, N: int, source: int, target: int = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    LongestChainStream function:
+        Streaming version of LongestChainArray: it consumes the links arriving at each point, in time order (see StreamLinks), so the links
+        are never stored. The longest chain to a point only depends on the chains to its direct past, which are already final. Only the past
+        links lying on a longest chain (those whose past point has exactly one less point in its longest chain) are kept, which is all
+        MaximalChainIds needs to build the chains.
+    Parameters:
+        stream (generator): (j, past) pairs of a causet with N points, in increasing order of j (see StreamLinks).
+        N (int): number of points of the causet.
+        source (int): id of the starting point of the chains.
+        target (int): if given, the stream is consumed only up to this id.
+    Returns:
+        length (int array): for every id, number of points in the longest chain from source to it (0 if not reachable).
+        pastptr (int array): CSR index pointer of the kept (reversed) links.
+        pastind (int array): CSR indices of the kept (reversed) links.
+    """
+
+    stop = N if target is None else target+1 #Points after the target can not be part of a chain to it
+
+    length = np.zeros(N, dtype=np.int64)
+    pastptr = np.zeros(N+1, dtype=np.int64)
+    parents = [] #Past links on a longest chain, point after point
+
+    for j, past in stream:
+        if j >= stop: break
+        if j == source:
+            length[j] = 1 #The source is a chain of a single point
+        elif j > source and past.size:
+            l = length[past].max()
+            if l > 0: #Points not reachable from source have length 0
+                length[j] = l+1
+                parents.extend(past[length[past] == l].tolist())
+        pastptr[j+1] = len(parents)
+
+    pastptr[stop:] = len(parents)
+    return length, pastptr, np.array(parents, dtype=np.int64)
+
+
+##################################
+
+
+
+def MaximalChainIds(pastptr: np.ndarray, pastind: np.ndarray, length: np.ndarray, source: int, target: int):
+    """
+    MaximalChainIds function:
+        Lazy generator over all maximal chains between two ids, walking backwards from the target through the links whose past point has
+        exactly one less point in its longest chain (depth-first).
+    Parameters:
+        pastptr (int array): CSR index pointer of the links reversed (past adjacency, see TransposeCSR).
+        pastind (int array): CSR indices of the links reversed.
+        length (int array): longest chain lengths from source (see LongestChainArray).
+        source (int): id of the starting point of the chains.
+        target (int): id of the ending point of the chains.
+    Yields:
+        chain (list of int): ordered ids of a maximal chain from source to target.
+    """
+
+    if length[target] == 0: return #No chain between source and target
+    if target == source:
+        yield [source]
+        return
+
+    def parents(j): #Previous points along the longest chains to j
+        past = pastind[pastptr[j]:pastptr[j+1]]
+        return iter(past[length[past] == length[j]-1].tolist())
+
+    path = [target] #Current (reversed) partial chain
+    stack = [parents(target)] #Parents still to be explored for each point in path
+
+    while stack:
+        p = next(stack[-1], None)
+        if p is None: #Every parent of the last point has been explored
+            stack.pop()
+            path.pop()
+            continue
+
+        path.append(p)
+        if p == source: #A complete chain has been found
+            yield path[::-1]
+            path.pop()
+        else:
+            stack.append(parents(p))
+
+
+
+##################################
+
+
+
+def BatchMaximalChains(indptr: np.ndarray, indices: np.ndarray, pastptr: np.ndarray, pastind: np.ndarray,
+                       pairs: list[tuple[int]], AllChains: bool = False) -> tuple[list, list]:
+    """
+    BatchMaximalChains function:
+        Computes the maximal chains between many pairs of ids. Pairs are grouped by source, and a single longest chain sweep (up to the
+        latest target of the source) is shared by all targets of the same source.
+    Parameters:
+        indptr, indices (int arrays): CSR adjacency of the links.
+        pastptr, pastind (int arrays): CSR adjacency of the links reversed (see TransposeCSR).
+        pairs (list of 2D int tuples): (source, target) ids.
+        AllChains (bool): if True every maximal chain of each pair is computed, otherwise only one of them.
+    Returns:
+        chains (list): for each pair, list of maximal chains (each one a list of ids).
+        lengths (list of int): for each pair, number of points in its maximal chains (0 if not causally connected).
+    """
+
+    chains = [None]*len(pairs)
+    lengths = [0]*len(pairs)
+
+    #Pairs are grouped by source
+    groups = {}
+    for n, (source, target) in enumerate(pairs):
+        groups.setdefault(source, []).append(n)
+
+    for source, members in groups.items():
+        length = LongestChainArray(indptr, indices, source, max(pairs[n][1] for n in members)) #One sweep for every target
+
+        for n in members:
+            target = pairs[n][1]
+            if target < source: #Targets before the source are not connected (and the sweep lengths are not valid for them)
+                chains[n] = []
+                continue
+            generator = MaximalChainIds(pastptr, pastind, length, source, target)
+            chains[n] = list(generator) if AllChains else [chain for chain in [next(generator, None)] if chain is not None]
+            lengths[n] = int(length[target])
+
+    return chains, lengths
@@ -0,0 +1,1373 @@
+"""
+Causal_Structure.py module
+
+This module contains the vectorized tools used to analyse the causal structure of a causet. Instead of testing the causal relation pair by pair
+(IsCausal), points are sorted by time and mapped to conformal coordinates (conformal time and conformal distance), where the causal relation
+of the (1+1) FLRW metric is a simple comparison that numpy can broadcast over whole blocks of points.
+
+Functions:
+    SortCauset: Given a causet, this function returns its points as a (N,2) array sorted by time.
+    ConformalCoordinates: Given a manifold metric and an array of points, this function computes their conformal coordinates.
+    NullCoordinates: Given a manifold metric and an array of points, this function computes their null (light cone) coordinates.
+    CausalRelation: Given conformal coordinates of two sets of points, this function determines (broadcasting) if they are causally related.
+    NullRelation: Given null coordinates of two sets of points, this function determines (broadcasting) if they are causally related.
+    HorizonTimes: Given a manifold metric and an array of points, this function computes the times at which their light rays reach r=1 and r=-1.
+    FutureMask: Given a manifold metric, a point and an array of points, this function determines which points are in the future of the first.
+    PastMask: Given a manifold metric, a point and an array of points, this function determines which points are in the past of the first.
+    IntervalMask: Given a manifold metric, two points and an array of points, this function determines which points are in their causal interval.
+    BuildConeIndex: Given a manifold metric and a sorted array of points, this function builds a grid index in null coordinates.
+    IndexCoordinates: Given a cone index, this function computes the conformal coordinates of a new point consistently with it.
+    InsertIndex: Given a cone index, this function inserts a new point into it.
+    DeleteIndex: Given a cone index, this function removes a point from it.
+    ConeQuery: Given a cone index and a point, this function computes the points in its causal future (or past).
+    ConeFront: Given a cone index and a point, this function computes the minimal (maximal) points of its causal future (past).
+    IntervalQuery: Given a cone index and two points, this function computes the points in their causal interval.
+    CausalMatrixBlocks: Given a manifold metric and a sorted array of points, this function generates the causal matrix in blocks of rows.
+    CausalMatrixRows: Given the conformal coordinates of a sorted array of points, this function computes a block of rows of the causal matrix.
+    CausalMatrix: Given a manifold metric and a sorted array of points, this function computes the complete (bit packed) causal matrix.
+    TransitiveReduction: Given a (bit packed) causal matrix, this function computes its links as a CSR adjacency.
+    TransitiveReductionRows: Given a (bit packed) causal matrix, this function computes the links of a block of consecutive points.
+    GetLinksCSR: Given a manifold metric and a sorted array of points, this function computes the links of the causet as a CSR adjacency.
+    ParetoLinksCSR: Given a manifold metric and a sorted array of points, this function computes the links as Pareto fronts in null coordinates.
+    StreamLinks: Given a manifold metric and a sorted array of points, this function generates the links of each point with bounded memory.
+    LinksFromStream: Given a stream of links, this function collects them into CSR adjacencies.
+    LinksFromCSR: Given a sorted array of points and a CSR adjacency, this function builds the equivalent link dictionary.
+    CSRFromLinks: Given a link dictionary, this function builds the equivalent sorted array of points and CSR adjacency.
+    TransposeCSR: Given a CSR adjacency, this function computes the adjacency with every link reversed.
+    EditCSR: Given a CSR adjacency, this function removes some of its entries and inserts new ones.
+    InsertPointCSR: Given a causet and its links, this function inserts a point updating only the links affected by it.
+    DeletePointCSR: Given a causet and its links, this function removes a point updating only the links affected by it.
+
+Author: Cano Jones, Alejandro
+linkedin: www.linkedin.com/in/alejandro-cano-jones-5b20a7136
+github: https://github.com/Cano-Jones
+"""
+
+#Libraries used
+from __future__ import annotations #Dedicated to function typing
+from typing import TYPE_CHECKING #Dedicated to function typing
+if TYPE_CHECKING:
+    from .Class_Objects import *
+
+import os #Memory mapped files
+import numpy as np #Vectorized computations
+from collections import OrderedDict #Sliding window of the streaming link builder
+from .Storage_Module import MappedArray, StreamArray #Memory mapped arrays
+
+
+###################################
+
+
+
+def SortCauset(Causet: set[tuple[float]]) -> np.ndarray:
+    """
+    SortCauset function:
+        Converts a causet into a (N,2) array of points sorted by time (and by space for equal times). Since the causal future of a point is
+        always later in time, this order is a topological order of the causal relation.
+
+    Parameters:
+        Causet (iterable of 2D float tuples, 2D float array or CausetArray class): set of points in a (1+1) spacetime.
+
+    Returns:
+        Points (2D float array): (N,2) array of points sorted by time, each row being (t, r).
+    """
+
+    if isinstance(Causet, np.ndarray): Points = Causet.reshape(-1, 2)
+    elif hasattr(Causet, 'Points'): return Causet.Points #CausetArray classes are already sorted by time
+    else: Points = np.array(list(Causet), dtype=np.float64).reshape(-1, 2)
+    return Points[np.lexsort((Points[:, 1], Points[:, 0]))] #Sorted by time, then by space
+
+
+###################################
+
+
+
+def ConformalCoordinates(Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ConformalCoordinates function:
+        Maps an array of points to conformal coordinates (eta, chi): conformal time eta = int dt/a(t) and conformal distance chi, which is r,
+        asinh(r) or asin(r) for kappa = 0, -1, 1 respectively. In these coordinates light rays move as chi = chi_0 +- (eta - eta_0).
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points, each row being (t, r).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+
+    Returns:
+        eta (float array): conformal time of each point.
+        chi (float array): conformal distance of each point.
+    """
+
+    T, R = Points[:, 0], Points[:, 1]
+
+    #Conformal time, closed form or tabulated (the table must cover every point)
+    if Metric.ConformalTime is not None:
+        eta = np.asarray(Metric.ConformalTime(T), dtype=np.float64)
+    else:
+        T_inf, T_sup = (T.min(), T.max()) if T.size else (0.0, 0.0)
+        if TimeRange is not None: T_inf, T_sup = min(T_inf, TimeRange[0]), max(T_sup, TimeRange[1])
+        eta = Metric.ConformalTable((T_inf, T_sup))[0](T)
+
+    #Conformal distance
+    if Metric.kappa == 0: chi = R.copy()
+    elif Metric.kappa == -1: chi = np.arcsinh(R)
+    else: chi = np.arcsin(R)
+
+    return eta, chi
+
+
+###################################
+
+
+
+def NullCoordinates(Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    NullCoordinates function:
+        Maps an array of points to null (light cone) coordinates u = eta - chi and v = eta + chi, built from the conformal coordinates (see
+        ConformalCoordinates). Light rays move along constant u or constant v, so for kappa = 0, -1 a point is in the causal future of another
+        one if and only if both of its null coordinates are larger (coordinate-wise dominance).
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points, each row being (t, r).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+
+    Returns:
+        u (float array): retarded null coordinate of each point.
+        v (float array): advanced null coordinate of each point.
+    """
+
+    eta, chi = ConformalCoordinates(Metric, Points, TimeRange)
+    return eta-chi, eta+chi
+
+###################################
+
+
+
+def CausalRelation(kappa: int, eta1: np.ndarray, chi1: np.ndarray, eta2: np.ndarray, chi2: np.ndarray) -> np.ndarray:
+    """
+    CausalRelation function:
+        Vectorized version of IsCausal, in conformal coordinates. Arrays are broadcasted, so that a column of points 1 against a row of
+        points 2 gives a whole block of the causal matrix.
+
+    Parameters:
+        kappa (int): space curvature constant (-1,0,1).
+        eta1, chi1 (float arrays): conformal coordinates of the first points.
+        eta2, chi2 (float arrays): conformal coordinates of the second points.
+
+    Returns:
+        _ (bool array): True where the second point is in the causal future of the first one.
+    """
+
+    DeltaEta = eta2-eta1 #Maximum (conformal) distance travelled by light
+
+    if kappa != 1:
+        #For flat and hyperbolic spaces, light rays are straight lines in conformal coordinates
+        return (DeltaEta >= 0) & (np.abs(chi2-chi1) <= DeltaEta)
+
+    #For spherical spaces, the same criterion as IsCausal is used: the conformal times at which light rays starting at point1 arrive at the
+    #r=1 and r=-1 marks are chi=pi/2 and chi=-pi/2, so they are known without any root finding (see HorizonTimes).
+    eta_right = eta1+np.pi/2-chi1
+    eta_left = eta1+np.pi/2+chi1
+    r2 = np.sin(chi2)
+
+    Both = (eta2 > eta_right) & (eta2 > eta_left) #Point2 is passed the time at which r(t)=\pm 1
+    Right = (eta2 > eta_left) & (r2 < np.sin(chi1+DeltaEta)) #Relative position with respect to the right light ray
+    Left = (eta2 > eta_right) & (r2 > np.sin(chi1-DeltaEta)) #Relative position with respect to the left light ray
+
+    return (DeltaEta >= 0) & (Both | Right | Left)
+
+
+###################################
+
+
+
+def NullRelation(kappa: int, u1: np.ndarray, v1: np.ndarray, u2: np.ndarray, v2: np.ndarray) -> np.ndarray:
+    """
+    NullRelation function:
+        Version of CausalRelation in null coordinates (arrays are broadcasted). For kappa = 0, -1 the causal relation is the coordinate-wise
+        dominance of (u, v); for kappa = 1 the horizon criterion of CausalRelation is applied to the corresponding conformal coordinates.
+
+    Parameters:
+        kappa (int): space curvature constant (-1,0,1).
+        u1, v1 (float arrays): null coordinates of the first points.
+        u2, v2 (float arrays): null coordinates of the second points.
+
+    Returns:
+        _ (bool array): True where the second point is in the causal future of the first one.
+    """
+
+    if kappa != 1: return (u2 >= u1) & (v2 >= v1)
+    return CausalRelation(kappa, (u1+v1)/2, (v1-u1)/2, (u2+v2)/2, (v2-u2)/2)
+
+###################################
+
+
+
+def HorizonTimes(Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    HorizonTimes function:
+        Computes, for every point of a spherical (kappa = 1) space, the times at which the light rays leaving it arrive at the r=1 and r=-1
+        marks (see IsCausal). In conformal coordinates these are reached at eta + pi/2 - chi and eta + pi/2 + chi, so the times follow from
+        the inverse conformal time (closed form, or the inverse of the conformal time table) without any root finding.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points, each row being (t, r).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+
+    Returns:
+        t_right (float array): time at which the light ray of each point arrives at r=1 (inf if it is never reached, or not within the table).
+        t_left (float array): time at which the light ray of each point arrives at r=-1 (inf if it is never reached, or not within the table).
+    """
+
+    eta, chi = ConformalCoordinates(Metric, Points, TimeRange)
+    horizons = np.stack((eta+np.pi/2-chi, eta+np.pi/2+chi)) #Conformal times of arrival at r=1 and r=-1
+
+    if Metric.InverseConformalTime is not None:
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'): #Conformal times beyond the end of the expansion are never reached
+            times = np.asarray(Metric.InverseConformalTime(horizons), dtype=np.float64)
+    else:
+        T = Points[:, 0]
+        T_inf, T_sup = (T.min(), T.max()) if T.size else (0.0, 0.0)
+        if TimeRange is not None: T_inf, T_sup = min(T_inf, TimeRange[0]), max(T_sup, TimeRange[1])
+        Eta, InverseEta = Metric.ConformalTable((T_inf, T_sup))
+        times = np.where(horizons <= InverseEta.x[-1], InverseEta(np.minimum(horizons, InverseEta.x[-1])), np.inf) #Not reached within the table
+
+    times = np.where(np.isfinite(times), times, np.inf)
+    return times[0], times[1]
+
+###################################
+
+
+
+def FutureMask(Metric: MetricTensor, point: tuple[float], Points: np.ndarray, TimeRange: tuple[float] = None) -> np.ndarray:
+    """
+    FutureMask function:
+        Vectorized version of ChronologicalFuture: determines which points of an array are in the causal future of a given point (a point
+        is not considered to be in its future).
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        point (2D float tuple): point for which its future wants to be computed.
+        Points (2D float array): (N,2) array of points.
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+
+    Returns:
+        mask (bool array): True for the points in the causal future of point.
+    """
+
+    eta, chi = ConformalCoordinates(Metric, np.vstack([[point], Points]), TimeRange) #Same conformal time table for the point and the array
+    eta0, chi0, eta, chi = eta[:1], chi[:1], eta[1:], chi[1:]
+
+    mask = CausalRelation(Metric.kappa, eta0[0], chi0[0], eta, chi)
+    return mask & ~np.all(Points == np.asarray(point), axis=1) #The point itself is excluded
+
+
+###################################
+
+
+
+def PastMask(Metric: MetricTensor, point: tuple[float], Points: np.ndarray, TimeRange: tuple[float] = None) -> np.ndarray:
+    """
+    PastMask function:
+        Determines which points of an array are in the causal past of a given point (i.e. the point is in their causal future). A point is
+        not considered to be in its past.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        point (2D float tuple): point for which its past wants to be computed.
+        Points (2D float array): (N,2) array of points.
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+
+    Returns:
+        mask (bool array): True for the points in the causal past of point.
+    """
+
+    eta, chi = ConformalCoordinates(Metric, np.vstack([[point], Points]), TimeRange) #Same conformal time table for the point and the array
+    eta0, chi0, eta, chi = eta[:1], chi[:1], eta[1:], chi[1:]
+
+    mask = CausalRelation(Metric.kappa, eta, chi, eta0[0], chi0[0])
+    return mask & ~np.all(Points == np.asarray(point), axis=1) #The point itself is excluded
+
+
+###################################
+
+
+
+def IntervalMask(Metric: MetricTensor, source: tuple[float], target: tuple[float], Points: np.ndarray,
+                 TimeRange: tuple[float] = None) -> np.ndarray:
+    """
+    IntervalMask function:
+        Determines which points of an array are in the causal (Alexandrov) interval of two points: the future of the source intersected with
+        the past of the target, including both points. Every chain from source to target is contained in this interval.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        source (2D float tuple): lower point of the interval.
+        target (2D float tuple): upper point of the interval.
+        Points (2D float array): (N,2) array of points.
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+
+    Returns:
+        mask (bool array): True for the points in the causal interval.
+    """
+
+    endpoints = np.all(Points == np.asarray(source), axis=1) | np.all(Points == np.asarray(target), axis=1)
+    return endpoints | (FutureMask(Metric, source, Points, TimeRange) & PastMask(Metric, target, Points, TimeRange))
+
+
+###################################
+
+
+
+def BuildConeIndex(Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None, CellPoints: int = 16) -> tuple:
+    """
+    BuildConeIndex function:
+        Builds a spatial index of a (time sorted) causet for light cone queries. Points are placed in a uniform grid in null coordinates
+        u = eta - chi and v = eta + chi, where (for kappa = 0, -1) the causal future of a point is the quadrant u >= u_0, v >= v_0 and a causal
+        interval is a rectangle; a query only visits the cells overlapping that region. Points of each cell are stored consecutively, and
+        cells are sorted by u then v, so every row of cells of a query is a single slice.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time (see SortCauset).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+        CellPoints (int): average number of points per cell.
+
+    Returns:
+        Index (tuple): (eta, chi, edges, cellptr, order) conformal coordinates of the points, grid edges (the same for u and v), CSR pointer
+            of the cells and ids of the points sorted by cell.
+    """
+
+    N = len(Points)
+    eta, chi = ConformalCoordinates(Metric, Points, TimeRange)
+    u, v = eta-chi, eta+chi #Null coordinates (see NullCoordinates)
+
+    G = max(1, int(np.sqrt(N/CellPoints))) #Cells per axis
+    lower = min(u.min(), v.min()) if N else 0.0
+    upper = max(u.max(), v.max()) if N else 1.0
+    edges = np.linspace(lower, upper, G+1)
+
+    cell = _Cell(edges, u)*G+_Cell(edges, v)
+    order = np.argsort(cell, kind='stable') #Points of each cell, in time order
+    cellptr = np.zeros(G*G+1, dtype=np.int64)
+    np.cumsum(np.bincount(cell, minlength=G*G), out=cellptr[1:])
+
+    return eta, chi, edges, cellptr, order
+
+
+###################################
+
+
+
+def _Cell(edges: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    _Cell function:
+        Cell of the grid (along one axis) containing each coordinate, coordinates out of the grid are assigned to the border cells.
+    """
+
+    return np.clip(np.searchsorted(edges, x, side='right')-1, 0, len(edges)-2)
+
+
+###################################
+
+
+
+def IndexCoordinates(Metric: MetricTensor, Points: np.ndarray, Index: tuple, point: tuple[float], TimeRange: tuple[float] = None) -> tuple[float, float]:
+    """
+    IndexCoordinates function:
+        Computes the conformal coordinates of a point of spacetime consistently with a cone index. A tabulated conformal time starts at the
+        earliest point it is computed for, so the conformal time of the point is measured from the first point of the causet and shifted to the
+        conformal time of that point in the index (points of the causet keep their indexed coordinates).
+
+    Parameters:
+        Metric (MetricTensor class): metric manifold of the causet
+        Points (2D float array): (N,2) array of the indexed points sorted by time
+        Index (tuple): index of the causet (see BuildConeIndex).
+        point (2D float tuple): point of spacetime
+        TimeRange (2D float tuple): time range of the simulation (conformal time table)
+
+    Returns:
+        eta0, chi0 (float): conformal coordinates of the point.
+    """
+
+    if len(Points) == 0: #Nothing to be consistent with
+        eta, chi = ConformalCoordinates(Metric, np.array([point], dtype=np.float64), TimeRange)
+        return float(eta[0]), float(chi[0])
+
+    lo, hi = np.searchsorted(Points[:,0], point[0]), np.searchsorted(Points[:,0], point[0], side='right')
+    same = lo+np.flatnonzero(Points[lo:hi,1] == point[1]) #A point of the causet keeps its indexed coordinates
+    if len(same): return float(Index[0][same[0]]), float(Index[1][same[0]])
+
+    eta, chi = ConformalCoordinates(Metric, np.array([point, Points[0]], dtype=np.float64), TimeRange)
+    return float(eta[0]-eta[1]+Index[0][0]), float(chi[0])
+
+
+###################################
+
+
+
+def InsertIndex(Index: tuple, position: int, eta0: float, chi0: float) -> tuple:
+    """
+    InsertIndex function:
+        Inserts a new point into a cone index (see BuildConeIndex) without building it again: the point is placed in the cell of the grid
+        containing it (the grid itself is not changed, points out of it belong to the border cells) and later ids are shifted by one.
+
+    Parameters:
+        Index (tuple): index of the causet (see BuildConeIndex).
+        position (int): (time sorted) id of the new point.
+        eta0, chi0 (float): conformal coordinates of the new point.
+
+    Returns:
+        Index (tuple): index of the causet with the new point.
+    """
+
+    eta, chi, edges, cellptr, order = Index
+    G = len(edges)-1
+    cell = int(_Cell(edges, eta0-chi0))*G+int(_Cell(edges, eta0+chi0))
+
+    order = order+(order >= position)
+    at = cellptr[cell]+np.searchsorted(order[cellptr[cell]:cellptr[cell+1]], position) #Points of each cell are kept in time order
+    order = np.insert(order, at, position)
+    cellptr = cellptr.copy()
+    cellptr[cell+1:] += 1
+
+    return np.insert(eta, position, eta0), np.insert(chi, position, chi0), edges, cellptr, order
+
+
+###################################
+
+
+
+def DeleteIndex(Index: tuple, position: int) -> tuple:
+    """
+    DeleteIndex function:
+        Removes a point from a cone index (see BuildConeIndex) without building it again; later ids are shifted by one.
+
+    Parameters:
+        Index (tuple): index of the causet (see BuildConeIndex).
+        position (int): (time sorted) id of the point to be removed.
+
+    Returns:
+        Index (tuple): index of the causet without the point.
+    """
+
+    eta, chi, edges, cellptr, order = Index
+    G = len(edges)-1
+    cell = int(_Cell(edges, eta[position]-chi[position]))*G+int(_Cell(edges, eta[position]+chi[position]))
+
+    at = cellptr[cell]+np.searchsorted(order[cellptr[cell]:cellptr[cell+1]], position)
+    order = np.delete(order, at)
+    order -= order > position
+    cellptr = cellptr.copy()
+    cellptr[cell+1:] -= 1
+
+    return np.delete(eta, position), np.delete(chi, position), edges, cellptr, order
+
+
+###################################
+
+
+
+def ConeQuery(Index: tuple, kappa: int, eta0: float, chi0: float, future: bool = True) -> np.ndarray:
+    """
+    ConeQuery function:
+        Computes the points of an indexed causet in the causal future (or past) of a point, visiting only the cells of the index that overlap
+        its light cone. For kappa = 0, -1 the future (past) is the quadrant u >= u_0, v >= v_0 (u <= u_0, v <= v_0) of the null coordinates.
+        For kappa = 1 (see CausalRelation) the past is inside the same quadrant, and so is the future until the horizon time of the point
+        (eta_0+pi/2+|chi_0|), when both light rays reach r=1 and r=-1: every later point is in its future, so only this tail is visited
+        linearly. Candidates are then tested with CausalRelation, so the result is the same as FutureMask (PastMask).
+
+    Parameters:
+        Index (tuple): index of the causet (see BuildConeIndex).
+        kappa (int): space curvature constant (-1,0,1).
+        eta0, chi0 (float): conformal coordinates of the point.
+        future (bool): if True the causal future is computed, otherwise the causal past.
+
+    Returns:
+        ids (int array): sorted (time sorted) ids of the points in the causal future (past) of the point, the point itself excluded.
+    """
+
+    eta, chi, edges, cellptr, order = Index
+    u0, v0 = eta0-chi0, eta0+chi0
+
+    if not future: ids = _Rectangle(Index, (-np.inf, u0), (-np.inf, v0))
+    elif kappa != 1: ids = _Rectangle(Index, (u0, np.inf), (v0, np.inf))
+    else: #Quadrant between the times at which the light rays reach the first mark and both marks, every point after it
+        first, horizon = eta0+np.pi/2-abs(chi0), eta0+np.pi/2+abs(chi0) #Light rays reach the first and then both marks r=1, r=-1
+        tail = np.searchsorted(eta, horizon)
+        ids = _Rectangle(Index, (u0, np.inf), (v0, np.inf), (first, horizon))
+        ids = np.concatenate((ids[ids < tail], np.arange(tail, len(eta))))
+
+    if future: mask = CausalRelation(kappa, eta0, chi0, eta[ids], chi[ids])
+    else: mask = CausalRelation(kappa, eta[ids], chi[ids], eta0, chi0)
+    mask &= (eta[ids] != eta0) | (chi[ids] != chi0) #The point itself is excluded
+
+    return ids[mask]
+
+
+###################################
+
+
+
+def ConeFront(Index: tuple, kappa: int, eta0: float, chi0: float, future: bool = True, indptr: np.ndarray = None,
+              indices: np.ndarray = None) -> np.ndarray:
+    """
+    ConeFront function:
+        Computes the minimal points of the causal future (maximal points of the causal past) of a point of spacetime, i.e. the points it would
+        be linked to. For kappa = 0, -1 the future is the quadrant u >= u_0, v >= v_0 of the null coordinates, and its minimal points form a
+        staircase near the corner: the rows of cells of the index are visited by increasing u (decreasing u for the past), and a cell is only
+        visited if it can hold a point not dominated by the points of the previous rows, so only the cells along the staircase are read. For
+        kappa = 1 the causal relation is not a dominance, so the points of the future (see ConeQuery) that are not linked from another point of
+        it are the minimal ones, which needs the links of the causet.
+
+    Parameters:
+        Index (tuple): index of the causet (see BuildConeIndex).
+        kappa (int): space curvature constant (-1,0,1).
+        eta0, chi0 (float): conformal coordinates of the point (which needs not belong to the causet).
+        future (bool): if True the minimal points of the causal future are computed, otherwise the maximal points of the causal past.
+        indptr, indices (int arrays): CSR adjacency of the links (only needed for kappa = 1).
+
+    Returns:
+        ids (int array): sorted (time sorted) ids of the minimal (maximal) points.
+    """
+
+    if kappa == 1: #Points of the future (past) linked from (to) no other point of it
+        ids = ConeQuery(Index, kappa, eta0, chi0, future=future)
+        rows, links = _RowEntries(indptr, indices, ids)
+        inside = np.isin(links, ids)
+        return np.setdiff1d(ids, links[inside] if future else rows[inside], assume_unique=True)
+
+    eta, chi, edges, cellptr, order = Index
+    G = len(edges)-1
+    u0, v0 = eta0-chi0, eta0+chi0
+    r0, c0 = int(_Cell(edges, u0)), int(_Cell(edges, v0))
+    sign = 1 if future else -1 #The past is the future with the null coordinates reversed
+
+    found, bound = [], np.inf #Lowest (signed) v of the points of the previous rows
+    for r in (range(r0, G) if future else range(r0, -1, -1)):
+        #Columns of the row that can hold a point of the cone not dominated by the previous rows
+        if future: lo, hi = c0, (G-1 if bound == np.inf else int(_Cell(edges, bound)))
+        else: lo, hi = (0 if bound == np.inf else int(_Cell(edges, -bound))), c0
+        if hi < lo: break #The bound only tightens, so no later row can hold one either
+        ids = order[cellptr[r*G+lo]:cellptr[r*G+hi+1]]
+        u, v = sign*(eta[ids]-chi[ids]), sign*(eta[ids]+chi[ids])
+        inside = (u >= sign*u0) & (v >= sign*v0)
+        if inside.any():
+            found.append(ids[inside])
+            bound = min(bound, v[inside].min())
+
+    ids = np.concatenate([np.empty(0, dtype=np.int64)]+found)
+    u, v = sign*(eta[ids]-chi[ids]), sign*(eta[ids]+chi[ids])
+    order = np.lexsort((v, u)) #Staircase: a point is minimal if its v is lower than the v of every point with lower (or equal) u
+    v = v[order]
+    previous = np.concatenate(([np.inf], np.minimum.accumulate(v)[:-1]))
+
+    return np.sort(ids[order][v < previous])
+
+
+###################################
+
+
+
+def IntervalQuery(Index: tuple, kappa: int, eta_s: float, chi_s: float, eta_t: float, chi_t: float) -> np.ndarray:
+    """
+    IntervalQuery function:
+        Computes the points of an indexed causet in the causal (Alexandrov) interval of two points, including both points (see IntervalMask).
+        Only the cells of the index overlapping the interval (a rectangle in null coordinates, for kappa = 0, -1) are visited; for kappa = 1
+        candidates are pruned by conformal time.
+
+    Parameters:
+        Index (tuple): index of the causet (see BuildConeIndex).
+        kappa (int): space curvature constant (-1,0,1).
+        eta_s, chi_s (float): conformal coordinates of the lower point of the interval.
+        eta_t, chi_t (float): conformal coordinates of the upper point of the interval.
+
+    Returns:
+        ids (int array): sorted (time sorted) ids of the points in the causal interval.
+    """
+
+    eta, chi, edges, cellptr, order = Index
+
+    #Region between both points (sorted limits, so both points are candidates even if they are not causally related)
+    if kappa == 1:
+        ids = np.arange(np.searchsorted(eta, min(eta_s, eta_t)), np.searchsorted(eta, max(eta_s, eta_t), side='right'))
+    else:
+        ids = _Rectangle(Index, sorted((eta_s-chi_s, eta_t-chi_t)), sorted((eta_s+chi_s, eta_t+chi_t)))
+
+    e, c = eta[ids], chi[ids]
+    source = (e == eta_s) & (c == chi_s)
+    target = (e == eta_t) & (c == chi_t)
+    mask = source | target | (CausalRelation(kappa, eta_s, chi_s, e, c) & CausalRelation(kappa, e, c, eta_t, chi_t))
+
+    return ids[mask]
+
+
+###################################
+
+
+
+def _Rectangle(Index: tuple, U: tuple[float], V: tuple[float], Eta: tuple[float] = (-np.inf, np.inf)) -> np.ndarray:
+    """
+    _Rectangle function:
+        Ids (sorted) of the points of the cells overlapping a rectangle [U[0], U[1]] x [V[0], V[1]] in null coordinates, optionally cut to the
+        band of conformal time Eta[0] <= (u+v)/2 <= Eta[1] (each row of cells only visits the columns that can reach the band). The limits are
+        widened by a rounding margin, so no point of the rectangle is missed. Points inserted out of the grid are kept in its border cells (see
+        InsertIndex), so a rectangle out of the grid still visits the border cells next to it.
+    """
+
+    eta, chi, edges, cellptr, order = Index
+    G = len(edges)-1
+    margin = 1e-9*(1+np.abs(edges).max())
+
+    i0, i1 = _Cell(edges, np.array(U)+[-margin, margin])
+    rows = np.arange(i0, i1+1)
+    lower = np.maximum(np.where(rows > 0, edges[rows], -np.inf), U[0]) #u range of each row (border rows hold the points out of the grid)
+    upper = np.minimum(np.where(rows < G-1, edges[rows+1], np.inf), U[1])
+    low, high = np.maximum(V[0], 2*Eta[0]-upper)-margin, np.minimum(V[1], 2*Eta[1]-lower)+margin #v range of each row
+    rows, low, high = rows[low <= high], low[low <= high], high[low <= high]
+
+    j0, j1 = _Cell(edges, low), _Cell(edges, high)
+    ids = np.concatenate([np.empty(0, dtype=np.int64)]+[order[cellptr[r*G+a]:cellptr[r*G+b+1]] for r, a, b in zip(rows, j0, j1)]) #Each row of cells is a single slice
+
+    return np.sort(ids)
+
+###################################
+
+
+
+def CausalMatrixBlocks(Metric: MetricTensor, Points: np.ndarray, BlockSize: int = None, TimeRange: tuple[float] = None):
+    """
+    CausalMatrixBlocks function:
+        Generates the causal matrix of a causet (C[i,j] is True if point j is in the causal future of point i) by blocks of consecutive
+        rows, packed as bits (numpy.packbits along the rows). Only one block is kept in memory at a time.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time (see SortCauset).
+        BlockSize (int): number of rows of each block (if none is given, blocks of about 2^20 matrix elements are used).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+
+    Yields:
+        start (int): index of the first row of the block.
+        block (2D uint8 array): bit packed rows of the causal matrix, with shape (rows, ceil(N/8)).
+    """
+
+    N = len(Points)
+    if BlockSize is None: BlockSize = max(1, 2**20//max(N, 1)) #Small blocks keep the temporary arrays in cache
+
+    eta, chi = ConformalCoordinates(Metric, Points, TimeRange)
+
+    for start in range(0, N, BlockSize):
+        yield start, CausalMatrixRows(Metric.kappa, eta, chi, start, min(start+BlockSize, N))
+
+
+###################################
+
+
+
+def CausalMatrixRows(kappa: int, eta: np.ndarray, chi: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """
+    CausalMatrixRows function:
+        Computes a block of consecutive rows of the causal matrix of a causet from the conformal coordinates of its (time sorted) points,
+        packed as bits (numpy.packbits along the rows). It only needs the conformal coordinates, not the metric, so it can be evaluated
+        in a different process.
+
+    Parameters:
+        kappa (int): spatial curvature of the metric (0, -1 or 1).
+        eta (float array): conformal time of each point (sorted by time).
+        chi (float array): conformal distance of each point.
+        start (int): index of the first row of the block.
+        stop (int): index after the last row of the block.
+
+    Returns:
+        block (2D uint8 array): bit packed rows of the causal matrix, with shape (stop-start, ceil(N/8)).
+    """
+
+    N = len(eta)
+    rows = np.arange(start, stop)
+
+    block = np.zeros((stop-start, N), dtype=bool)
+    #Points are sorted by time, so only points from the block onwards can be in the future of the block
+    block[:, start:] = CausalRelation(kappa, eta[rows, None], chi[rows, None], eta[None, start:], chi[None, start:])
+    block[rows-start, rows] = False #A point is not considered to be in its future
+
+    return np.packbits(block, axis=1)
+
+
+###################################
+
+
+
+def CausalMatrix(Metric: MetricTensor, Points: np.ndarray, BlockSize: int = None, TimeRange: tuple[float] = None,
+                 directory: str = None) -> np.ndarray:
+    """
+    CausalMatrix function:
+        Computes the complete causal matrix of a causet, packed as bits (numpy.packbits along the rows). If a directory is given, the matrix
+        is stored in a memory mapped file (Matrix.npy) instead of memory, being written block by block. Blocks only bound the temporary
+        arrays: the matrix itself takes N^2/8 bytes (1.25 GB for N = 10^5), since the transitive reduction of a row needs the rows of every
+        later point; StreamLinks builds the links with bounded memory instead.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time (see SortCauset).
+        BlockSize (int): number of rows computed at once.
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+        directory (str): directory of the memory mapped matrix (if none is given, the matrix is kept in memory).
+
+    Returns:
+        Matrix (2D uint8 array): bit packed causal matrix, with shape (N, ceil(N/8)).
+    """
+
+    N = len(Points)
+    shape = (N, (N+7)//8)
+    Matrix = np.zeros(shape, dtype=np.uint8) if directory is None else MappedArray(directory, 'Matrix', shape, np.uint8)
+
+    for start, block in CausalMatrixBlocks(Metric, Points, BlockSize, TimeRange):
+        Matrix[start:start+len(block)] = block
+
+    return Matrix
+
+
+###################################
+
+
+
+def TransitiveReduction(Matrix: np.ndarray, directory: str = None, BlockSize: int = 2**14) -> tuple[np.ndarray, np.ndarray]:
+    """
+    TransitiveReduction function:
+        Computes the links (direct causal relations) of a causet from its causal matrix. The candidates of the future of each point are
+        visited in chronological order: a candidate that is not in the future of a previous link is itself a link, and then its whole future
+        is discarded from the candidates (a bitwise operation over a packed row). The cost of each row is proportional to its number of links,
+        instead of the size of its whole future. Points are reduced in (time ordered) blocks; if a directory is given, the links of each block
+        are streamed into memory mapped files (indptr.npy, indices.npy), so they never need to fit in memory at once. The (N^2/8 bytes) matrix
+        itself must be complete, since the reduction of a point reads the rows of its links, which may be any later point.
+
+    Parameters:
+        Matrix (2D uint8 array): bit packed causal matrix of a causet sorted by time (see CausalMatrix), possibly memory mapped.
+        directory (str): directory of the memory mapped CSR adjacency (if none is given, it is kept in memory).
+        BlockSize (int): number of points reduced at once.
+
+    Returns:
+        indptr (int array): CSR index pointer, the links of point i are indices[indptr[i]:indptr[i+1]].
+        indices (int array): CSR indices, (time sorted) index of the future point of each link.
+    """
+
+    N = Matrix.shape[0]
+    indptr = np.zeros(N+1, dtype=np.int64) if directory is None else MappedArray(directory, 'indptr', (N+1,), np.int64)
+
+    def Blocks(): #Links of each block of points, the index pointer is filled along the way
+        for start in range(0, N, BlockSize):
+            stop = min(start+BlockSize, N)
+            counts, links = TransitiveReductionRows(Matrix, start, stop)
+            indptr[start+1:stop+1] = indptr[start]+np.cumsum(counts)
+            yield links
+
+    if directory is None:
+        indices = np.concatenate([np.empty(0, dtype=np.int64)]+list(Blocks()))
+    else:
+        indices = StreamArray(directory, 'indices', Blocks(), np.int64)
+        indptr.flush()
+
+    return indptr, indices
+
+
+###################################
+
+
+
+def TransitiveReductionRows(Matrix: np.ndarray, start: int, stop: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    TransitiveReductionRows function:
+        Computes the links of a block of consecutive points of a causet from its causal matrix (see TransitiveReduction). Each row is reduced
+        independently from the others, so different blocks can be reduced at the same time and then concatenated.
+
+    Parameters:
+        Matrix (2D uint8 array): bit packed causal matrix of a causet sorted by time (see CausalMatrix).
+        start (int): index of the first point of the block.
+        stop (int): index after the last point of the block.
+
+    Returns:
+        counts (int array): number of links of each point of the block.
+        indices (int array): (time sorted) index of the future point of each link, row after row.
+    """
+
+    counts = np.zeros(stop-start, dtype=np.int64)
+    indices = []
+
+    for i in range(start, stop):
+        previous = len(indices) #Number of links of the previous rows
+        first = i//8 #Points before i can not be in its future, the first bytes of the rows are skipped
+        remaining = Matrix[i, first:].copy() #Candidates of the future of i
+
+        byte = 0
+        while True:
+            #Only the unscanned tail can hold candidates, and the next one is usually close: the bytes after the last link are searched first
+            nonzero = np.flatnonzero(remaining[byte:byte+64])
+            if not nonzero.size: nonzero = np.flatnonzero(remaining[byte:])
+            if not nonzero.size: break
+
+            byte += nonzero[0] #First byte containing a candidate (the bytes before it are empty)
+            bit = int(remaining[byte]).bit_length()-1 #Bits are packed with the first point as the most significant bit
+            j = 8*(first+byte)+7-bit #Earliest remaining candidate, which is a link
+
+            indices.append(j)
+            remaining[byte:] &= ~Matrix[j, first+byte:] #The future of the link is not linked to i
+            remaining[byte] &= np.uint8(~(1 << bit) & 0xFF) #The link itself is discarded from the candidates
+
+        counts[i-start] = len(indices)-previous
+
+    return counts, np.array(indices, dtype=np.int64)
+
+
+###################################
+
+
+
+def GetLinksCSR(Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None, BlockSize: int = None,
+                directory: str = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    GetLinksCSR function:
+        Computes the links of a causet (sorted by time) as a CSR adjacency: the causal matrix is built by blocks and then transitively reduced.
+        If a directory is given, both the causal matrix and the CSR adjacency live in memory mapped files and are processed in time ordered
+        blocks (the matrix file is removed once the links are known). Otherwise the whole causal matrix (N^2/8 bytes) is kept in memory, so
+        large causets should use StreamLinks (or a directory).
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time (see SortCauset).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+        BlockSize (int): number of rows of the causal matrix computed at once.
+        directory (str): directory of the memory mapped files (if none is given, everything is kept in memory).
+
+    Returns:
+        indptr (int array): CSR index pointer, the links of point i are indices[indptr[i]:indptr[i+1]].
+        indices (int array): CSR indices, (time sorted) index of the future point of each link.
+    """
+
+    Matrix = CausalMatrix(Metric, Points, BlockSize, TimeRange, directory=directory)
+    indptr, indices = TransitiveReduction(Matrix, directory=directory)
+
+    if directory is not None: #The causal matrix is only needed to compute the links
+        del Matrix
+        os.remove(os.path.join(directory, 'Matrix.npy'))
+
+    return indptr, indices
+
+
+###################################
+
+
+
+def _NextSmaller(values: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """
+    _NextSmaller function:
+        For each entry of an array split in consecutive segments, position of the next smaller entry of its segment (the end of the segment if
+        there is none), found by binary lifting over the minima of runs of 2^k entries (vectorized).
+    """
+
+    n = len(values)
+    table = [values] #table[k][i] is the minimum of values[i:i+2^k]
+    while 2**len(table) <= n:
+        half = 2**(len(table)-1)
+        table.append(np.minimum(table[-1][:-half], table[-1][half:]))
+
+    after = np.arange(1, n+1, dtype=np.int64) #Position after the entries known to be larger
+    for k in reversed(range(len(table))):
+        jump = np.flatnonzero(after+2**k <= end)
+        jump = jump[table[k][after[jump]] > values[jump]] #Runs without a smaller entry are skipped
+        after[jump] += 2**k
+
+    return after
+
+
+def ParetoLinksCSR(Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ParetoLinksCSR function:
+        Computes the links of a causet (sorted by time) as a CSR adjacency without the causal matrix. For kappa = 0, -1 the causal relation
+        is the dominance of the null coordinates (see NullCoordinates), so the links of a point are the minimal elements (Pareto front) of its
+        future quadrant. They are found by divide and conquer over the points sorted by u: in a block of points split in a lower and an upper
+        half, the links from a point of the lower half to the upper half are the steps of the staircase of minima of the upper half above its
+        v (each step is the next point of lower u in v order, see _NextSmaller), climbed while v is lower than the v of its lowest link inside
+        the lower half. Every block of a level is processed at once, from blocks of 2 points to the whole causet, so the cost is O(N log^2 N)
+        vectorized operations plus one per link. For kappa = 1 the causal relation is not a dominance, and the links are computed by
+        transitive reduction (see GetLinksCSR).
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time (see SortCauset).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+
+    Returns:
+        indptr (int array): CSR index pointer, the links of point i are indices[indptr[i]:indptr[i+1]].
+        indices (int array): CSR indices, (time sorted) index of the future point of each link.
+    """
+
+    if Metric.kappa == 1: return GetLinksCSR(Metric, Points, TimeRange=TimeRange)
+
+    N = len(Points)
+    u, v = NullCoordinates(Metric, Points, TimeRange)
+    order = np.lexsort((v, u)).astype(np.int64) #Points sorted by u (then by v), the future of a point comes after it
+    V = v[order]
+    level = np.unique(V, return_inverse=True)[1].astype(np.int64) #Rank of v (equal for equal v)
+    lowest = np.full(N, np.inf) #v of the lowest link found so far of each point
+    x = np.arange(N, dtype=np.int64)
+    sources, targets = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+
+    width = 1
+    while width < N:
+        block, upper = x//(2*width), x%(2*width) >= width #Blocks of points by u, split in halves
+
+        #Upper halves sorted by block, then by v (then by u), and the staircase step after each of their points
+        H = np.flatnonzero(upper)
+        H = H[np.lexsort((H, block[H]*(N+1)+level[H]))]
+        keys = block[H]*(N+1)+level[H]
+        after = _NextSmaller(H, np.searchsorted(keys, (block[H]+1)*(N+1)))
+
+        #Staircases climbed by the points of the lower halves, from the first point above their v
+        L = np.flatnonzero(~upper)
+        position = np.searchsorted(keys, block[L]*(N+1)+level[L])
+        stop = np.searchsorted(keys, (block[L]+1)*(N+1))
+        bound = lowest[L] #Points of the upper half above this v are in the future of a link inside the lower half
+        active = np.flatnonzero(position < stop)
+        while active.size:
+            step = position[active]
+            linked = V[H[step]] < bound[active]
+            active, step = active[linked], step[linked]
+            sources.append(L[active])
+            targets.append(H[step])
+            np.minimum.at(lowest, L[active], V[H[step]])
+
+            position[active] = after[step]
+            active = active[position[active] < stop[active]]
+
+        width *= 2
+
+    sources, targets = order[np.concatenate(sources)], order[np.concatenate(targets)] #Back to time sorted ids
+    indptr = np.zeros(N+1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=N), out=indptr[1:])
+
+    return indptr, targets[np.lexsort((targets, sources))]
+
+###################################
+
+
+
+def StreamLinks(Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None, MaxMemory: int = 2**26, BlockSize: int = None):
+    """
+    StreamLinks function:
+        Streaming version of the link construction. Points are visited in time order, and the links arriving at each point (its direct past)
+        are yielded as soon as they are final, so the links never need to be stored. The past of each point is computed (bit packed) from the
+        conformal coordinates, and its candidates are visited from the latest one: the latest remaining candidate is a link, and then its own
+        past is discarded from the candidates. The packed pasts of the latest points (the most likely ancestors) are kept in a sliding window
+        bounded by MaxMemory; the past of an older ancestor is recomputed when needed. The result does not depend on MaxMemory, only the speed.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time (see SortCauset).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+        MaxMemory (int): maximum number of bytes of the window of packed pasts (the temporary block of the causal relation is not included).
+        BlockSize (int): number of points whose past is computed at once (if none is given, blocks of about 2^20 relations are used).
+
+    Yields:
+        j (int): (time sorted) index of a point, in increasing order.
+        past (int array): sorted indices of the points linked to j (its direct past).
+    """
+
+    N = len(Points)
+    if BlockSize is None: BlockSize = max(1, 2**20//max(N, 1)) #Small blocks keep the temporary arrays in cache
+
+    kappa = Metric.kappa
+    eta, chi = ConformalCoordinates(Metric, Points, TimeRange)
+
+    window = OrderedDict() #Packed past of the latest points, in time order
+    memory = 0 #Bytes used by the window
+
+    def Past(k: int) -> np.ndarray: #Packed past of point k (from the window or recomputed)
+        row = window.get(k)
+        if row is None: row = np.packbits(CausalRelation(kappa, eta[:k], chi[:k], eta[k], chi[k]))
+        return row
+
+    for start in range(0, N, BlockSize):
+        stop = min(start+BlockSize, N)
+        #Past of every point of the block (only earlier points can be in the past of a point)
+        block = CausalRelation(kappa, eta[None, :stop], chi[None, :stop], eta[start:stop, None], chi[start:stop, None])
+
+        for j in range(start, stop):
+            row = np.packbits(block[j-start, :j]) #Candidates of the past of j
+            remaining = row.copy()
+            links = []
+
+            nonzero = np.flatnonzero(remaining)
+            while nonzero.size:
+                byte = nonzero[-1] #Last byte containing a candidate
+                value = int(remaining[byte])
+                bit = (value & -value).bit_length()-1 #Bits are packed with the first point as the most significant bit
+                k = 8*byte+7-bit #Latest remaining candidate, which is a link
+
+                links.append(k)
+                past = Past(k)
+                remaining[:past.size] &= ~past #The past of the link is not linked to j
+                remaining[byte] &= np.uint8(~(1 << bit) & 0xFF) #The link itself is discarded from the candidates
+
+                nonzero = np.flatnonzero(remaining[:byte+1])
+
+            yield j, np.array(links[::-1], dtype=np.int64)
+
+            #The past of j enters the window, and the oldest pasts leave it if the memory is exceeded
+            window[j] = row
+            memory += row.nbytes
+            while memory > MaxMemory and window:
+                memory -= window.popitem(last=False)[1].nbytes
+
+
+###################################
+
+
+
+def LinksFromStream(stream, N: int, directory: str = None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    LinksFromStream function:
+        Collects the links generated by StreamLinks into CSR adjacencies: the links reversed (past adjacency) are written as they arrive,
+        and the links themselves (future adjacency) are obtained at the end by reversing them (see TransposeCSR). If a directory is given,
+        both adjacencies are written into memory mapped files, so no array of the size of the links is held in memory.
+
+    Parameters:
+        stream (generator): (j, past) pairs of a causet with N points, in increasing order of j (see StreamLinks).
+        N (int): number of points of the causet.
+        directory (str): directory of the memory mapped adjacencies (indptr.npy, indices.npy, pastptr.npy, pastind.npy).
+
+    Returns:
+        indptr (int array): CSR index pointer of the links.
+        indices (int array): CSR indices of the links.
+        pastptr (int array): CSR index pointer of the links reversed.
+        pastind (int array): CSR indices of the links reversed.
+    """
+
+    pastptr = np.zeros(N+1, dtype=np.int64) if directory is None else MappedArray(directory, 'pastptr', (N+1,), np.int64)
+
+    def Blocks(): #Past links of each point, the index pointer is filled along the way
+        for j, past in stream:
+            pastptr[j+1] = pastptr[j]+past.size
+            yield past
+
+    if directory is None:
+        pastind = np.concatenate([np.empty(0, dtype=np.int64)]+list(Blocks()))
+    else:
+        pastind = StreamArray(directory, 'pastind', Blocks(), np.int64)
+        pastptr.flush()
+
+    indptr, indices = TransposeCSR(pastptr, pastind, directory, ('indptr', 'indices')) #Reversing the past links gives the (future) links
+    return indptr, indices, pastptr, pastind
+
+
+###################################
+
+
+
+def LinksFromCSR(Points: np.ndarray, indptr: np.ndarray, indices: np.ndarray) -> dict:
+    """
+    LinksFromCSR function:
+        Converts a CSR adjacency into the link dictionary used by the rest of the library (keys are points, values sets of linked points).
+
+    Parameters:
+        Points (2D float array): (N,2) array of points.
+        indptr (int array): CSR index pointer.
+        indices (int array): CSR indices.
+
+    Returns:
+        links (dict): dictionary describing (direct) causal structure of the causet.
+    """
+
+    keys = list(map(tuple, Points.tolist())) #Points as tuples
+    targets = indices.tolist()
+    return {keys[i]: {keys[j] for j in targets[indptr[i]:indptr[i+1]]} for i in range(len(keys))}
+
+
+###################################
+
+
+
+def CSRFromLinks(links: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    CSRFromLinks function:
+        Converts a link dictionary into a sorted array of points and the equivalent CSR adjacency.
+
+    Parameters:
+        links (dict): dictionary describing (direct) causal structure of the causet.
+
+    Returns:
+        Points (2D float array): (N,2) array of points sorted by time.
+        indptr (int array): CSR index pointer.
+        indices (int array): CSR indices, sorted within each row.
+    """
+
+    Points = SortCauset(links.keys())
+    ids = {p: i for i, p in enumerate(map(tuple, Points.tolist()))} #Index of each point
+
+    rows = [sorted(ids[q] for q in links[p]) for p in map(tuple, Points.tolist())]
+    indptr = np.concatenate(([0], np.cumsum([len(row) for row in rows]))).astype(np.int64)
+    indices = np.array([j for row in rows for j in row], dtype=np.int64)
+
+    return Points, indptr, indices
+
+
+
+###################################
+
+
+
+def TransposeCSR(indptr: np.ndarray, indices: np.ndarray, directory: str = None, names: tuple[str] = ('pastptr', 'pastind'),
+                 BlockSize: int = 2**20) -> tuple[np.ndarray, np.ndarray]:
+    """
+    TransposeCSR function:
+        Reverses every link of a CSR adjacency: from the (direct) future of each point to its (direct) past. If a directory is given, the
+        reversed adjacency is written into memory mapped files and the adjacency is read by blocks of rows, so only the index pointers and one
+        block of links are in memory at a time.
+
+    Parameters:
+        indptr (int array): CSR index pointer.
+        indices (int array): CSR indices.
+        directory (str): directory of the memory mapped reversed adjacency (if any).
+        names (str tuple): names of the files of the reversed index pointer and indices (name.npy).
+        BlockSize (int): approximate number of links read at once (with a directory).
+
+    Returns:
+        pastptr (int array): CSR index pointer of the reversed links.
+        pastind (int array): CSR indices of the reversed links, sorted within each row.
+    """
+
+    N = len(indptr)-1
+
+    if directory is None:
+        sources = np.repeat(np.arange(N, dtype=np.int64), np.diff(indptr)) #Past point of each link
+        order = np.lexsort((sources, indices)) #Links sorted by future point (then by past point)
+
+        pastptr = np.zeros(N+1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=N), out=pastptr[1:])
+
+        return pastptr, sources[order]
+
+    indptr = np.asarray(indptr, dtype=np.int64)
+    cuts = np.unique(np.concatenate(([0], np.searchsorted(indptr, np.arange(BlockSize, indptr[-1], BlockSize)), [N]))) #Blocks of rows
+
+    pastptr = MappedArray(directory, names[0], (N+1,), np.int64)
+    counts = np.zeros(N, dtype=np.int64)
+    for start, stop in zip(cuts[:-1], cuts[1:]): #Number of reversed links of each point
+        counts += np.bincount(indices[indptr[start]:indptr[stop]], minlength=N)
+    np.cumsum(counts, out=pastptr[1:])
+
+    pastind = MappedArray(directory, names[1], (int(pastptr[-1]),), np.int64)
+    cursor = np.array(pastptr[:-1]) #Next free place of each reversed row
+    for start, stop in zip(cuts[:-1], cuts[1:]): #Rows are visited in order, so every reversed row is filled in increasing order
+        targets = np.asarray(indices[indptr[start]:indptr[stop]])
+        sources = np.repeat(np.arange(start, stop, dtype=np.int64), np.diff(indptr[start:stop+1]))
+        order = np.argsort(targets, kind='stable')
+        targets, sources = targets[order], sources[order]
+        first = np.searchsorted(targets, targets) #Place of each link among the links of the block with the same target
+        pastind[cursor[targets]+np.arange(len(targets))-first] = sources
+        cursor += np.bincount(targets, minlength=N)
+
+    pastptr.flush(); pastind.flush()
+    return pastptr, pastind
+
+
+###################################
+
+
+
+def EditCSR(indptr: np.ndarray, indices: np.ndarray, drop: np.ndarray, rows: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    EditCSR function:
+        Removes some entries of a CSR adjacency and inserts new ones (each in its sorted place within its row). The indices are spliced: the
+        pieces between the edits are joined in a single copy (no row is rebuilt), and the index pointer is updated from the number of entries
+        of each row.
+
+    Parameters:
+        indptr (int array): CSR index pointer.
+        indices (int array): CSR indices (sorted within each row).
+        drop (int array): positions (in indices) of the entries to be removed.
+        rows (int array): row of each new entry.
+        values (int array): value of each new entry.
+
+    Returns:
+        indptr (int array): CSR index pointer of the edited adjacency.
+        indices (int array): CSR indices of the edited adjacency.
+    """
+
+    N = len(indptr)-1
+    drop, rows, values = np.asarray(drop, dtype=np.int64), np.asarray(rows, dtype=np.int64), np.asarray(values, dtype=np.int64)
+
+    #Place of each new entry (before the first larger entry of its row), in the indices before the removal
+    where = np.array([indptr[r]+np.searchsorted(indices[indptr[r]:indptr[r+1]], v) for r, v in zip(rows, values)], dtype=np.int64)
+    order = np.lexsort((values, rows, where)) #Entries inserted at the same place are sorted by row, then by value
+    where, new = where[order], values[order]
+
+    #Pieces of the indices between the edits, joined in a single copy
+    drop = np.unique(drop)
+    events = sorted([(w, 0, k) for k, w in enumerate(where)]+[(d, 1, k) for k, d in enumerate(drop)])
+    pieces, start = [], 0
+    for place, removed, k in events:
+        pieces.append(indices[start:place])
+        if removed: start = place+1
+        else: pieces.append(new[k:k+1]); start = place
+    pieces.append(indices[start:])
+
+    counts = np.diff(indptr)
+    counts -= np.bincount(np.searchsorted(indptr, drop, side='right')-1, minlength=N) #Removed entries of each row
+    counts += np.bincount(rows, minlength=N) #New entries of each row
+    indptr = np.zeros(N+1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    indices = np.concatenate(pieces)
+
+    return indptr, indices
+
+
+###################################
+
+
+
+def _RowOffsets(indptr: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    _RowOffsets function:
+        Positions (in the CSR indices) of the entries of some rows of a CSR adjacency (vectorized).
+    """
+
+    starts, counts = indptr[rows], indptr[rows+1]-indptr[rows]
+    return np.repeat(starts-np.cumsum(counts)+counts, counts)+np.arange(counts.sum(), dtype=np.int64)
+
+
+def _RowEntries(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    _RowEntries function:
+        Gathers the entries of some rows of a CSR adjacency (vectorized), together with the row of each entry.
+    """
+
+    return np.repeat(rows, indptr[rows+1]-indptr[rows]), indices[_RowOffsets(indptr, rows)]
+
+
+###################################
+
+
+
+def InsertPointCSR(Metric: MetricTensor, Points: np.ndarray, indptr: np.ndarray, indices: np.ndarray, point: tuple[float],
+                   TimeRange: tuple[float] = None, Past: tuple[np.ndarray, np.ndarray] = None, Index: tuple = None) -> tuple:
+    """
+    InsertPointCSR function:
+        Inserts a point into a causet with known links, updating only the links affected by it. The links of the new point are the maximal
+        elements of its past and the minimal elements of its future, found with the cone index (see ConeFront), which only visits the cells
+        near the light cone of the point; the links removed by the new point are those going from the first ones to the second ones. Only the
+        conformal coordinates of the new point are computed (the index holds the ones of the causet), and the adjacency is spliced (see
+        EditCSR), so the only work proportional to the size of the causet is shifting the ids of later points.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time (the point must not belong to it).
+        indptr (int array): CSR index pointer of the links.
+        indices (int array): CSR indices of the links.
+        point (2D float tuple): point to be inserted.
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+        Past (tuple of int arrays): (pastptr, pastind) CSR adjacency of the links reversed, updated as well (if given).
+        Index (tuple): cone index of the causet (see BuildConeIndex), updated as well (it is built if none is given).
+
+    Returns:
+        Points (2D float array): (N+1,2) array of points sorted by time, with the new point.
+        indptr (int array): CSR index pointer of the updated links.
+        indices (int array): CSR indices of the updated links.
+        Past (tuple of int arrays): updated CSR adjacency of the links reversed (None if it was not given).
+        Index (tuple): updated cone index of the causet.
+        position (int): (time sorted) index of the new point; later points are shifted by one.
+    """
+
+    T = Points[:, 0]
+    lo, hi = np.searchsorted(T, point[0], side='left'), np.searchsorted(T, point[0], side='right')
+    position = int(lo+np.searchsorted(Points[lo:hi, 1], point[1])) #Time (then space) order of the new point
+
+    #Links of the new point: maximal points of its past and minimal points of its future
+    if Index is None: Index = BuildConeIndex(Metric, Points, TimeRange)
+    eta0, chi0 = IndexCoordinates(Metric, Points, Index, point, TimeRange)
+    P = ConeFront(Index, Metric.kappa, eta0, chi0, future=False, indptr=indptr, indices=indices)
+    F = ConeFront(Index, Metric.kappa, eta0, chi0, future=True, indptr=indptr, indices=indices)
+
+    Shift = lambda ids: ids+(ids >= position) #New id of the old points
+    P, F = Shift(P), Shift(F)
+
+    def Insert(ptr: np.ndarray, ind: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        #The new point is linked to the upper points, every lower point is linked to it (instead of to the upper points)
+        ptr = np.insert(ptr, position, ptr[position]) #Empty row of the new point
+        ind = Shift(ind)
+        offsets = _RowOffsets(ptr, lower)
+        drop = offsets[np.isin(ind[offsets], upper)] #Links interrupted by the new point
+        return EditCSR(ptr, ind, drop, np.concatenate((lower, np.full(len(upper), position))),
+                       np.concatenate((np.full(len(lower), position), upper)))
+
+    indptr, indices = Insert(indptr, indices, P, F)
+    if Past is not None: Past = Insert(*Past, F, P)
+
+    return np.insert(Points, position, point, axis=0), indptr, indices, Past, InsertIndex(Index, position, eta0, chi0), position
+
+
+###################################
+
+
+
+def DeletePointCSR(Metric: MetricTensor, Points: np.ndarray, indptr: np.ndarray, indices: np.ndarray, pastptr: np.ndarray,
+                   pastind: np.ndarray, position: int, TimeRange: tuple[float] = None, Index: tuple = None) -> tuple:
+    """
+    DeletePointCSR function:
+        Removes a point from a causet with known links, updating only the links affected by it. Only a point p linked to the removed point
+        and a point f linked from it can become linked: p and f are linked unless another point of the direct past of f (other than the
+        removed point) is in the future of p. Only these candidates are tested (with the conformal coordinates of the cone index, or computed
+        for them alone), and the adjacency is spliced (see EditCSR), so the only work proportional to the size of the causet is shifting the
+        ids of later points.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time.
+        indptr (int array): CSR index pointer of the links.
+        indices (int array): CSR indices of the links.
+        pastptr (int array): CSR index pointer of the links reversed.
+        pastind (int array): CSR indices of the links reversed.
+        position (int): (time sorted) index of the point to be removed; later points are shifted by one.
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+        Index (tuple): cone index of the causet (see BuildConeIndex), updated as well (if given).
+
+    Returns:
+        Points (2D float array): (N-1,2) array of points sorted by time, without the point.
+        indptr (int array): CSR index pointer of the updated links.
+        indices (int array): CSR indices of the updated links.
+        Past (tuple of int arrays): (pastptr, pastind) updated CSR adjacency of the links reversed.
+        Index (tuple): updated cone index of the causet (None if it was not given).
+    """
+
+    P, F = pastind[pastptr[position]:pastptr[position+1]], indices[indptr[position]:indptr[position+1]]
+
+    #New links: pairs (p, f) with p in the future of no other direct past point of f
+    ids = np.unique(np.concatenate([P, F, _RowEntries(pastptr, pastind, F)[1]])) #Points whose coordinates are needed
+    if Index is not None: eta, chi = Index[0][ids], Index[1][ids]
+    else: eta, chi = ConformalCoordinates(Metric, Points[ids], TimeRange)
+    coordinates = lambda points: (eta[np.searchsorted(ids, points)], chi[np.searchsorted(ids, points)])
+
+    pairs = [] #New links
+    for f in F:
+        before = pastind[pastptr[f]:pastptr[f+1]]
+        before = before[before != position] #Remaining direct past of f
+        (etaP, chiP), (etaB, chiB), (etaF, chiF) = coordinates(P), coordinates(before), coordinates(np.array([f]))
+        related = CausalRelation(Metric.kappa, etaP, chiP, etaF, chiF) #Points of P in the past of f
+        between = CausalRelation(Metric.kappa, etaP[:, None], chiP[:, None], etaB[None, :], chiB[None, :]).any(axis=1)
+        pairs += [(p, f) for p in P[related & ~between]]
+    pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+    def Delete(ptr: np.ndarray, ind: np.ndarray, lower: np.ndarray, rows: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        #The removed point is dropped from the rows of the lower points, which gain the new links; its own (emptied) row is removed
+        offsets = _RowOffsets(ptr, lower)
+        drop = np.concatenate((offsets[ind[offsets] == position], np.arange(ptr[position], ptr[position+1])))
+        ptr, ind = EditCSR(ptr, ind, drop, rows, values)
+        return np.delete(ptr, position), ind-(ind > position)
+
+    indptr, indices = Delete(indptr, indices, P, pairs[:, 0], pairs[:, 1])
+    pastptr, pastind = Delete(pastptr, pastind, F, pairs[:, 1], pairs[:, 0])
+    if Index is not None: Index = DeleteIndex(Index, position)
+
+    return np.delete(Points, position, axis=0), indptr, indices, (pastptr, pastind), Index
@@ -7,6 +7,8 @@ geodesics.
 
 Classes:
     MetricTensor: (1+1) FLRW metric descriptor.
+    CausetArray: compact (array based) storage of a causet and its links.
+    CausalIndex: spatial index of a causet for light cone queries.
     CausetSimulation: description & utilities for Causets.
     ContinuumSimulation: description & utilities for continuum geodesics.
 
@@ -17,13 +19,29 @@ github: https://github.com/Cano-Jones
 
 
 #Used libraries & Methods
-from scipy.integrate import dblquad #Computation of volume
+from scipy.integrate import quad #Computation of volume, conformal time
 from sympy.utilities.lambdify import lambdify #Derivative definition
-from sympy import symbols #Derivative definition
-from .CausalSetTheory_Geodesics import SetCauset, GetLinks, ChronologicalFuture, GetGeodesic #Causet utilities
+from sympy import symbols, sympify #Derivative definition, scale factor expression
+from .CausalSetTheory_Geodesics import SetCauset, SprinkleCauset, GetLinks, ChronologicalFuture, GetGraph, GetGeodesic, GetMaximalChain #Causet utilities
+from .CausalSetTheory_Geodesics import LongestChainArray, LongestChainStream, MaximalChainIds, BatchMaximalChains #Causet utilities (array versions)
+from .CausalSetTheory_Geodesics import SeedStream, ChildSeed #Random streams of the sprinkling
 from .Printing_Module import PrintCauset, PrintHaseDiagram, PrintContinuumGeodesic, PrintFuture #Printing utilities
-from .Continuum_Geodesics import ComputeGeodesic, ComputeVt, CutGeodesic #Continuum utilities
-from math import sqrt #square root, volume computation
+from .Continuum_Geodesics import ComputeGeodesic, ComputeVt, CutGeodesic, ComputeGeodesicBundle, ComputeGeodesicToBoundary, RadiusFunction #Continuum utilities
+from .Causal_Structure import SortCauset, FutureMask, IntervalMask, GetLinksCSR, LinksFromCSR, CSRFromLinks, TransposeCSR #Vectorized causal structure
+from .Causal_Structure import StreamLinks, LinksFromStream #Streaming link construction
+from .Causal_Structure import InsertPointCSR, DeletePointCSR #Incremental link updates
+from .Causal_Structure import ConformalCoordinates, BuildConeIndex, ConeQuery, IntervalQuery, IndexCoordinates #Light cone index
+from .Causal_Structure import NullCoordinates, ParetoLinksCSR #Null coordinates
+from .Parallel_Module import ParallelLinksCSR #Process pool link construction
+from .Ensemble_Module import RunEnsemble, LoadEnsemble, ChainsDeviation, EnsembleDeviation #Ensembles of replicas, deviation statistics
+from .Storage_Module import SimulationKey, LinksKey, CacheLoad, CacheSave, CacheEvict #On-disk cache
+from .Storage_Module import OpenArray, SaveArray #Memory mapped storage
+from .Metric_Module import ClassifyScaleFactor, ConformalTimeFunctions, ConformalTable, ExpressionScaleFactor #Metric utilities
+from .Metric_Module import ScaleIntegralFunction, SpaceIntegral #Closed form volumes
+from .CausalSetTheory_Geodesics import CellVolumes #Volume of grid cells
+from functools import partial #Picklable scale factor
+import numpy as np #Vectorized computations
+from collections.abc import MutableSet #Set interface of CausetArray
 
 
 #################################################################
@@ -38,8 +56,21 @@ class MetricTensor():
         kappa (int): space curvature constant (-1,0,1)
         a (callable): scale factor (time-coordinate function).
         da (callable): time derivative of scale factor (time-coordinate function)
+        ScaleType (str): functional form of the scale factor ('constant', 'power', 'exponential' or 'generic')
+        ScaleParameters (dict): parameters of the functional form of the scale factor
+        ConformalTime (callable): closed form conformal time eta(t) (None if there is no closed form)
+        InverseConformalTime (callable): closed form inverse of the conformal time t(eta) (None if there is no closed form)
+        ConformalTables (dict): tabulated conformal times, for each (TimeRange, tolerance) requested
+        ScaleIntegral (callable): closed form time integral of the scale factor A(t) (None if there is no closed form)
+        ScaleTables (dict): tabulated time integrals of the scale factor, for each TimeRange requested
+        Expression (str): scale factor written as a string (used to send the metric to other processes)
     
     Class methods:
+        ScaleFactor: Evaluates the scale factor on an array of times.
+        ConformalTable: Tabulates the conformal time over a time range (for scale factors without closed form conformal time).
+        ConformalInterval: Conformal time elapsed between two times.
+        NullCoordinates: Maps an array of points to null (light cone) coordinates.
+        CumulativeScale: Time integral of the scale factor (closed form or tabulated once), used by every volume computation.
         ComputeVolume: Given the spacetime boundary conditions of a given region, returns the volume of said region.
         Derivative: Given a one parameter symbolic function, returns its derivative as a numerical callable function.
     """
@@ -53,16 +84,156 @@ class MetricTensor():
             a (callable symbolic): scale factor (time-coordinate function) written with sympy functions.
         """
         self.kappa=kappa # Space curvature constant
+        self.Expression = str(sympify(a(symbols('t')))) # Scale factor as a string
         self.a=lambdify(symbols('t'), a(symbols('t')), 'math') # Scale factor (converted from Symbolic to numerical function)
         self.da = self.Derivative(a) # Time derivative of the scale factor (converted to numerical function) 
+        self._a_numpy = lambdify(symbols('t'), a(symbols('t')), 'numpy') # Scale factor as a vectorized (numpy) function
+
+        # The scale factor is classified once, so that causal tests and sprinkling do not need symbolic computations
+        self.ScaleType, self.ScaleParameters = ClassifyScaleFactor(a)
+        self.ConformalTime, self.InverseConformalTime = ConformalTimeFunctions(self.ScaleType, self.ScaleParameters)
+        self.ConformalTables = {} # Tabulated conformal times (only needed without closed form)
+        self._Table = None # Conformal time table currently in use
+        self.ScaleIntegral = ScaleIntegralFunction(self.ScaleType, self.ScaleParameters) # Closed form integral of the scale factor
+        self.ScaleTables = {} # Tabulated integrals of the scale factor (only needed without closed form)
     
+
+    def ScaleFactor(self, t: 'np.ndarray') -> 'np.ndarray':
+        """
+        ScaleFactor method
+
+        Vectorized evaluation of the scale factor.
+
+        Parameters:
+            t (float array): time coordinates.
+
+        Returns:
+            a (float array): scale factor at each time (same shape as t).
+        """
+        t = np.asarray(t, dtype=np.float64)
+        return np.broadcast_to(self._a_numpy(t), t.shape).astype(np.float64) # Constant scale factors are broadcasted to the shape of t
+
     
+    def ConformalTable(self, TimeRange: tuple[float], tol: float = None) -> tuple['callable', 'callable']:
+        """
+        ConformalTable method
+
+        Builds (once) a table of the conformal time eta(t) and its inverse over a time range, so that causal tests become a difference of
+        tabulated values instead of a numerical integration. Tables are stored for each time range and tolerance, so that every simulation
+        sharing this metric reuses them. The last requested table is the one used by ConformalInterval.
+
+        Parameters:
+            TimeRange (2D float tuple): lower and upper time bounds of the table.
+            tol (float): requested absolute error of the table. If none is given, any stored table covering TimeRange is reused (a new one
+                is built with tolerance 1e-10 otherwise).
+
+        Returns:
+            Eta (callable): vectorized conformal time eta(t).
+            InverseEta (callable): vectorized inverse conformal time t(eta).
+        """
+        TimeRange = (float(TimeRange[0]), float(TimeRange[1]))
+
+        if tol is None:
+            # Any stored table covering the requested time range is valid
+            for (T_inf, T_sup, _), table in self.ConformalTables.items():
+                if T_inf <= TimeRange[0] and TimeRange[1] <= T_sup:
+                    self._Table = table
+                    return table
+            tol = 1e-10
+
+        key = (TimeRange[0], TimeRange[1], tol)
+        if key not in self.ConformalTables:
+            self.ConformalTables[key] = ConformalTable(self.ScaleFactor, TimeRange, tol)
+        self._Table = self.ConformalTables[key]
+        return self._Table
+
+
+    def ConformalInterval(self, t1: float, t2: float) -> float:
+        """
+        ConformalInterval method
+
+        Conformal time elapsed between two times, int_{t1}^{t2} dt/a(t). The closed form is used when it exists, otherwise the conformal
+        time table in use (if it covers both times), and a numerical integration as last resort.
+
+        Parameters:
+            t1 (float): initial time.
+            t2 (float): final time.
+
+        Returns:
+            _ (float): conformal time elapsed between t1 and t2.
+        """
+        if self.ConformalTime is not None:
+            return float(self.ConformalTime(t2)-self.ConformalTime(t1))
+
+        if self._Table is not None:
+            Eta = self._Table[0]
+            if Eta.x[0] <= min(t1, t2) and max(t1, t2) <= Eta.x[-1]:
+                eta1, eta2 = Eta((t1, t2)) # Both times are interpolated in a single call
+                return float(eta2-eta1)
+
+        return quad(lambda t: 1/self.a(t), t1, t2)[0]
+
+
+    def NullCoordinates(self, Points: 'np.ndarray', TimeRange: tuple[float] = None) -> tuple['np.ndarray', 'np.ndarray']:
+        """
+        NullCoordinates method
+
+        Maps a whole array of points to null coordinates u = eta - chi, v = eta + chi in a single vectorized call (see NullCoordinates). For
+        kappa = 0, -1 the causal relation is then the coordinate-wise dominance of (u, v) (see NullRelation).
+
+        Parameters:
+            Points (2D float array): (N,2) array of points, each row being (t, r).
+            TimeRange (2D float tuple): time range of the conformal time table (only used if there is no closed form).
+
+        Returns:
+            u (float array): retarded null coordinate of each point.
+            v (float array): advanced null coordinate of each point.
+        """
+        Points = np.asarray(Points, dtype=np.float64).reshape(-1, 2)
+        if self.ConformalTime is None and TimeRange is not None: self.ConformalTable(TimeRange) # Conformal time table (reused if already built)
+        return NullCoordinates(self, Points, TimeRange)
+
+
+    def CumulativeScale(self, t: 'np.ndarray', TimeRange: tuple[float] = None) -> 'np.ndarray':
+        """
+        CumulativeScale method
+
+        Time integral of the scale factor, A(t) = int a(t) dt (up to an additive constant, so only differences are meaningful). The closed
+        form is used when it exists; otherwise the integral is tabulated once over the time range (a cumulative quadrature interpolated with a
+        cubic Hermite spline, see ConformalTable) and reused by every later call covering the same times.
+
+        Parameters:
+            t (float array): time coordinates.
+            TimeRange (2D float tuple): time range of the table (if none is given, the range of t is used).
+
+        Returns:
+            A (float array): time integral of the scale factor at each time.
+        """
+        t = np.asarray(t, dtype=np.float64)
+        if self.ScaleIntegral is not None:
+            return np.broadcast_to(self.ScaleIntegral(t), t.shape).astype(np.float64)
+
+        T_inf, T_sup = (float(t.min()), float(t.max())) if t.size else (0.0, 0.0)
+        if TimeRange is not None: T_inf, T_sup = min(T_inf, TimeRange[0]), max(T_sup, TimeRange[1])
+
+        for (Table_inf, Table_sup), table in self.ScaleTables.items(): # Any stored table covering the requested times is valid
+            if Table_inf <= T_inf and T_sup <= Table_sup:
+                return table(t)
+
+        # The integral of a(t) is the conformal time of the scale factor 1/a(t), so the conformal time table is reused
+        table = ConformalTable(lambda s: 1/self.ScaleFactor(s), (T_inf, T_sup))[0]
+        self.ScaleTables[(T_inf, T_sup)] = table
+        return table(t)
+
+
     def ComputeVolume(self, TimeRange: tuple[float],
                    SpaceRange: tuple[callable]) -> float:
         """
         ComputeVolume method
 
         This method computes the volumen of a (1+1) region of spacetime described by its space and time boundaries. To correctly describe any region, the space boundaries can be a function of the time coordinates.
+        Since the volume element is separable, rectangular regions are computed in closed form (see CellVolumes), and regions with time
+        dependent space boundaries need a single time integral.
 
         Parameters:
             TimeRange (2D float tuple): (2D) Tuple consisting in the lower and upper time bounds of region.
@@ -71,23 +242,19 @@ class MetricTensor():
         Returns:
             Volume (float): Volume of region of spacetime described by TimeRange & SpaceRange.
         """
-        # To compute the volume of the region we must compute the integral considering the correct boundaries and volume element
-    
-        def det_g(r,t): #Volume element
-            # The volume element of a metric is given by the square root of the tensor deteminant times -1
-            k = self.kappa
-            a = self.a
-            return a(t)/sqrt(1-k*r*r) # For a FLRW metric, this is the correct volume element
-
         # We extract the boundaries for future integration
 
         T_inf, T_sup = TimeRange # Lower and upper time bounds
+        if not callable(SpaceRange[0]) and not callable(SpaceRange[1]): # Rectangular region, product of the time and space integrals
+            return float(CellVolumes(self, np.array([T_inf, T_sup], dtype=np.float64), np.array(SpaceRange, dtype=np.float64))[0, 0])
+
         #We will consider the space boundaries as function of time, next lines make sure that this boundaries are callables
         S_inf = SpaceRange[0] if callable(SpaceRange[0]) else lambda t: SpaceRange[0] # Lower space bound
         S_sup = SpaceRange[1] if callable(SpaceRange[1]) else lambda t: SpaceRange[1] # Upper space bound
 
-        # The integration is done using the scipy.integrate.dblquad function
-        return dblquad(det_g, T_inf, T_sup, S_inf, S_sup)[0] #We return only the zeroth element, the first would be estimated error
+        # The space integral of the volume element is known in closed form, so only the time integral is computed numerically
+        k = self.kappa
+        return quad(lambda t: self.a(t)*(SpaceIntegral(k, S_sup(t))-SpaceIntegral(k, S_inf(t))), T_inf, T_sup)[0]
     
 
 
@@ -112,6 +279,361 @@ class MetricTensor():
         return lambdify(symbols('t'), derivative, 'math') # Returns the result as a callable written with 'math' library
 
 
+    def __reduce__(self) -> tuple:
+        """
+        Pickling method
+
+        The scale factor given by the user (usually a lambda function) can not be pickled, so the metric is rebuilt from the string of its
+        scale factor. Conformal time tables are kept, so other processes do not need to compute them again.
+        """
+        state = {'ConformalTables': self.ConformalTables, '_Table': self._Table, 'ScaleTables': self.ScaleTables}
+        return (MetricTensor, (self.kappa, partial(ExpressionScaleFactor, self.Expression)), state)
+
+
+
+##################################################
+
+
+class CausetArray(MutableSet):
+    """
+    Class CausetArray
+
+    Compact storage of a causet: instead of a set of (t, r) tuples, points are stored in a single (N,2) float array sorted by time, so that
+    the integer id of a point is its row in the array (and ids are a topological order of the causal relation). Links are stored as a CSR
+    adjacency over these ids. The class behaves as a set of (t, r) tuples (add, discard, in, len, iteration, set operations), so it can be
+    used wherever a causet set was used.
+
+    Class attributes:
+        Points (2D float array): (N,2) array of points sorted by time, each row being (t, r)
+        indptr (int array): CSR index pointer of the links, the links of point i are indices[indptr[i]:indptr[i+1]] (None if not computed)
+        indices (int array): CSR indices of the links (None if not computed)
+
+    Class methods:
+        Id: Given a point, returns its integer id.
+        Point: Given an integer id, returns the point as a tuple.
+        SetLinks: Saves a CSR adjacency of links.
+        HasLinks: Determines whether the links of the causet are known.
+        Future: Given an integer id, returns the ids of its linked (direct future) points.
+        PastCSR: Returns the CSR adjacency of the links reversed (computed once, then reused).
+        FromSet: Creates a CausetArray from a set of points.
+        FromLinks: Creates a CausetArray (with links) from a link dictionary.
+        ToSet: Converts the causet into a set of tuples.
+        ToLinks: Converts the links into a link dictionary.
+        Save: Stores the points and links as .npy files in a directory.
+        Open: Opens a stored causet as memory maps (for causets larger than the available memory).
+    """
+
+    def __init__(self, Points: np.ndarray = None, indptr: np.ndarray = None, indices: np.ndarray = None) -> None:
+        """
+        Constructor for CausetArray class
+
+        Parameters:
+            Points (2D float array): (N,2) array of points (sorted by time if links are given).
+            indptr (int array): CSR index pointer of the links over the rows of Points.
+            indices (int array): CSR indices of the links over the rows of Points.
+        """
+        Points = np.empty((0, 2)) if Points is None else np.asarray(Points, dtype=np.float64).reshape(-1, 2)
+        if indptr is None: Points = SortCauset(Points) #Without links the points can be reordered freely
+
+        self.Points = np.ascontiguousarray(Points) #Time sorted points
+        self.indptr = indptr #CSR index pointer of the links
+        self.indices = indices #CSR indices of the links
+        self._Past = None #CSR adjacency of the links reversed (computed when needed)
+
+    @classmethod
+    def _from_iterable(cls, iterable) -> set:
+        # Set operations (union, difference...) return ordinary sets of tuples
+        return set(iterable)
+
+    def _Position(self, point: tuple[float]) -> int:
+        # Row where the point is (or would be inserted) keeping the time order (binary search over time, then over space)
+        T = self.Points[:, 0]
+        lo = int(np.searchsorted(T, point[0], side='left'))
+        hi = int(np.searchsorted(T, point[0], side='right'))
+        return lo+int(np.searchsorted(self.Points[lo:hi, 1], point[1]))
+
+    def __len__(self) -> int:
+        return len(self.Points)
+
+    def __iter__(self):
+        return iter(map(tuple, self.Points.tolist()))
+
+    def __contains__(self, point) -> bool:
+        try:
+            i = self._Position(point)
+        except (TypeError, IndexError, ValueError):
+            return False
+        return i < len(self.Points) and self.Points[i, 0] == point[0] and self.Points[i, 1] == point[1]
+
+    def __repr__(self) -> str:
+        return f"CausetArray({len(self)} points, {'with' if self.HasLinks() else 'without'} links)"
+
+    def add(self, point: tuple[float]) -> None:
+        """
+        add method
+
+        Adds a point to the causet, keeping the time order. Since links depend on every point, known links are discarded.
+        """
+        if point in self: return
+        self.Points = np.insert(self.Points, self._Position(point), point, axis=0)
+        self.indptr = self.indices = self._Past = None
+
+    def discard(self, point: tuple[float]) -> None:
+        """
+        discard method
+
+        Removes a point from the causet (if present). Since links depend on every point, known links are discarded.
+        """
+        if point not in self: return
+        self.Points = np.delete(self.Points, self._Position(point), axis=0)
+        self.indptr = self.indices = self._Past = None
+
+    def Id(self, point: tuple[float]) -> int:
+        """
+        Id method
+
+        Given a point of the causet, returns its integer id (row of the Points array). Raises KeyError if the point is not in the causet.
+        """
+        if point not in self: raise KeyError(point)
+        return self._Position(point)
+
+    def Point(self, i: int) -> tuple[float]:
+        """
+        Point method
+
+        Given an integer id, returns the corresponding point as a (t, r) tuple.
+        """
+        return tuple(self.Points[i].tolist())
+
+    def SetLinks(self, indptr: np.ndarray, indices: np.ndarray) -> None:
+        """
+        SetLinks method
+
+        Saves a CSR adjacency describing the links between the points of the causet (indexed by their ids).
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self._Past = None
+
+    def HasLinks(self) -> bool:
+        """
+        HasLinks method
+
+        Determines whether the links of the causet are known.
+        """
+        return self.indptr is not None
+
+    def Future(self, i: int) -> np.ndarray:
+        """
+        Future method
+
+        Given an integer id, returns the ids of the points linked to it (its direct future).
+        """
+        return self.indices[self.indptr[i]:self.indptr[i+1]]
+
+    def PastCSR(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        PastCSR method
+
+        Returns the CSR adjacency of the links reversed (the direct past of every point), used to walk chains backwards. It is computed once
+        and reused until the links change.
+        """
+        if self._Past is None: self._Past = TransposeCSR(self.indptr, self.indices)
+        return self._Past
+
+    @classmethod
+    def FromSet(cls, Causet: set[tuple[float]]) -> 'CausetArray':
+        """
+        FromSet method
+
+        Creates a CausetArray from a set (or any iterable) of (t, r) points.
+        """
+        return cls(SortCauset(Causet))
+
+    @classmethod
+    def FromLinks(cls, links: dict) -> 'CausetArray':
+        """
+        FromLinks method
+
+        Creates a CausetArray, including its links, from a link dictionary (keys are points, values sets of linked points).
+        """
+        return cls(*CSRFromLinks(links))
+
+    def ToSet(self) -> set[tuple[float]]:
+        """
+        ToSet method
+
+        Converts the causet into a set of (t, r) tuples.
+        """
+        return set(self)
+
+    def ToLinks(self) -> dict:
+        """
+        ToLinks method
+
+        Converts the links of the causet into a link dictionary (keys are points, values sets of linked points).
+        """
+        if not self.HasLinks(): return {}
+        return LinksFromCSR(self.Points, self.indptr, self.indices)
+
+    def Save(self, directory: str) -> None:
+        """
+        Save method
+
+        Stores the points (and links, if known) of the causet as .npy files in a directory, so they can be opened as memory maps (see Open).
+        """
+        SaveArray(directory, 'Points', self.Points)
+        if self.HasLinks():
+            SaveArray(directory, 'indptr', self.indptr)
+            SaveArray(directory, 'indices', self.indices)
+
+    @classmethod
+    def Open(cls, directory: str, mode: str = 'r') -> 'CausetArray':
+        """
+        Open method
+
+        Opens a causet stored with Save, mapping its points and links into memory (only the parts being used are read from disk, so the causet
+        can be larger than the available memory). Adding or removing points creates an in-memory copy of the points.
+
+        Parameters:
+            directory (str): directory of the stored causet.
+            mode (str): 'r' (read only), 'r+' (read and write) or 'c' (copy on write).
+        """
+        causet = cls()
+        causet.Points = OpenArray(directory, 'Points', mode) #Points were already sorted when they were saved
+        indptr, indices = OpenArray(directory, 'indptr', mode), OpenArray(directory, 'indices', mode)
+        if indptr is not None and indices is not None and len(indptr) == len(causet.Points)+1:
+            causet.SetLinks(indptr, indices)
+        return causet
+
+
+##################################################
+
+
+class CausalIndex():
+    """
+    Class CausalIndex
+
+    This object describes a spatial index of a (time sorted) causet for light cone queries: a grid in null coordinates (see BuildConeIndex),
+    so that future, past and interval queries only visit the points near the cone instead of scanning the whole causet. Results are ids of
+    the points (rows of the Points array), sorted by time.
+
+    Class attributes:
+        Metric (MetricTensor class): metric manifold of the causet
+        Points (2D float array): (N,2) array of indexed points sorted by time
+        TimeRange (2D float tuple): time range of the simulation (conformal time table)
+        Index (tuple): arrays of the index (see BuildConeIndex)
+
+    Class methods:
+        Future: Given a point, returns the ids of the points in its causal future.
+        Past: Given a point, returns the ids of the points in its causal past.
+        Interval: Given two points, returns the ids of the points in their causal interval.
+    """
+
+    def __init__(self, Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None, CellPoints: int = 16,
+                 Index: tuple = None) -> None:
+        """
+        Constructor for CausalIndex class
+
+        Parameters:
+            Metric (MetricTensor class): metric manifold of the causet
+            Points (2D float array): (N,2) array of points sorted by time
+            TimeRange (2D float tuple): time range of the simulation (conformal time table)
+            CellPoints (int): average number of points per cell of the grid
+            Index (tuple): arrays of an index of the points already built (i.e. updated by InsertPointCSR), if any
+        """
+        self.Metric = Metric #Metric manifold of the causet
+        self.Points = Points #Indexed points
+        self.TimeRange = TimeRange #Time range of the simulation
+        self.Index = Index if Index is not None else BuildConeIndex(Metric, Points, TimeRange, CellPoints) #Grid in null coordinates
+
+    def _Conformal(self, point: tuple[float]) -> tuple[float, float]:
+        # Conformal coordinates of a single point
+        return IndexCoordinates(self.Metric, self.Points, self.Index, point, self.TimeRange)
+
+    def Future(self, point: tuple[float]) -> np.ndarray:
+        """
+        Future method
+
+        Given a point, returns the ids of the points in its causal future (the point itself excluded), see ConeQuery.
+        """
+        return ConeQuery(self.Index, self.Metric.kappa, *self._Conformal(point), future=True)
+
+    def Past(self, point: tuple[float]) -> np.ndarray:
+        """
+        Past method
+
+        Given a point, returns the ids of the points in its causal past (the point itself excluded), see ConeQuery.
+        """
+        return ConeQuery(self.Index, self.Metric.kappa, *self._Conformal(point), future=False)
+
+    def Interval(self, source: tuple[float], target: tuple[float]) -> np.ndarray:
+        """
+        Interval method
+
+        Given two points, returns the ids of the points in their causal (Alexandrov) interval, both points included, see IntervalQuery.
+        """
+        return IntervalQuery(self.Index, self.Metric.kappa, *self._Conformal(source), *self._Conformal(target))
+
+
+
+##################################################
+
+
+class CausetCache():
+    """
+    Class CausetCache
+
+    This object describes an on-disk cache of sprinkled causets and their links (see Storage_Module). Entries are .npz files addressed by
+    the content they describe, so a simulation with the same metric, region, point number, divisions, seed and method finds its causet (and
+    the links of the same points) without computing them again. The least recently used entries are removed when the cache exceeds its size.
+
+    Class attributes:
+        directory (str): directory where the entries are stored
+        MaxSize (int): maximum size of the cache in bytes (None for no limit)
+
+    Class methods:
+        Load: Loads the arrays of an entry (None if there is no such entry).
+        Save: Stores arrays as an entry, evicting the least recently used entries if needed.
+        Clear: Removes every entry of the cache.
+    """
+
+    def __init__(self, directory: str, MaxSize: int = 2**30) -> None:
+        """
+        Constructor for CausetCache class
+
+        Parameters:
+            directory (str): directory where the entries are stored (created if needed)
+            MaxSize (int): maximum size of the cache in bytes (1 GiB by default, None for no limit)
+        """
+        self.directory = directory #Directory of the entries
+        self.MaxSize = MaxSize #Maximum size of the cache
+
+    def Load(self, key: str) -> dict:
+        """
+        Load method
+
+        Loads the arrays of an entry (see CacheLoad), which becomes the most recently used one.
+        """
+        return CacheLoad(self.directory, key)
+
+    def Save(self, key: str, **arrays: np.ndarray) -> None:
+        """
+        Save method
+
+        Stores arrays as an entry (see CacheSave), evicting the least recently used entries if the cache exceeds MaxSize.
+        """
+        CacheSave(self.directory, key, self.MaxSize, **arrays)
+
+    def Clear(self) -> None:
+        """
+        Clear method
+
+        Removes every entry of the cache.
+        """
+        CacheEvict(self.directory, 0)
+
+
 
 ##################################################
 
@@ -128,21 +650,36 @@ class CausetSimulation():
         SpaceRange (2D float tuple): Describes the upper and lower space limits of the simulation
         PointNumber (int): (Average) number of points in the causet to be generated
         Divisions (2D int tuple): Number of divisions of the spacetime range to be considered in the sprinkling
-        Causet (set): Causal set of spacetime points
+        seed (int, SeedSequence or Generator): Seed of the random sprinkling
+        SeedSequence (numpy SeedSequence): Root of the (independent) random streams of each sprinkling block and each replica
+        cache (CausetCache class): On-disk cache of causets (only seeded simulations) and links
+        storage (str): Directory of the memory mapped causet, causal matrix and links (out of core causets)
+        Causet (CausetArray class): Causal set of spacetime points (behaves as a set of (t, r) tuples)
         Links (Dict): Dictionary containing the (direct) future of a given point 
         Geodesic([T,X] list, where X & Y are float lists): List describig spacetime coordinates along the geodesic 
+        GeodesicLength (int): Number of points in the maximal chains of the last computed geodesic
+        EnsembleResults (list of dict): Results of each replica of the last computed ensemble
     
     Class methods:
         CreateCauset: Creates a causet from the given class attributes and saves it into the Causet attribuite of the class
-        GetLinks: Creates de Links dictionary and saves it into the Links attribute of the class
+        Replica: Creates a copy of the simulation with an independent (reproducible) random stream
+        GetLinks: Creates de Links dictionary and saves it into the Links attribute of the class (with bounded memory for large causets)
+        AddPoint: Adds a point to the causet, updating only the links affected by it
+        RemovePoint: Removes a point from the causet, updating only the links affected by it
+        ConeIndex: Returns the light cone index of the causet (built once, then reused while the causet does not change)
         PrintCauset: Prints a 2D scatter plot of the causet spacetime diagram and saves it on a given directory.
         PrintHaseDiagram: Prints the Hase Diagram of the Causet and saves it on a given directory
         PrintFuture: Prints the Hase Diagram of the Causet signaling the chronological future of a point, saves it on a given directory
         Geodesics: Computes all posible geodesics between two points.
+        BatchGeodesics: Computes the geodesics between many pairs of points, sharing the computation between pairs with the same source.
+        GetGraph: Exports the causal structure as a networkx directed graph.
+        Ensemble: Runs an ensemble of independent sprinklings of the simulation and computes the geodesics of each one.
+        Deviation: Computes the deviation statistics (RMS, chi squared...) of the causet geodesics from a continuum geodesic.
 
     """
     def __init__(self, Metric: MetricTensor, TimeRange: tuple[float], SpaceRange: tuple[float],
-                 PointNumber: int, Divisions: tuple[int]) -> None:
+                 PointNumber: int, Divisions: tuple[int], seed: 'int | np.random.SeedSequence | np.random.Generator' = None,
+                 cache: 'CausetCache | str' = None, storage: str = None) -> None:
         """
         Constructor for CausetSimulation class
 
@@ -152,6 +689,10 @@ class CausetSimulation():
             SpaceRange (2D float tuple): Describes the upper and lower space limits of the simulation
             PointNumber (int): (Average) number of points in the causet to be generated
             Divisions (2D int tuple): Number of divisions of the spacetime range to be considered in the sprinkling
+            seed (int, SeedSequence or Generator): Seed of the random sprinkling (if none is given, the global numpy random state is used)
+            cache (CausetCache class or str): On-disk cache (or its directory) of causets and links (if none is given, nothing is cached)
+            storage (str): Directory where the causet, its causal matrix and links are kept as memory mapped files (if none is given, they
+                are kept in memory)
         """
         
         self.Metric = Metric #MetricTensor class atribute
@@ -159,30 +700,215 @@ class CausetSimulation():
         self.SpaceRange = SpaceRange #2D tuple describing the upper and lower space limits of the simulation
         self.PointNumber = PointNumber #(Average) number of points in the causet to be generated
         self.Divisions = Divisions #Number of divisions of the spacetime range to be considered
+        self.seed = seed #Seed of the random sprinkling
+        self.SeedSequence = SeedStream(seed) #Root of the random streams of the simulation (None uses the global numpy random state)
+        self.cache = CausetCache(cache) if isinstance(cache, str) else cache #On-disk cache of causets and links
+        self.storage = storage #Directory of the memory mapped causet (None keeps it in memory)
 
-        self.Causet = set() #Causal set of spacetime points
-        self.Links = {} #Dictionary containing the (direct) future of a given point
+        self.Causet = CausetArray() #Causal set of spacetime points
+        self._Links = {} #Dictionary containing the (direct) future of a given point (built from the causet links when needed)
+        self._LinksCSR = None #CSR adjacency from which the dictionary was built
         self.Geodesic = None #Points of the geodesic (to be computed)
+        self.GeodesicLength = 0 #Length of the geodesic (to be computed)
+        self.EnsembleResults = None #Results of each replica of an ensemble (to be computed)
+        self._Index = None #Light cone index of the causet (built when needed)
 
     
-    def CreateCauset(self) -> None:
+    def CreateCauset(self, method: str = 'grid', workers: int = 1) -> None:
         """
         CreateCauset method
 
-        This method generates a causet withing a given spacetime region by the "Sprinkling" Poisson distribution method
-       
+        This method generates a causet withing a given spacetime region by the "Sprinkling" Poisson distribution method. With a seed, the
+        same causet is obtained every time (and for any number of workers), and it is loaded from the cache if it was already stored. With
+        a storage directory, the points are then kept in a memory mapped file.
+
+        Parameters:
+            method (str): sprinkling method. 'grid' is the original cell by cell algorithm; 'vectorized' is the same algorithm computed
+                with numpy arrays; 'exact' samples the point density directly, without any grid (Divisions is not used).
+            workers (int): number of processes sprinkling blocks of the causet ('vectorized' and 'exact' methods).
+        """
+        key = SimulationKey(self, method) if self.cache is not None else None #Only seeded simulations can be cached
+        entry = self.cache.Load(key) if key is not None else None
+        if entry is not None: #Cache hit
+            self.Causet = CausetArray(entry['Points'])
+        else:
+            if method == 'grid':
+                self.Causet = CausetArray.FromSet(SetCauset(self))
+            else:
+                self.Causet = CausetArray(SprinkleCauset(self, method=method, workers=workers))
+
+            if key is not None: self.cache.Save(key, Points=self.Causet.Points)
+
+        if self.storage is not None: #The causet is moved to a memory mapped file
+            self.Causet.Save(self.storage)
+            self.Causet = CausetArray.Open(self.storage)
+
+    def Replica(self, index: int) -> 'CausetSimulation':
+        """
+        Replica method
+
+        This method creates an (empty) copy of the simulation with an independent random stream, derived from the seed of the simulation
+        and the index of the replica (see ChildSeed), so that every replica of an ensemble can be reproduced on its own.
+
+        Parameters:
+            index (int): index of the replica.
+
+        Returns:
+            _ (CausetSimulation class): simulation with the same parameters and the seed of the replica.
+        """
+        seq = self.SeedSequence if self.SeedSequence is not None else np.random.SeedSequence()
+        return CausetSimulation(self.Metric, self.TimeRange, self.SpaceRange, self.PointNumber, self.Divisions, seed=ChildSeed(seq, 1, index))
+    
+    @property
+    def Links(self) -> dict:
+        """
+        Links attribute
+
+        Dictionary containing the (direct) future of each point. Links are stored as a CSR adjacency in the causet, this dictionary is only
+        built (once) when requested.
         """
-        self.Causet = SetCauset(self)
+        if self.Causet.HasLinks() and self._LinksCSR is not self.Causet.indptr:
+            self._Links = self.Causet.ToLinks()
+            self._LinksCSR = self.Causet.indptr
+        return self._Links
+
+    @Links.setter
+    def Links(self, links: dict) -> None:
+        self._Links = links
+        self._LinksCSR = None
+        if links: #The causet (and its CSR adjacency) is rebuilt from the dictionary
+            self.Causet = CausetArray.FromLinks(links)
+            self._LinksCSR = self.Causet.indptr
     
-    def GetLinks(self) -> None:
+    def GetLinks(self, method: str = None, workers: int = 1, MaxMemory: int = 2**26) -> None:
         """
         GetLinks method
 
         This method analizes the causality of the causet to create the Links dictionary, in wich each point in the causet
         is a key, with a value consisting of a set containing every direct future causal point to the key.
+
+        Parameters:
+            method (str): 'sets' tests causality pair by pair; 'matrix' uses the vectorized causal matrix; 'reduction' uses a transitive
+                reduction of the causal matrix; 'stream' builds the links point after point with bounded memory, without the causal matrix
+                (see StreamLinks); 'pareto' computes the links of each point as the Pareto front of its future in null coordinates, without
+                the causal matrix (see ParetoLinksCSR). All of them give the same result. The causal matrix of 'reduction' takes N^2/8 bytes,
+                so if no method is given, 'reduction' is used only while the matrix fits in MaxMemory (or it lives in memory mapped files,
+                or a process pool is requested), and 'stream' otherwise.
+            workers (int): number of processes used by the 'reduction' method (None uses every available core). The causal matrix and
+                its reduction are split in blocks of rows and computed by a process pool (see ParallelLinksCSR). With a storage directory,
+                the causal matrix and the links are computed through memory mapped files (one block of points at a time). If the simulation
+                has a cache, the links of the same points are loaded from it (and saved to it) whatever the method.
+            MaxMemory (int): memory ceiling (in bytes) of the 'stream' method, and of the causal matrix when no method is given.
         """
-        self.Links = GetLinks(self)
+        if method is None: #The causal matrix is only built if it fits in memory
+            N = len(self.Causet)
+            method = 'reduction' if self.storage is not None or workers != 1 or N*((N+7)//8) <= MaxMemory else 'stream'
+        dictionary = method not in ('reduction', 'pareto', 'stream') #Methods giving the Links dictionary instead of the CSR adjacency
+
+        key = LinksKey(self.Metric, self.Causet.Points) if self.cache is not None else None
+        entry = self.cache.Load(key) if key is not None else None
+        if entry is not None: #Cache hit (the links of the same points are the same whatever the method)
+            if dictionary: self.Links = LinksFromCSR(self.Causet.Points, entry['indptr'], entry['indices'])
+            else: self.Causet.SetLinks(entry['indptr'], entry['indices'])
+            if self.storage is not None and not dictionary: #Points and links are kept in memory mapped files
+                self.Causet.Save(self.storage)
+                self.Causet = CausetArray.Open(self.storage)
+            return
+
+        if self.Metric.ConformalTime is None: self.Metric.ConformalTable(self.TimeRange) #Conformal time table (reused if already built)
+        if method == 'reduction':
+            #The CSR adjacency is saved directly into the causet (its points are already sorted by time)
+            if workers == 1: #With a storage directory, the causal matrix and links are streamed through memory mapped files
+                self.Causet.SetLinks(*GetLinksCSR(self.Metric, self.Causet.Points, TimeRange=self.TimeRange, directory=self.storage))
+            else:
+                self.Causet.SetLinks(*ParallelLinksCSR(self.Metric, self.Causet.Points, TimeRange=self.TimeRange, workers=workers))
+
+            if self.storage is not None: #Points and links are kept in memory mapped files
+                self.Causet.Save(self.storage)
+                self.Causet = CausetArray.Open(self.storage)
+        elif method == 'pareto':
+            self.Causet.SetLinks(*ParetoLinksCSR(self.Metric, self.Causet.Points, TimeRange=self.TimeRange))
+        elif method == 'stream':
+            stream = StreamLinks(self.Metric, self.Causet.Points, TimeRange=self.TimeRange, MaxMemory=MaxMemory)
+            indptr, indices, pastptr, pastind = LinksFromStream(stream, len(self.Causet), directory=self.storage)
+            self.Causet.SetLinks(indptr, indices)
+
+            if self.storage is not None: #Points and links are kept in memory mapped files (the links are already written there)
+                self.Causet.Save(self.storage)
+                self.Causet = CausetArray.Open(self.storage)
+            self.Causet._Past = (pastptr, pastind) #The reversed links are already known
+        else:
+            self.Links = GetLinks(self, method=method)
+
+        if key is not None: #The links are saved as a CSR adjacency of the (time sorted) points
+            if dictionary: self.cache.Save(key, **dict(zip(('indptr', 'indices'), CSRFromLinks(self.Links)[1:])))
+            else: self.cache.Save(key, indptr=self.Causet.indptr, indices=self.Causet.indices)
+
+    def AddPoint(self, point: tuple[float]) -> None:
+        """
+        AddPoint method
+
+        This method adds a point to the causet (i.e. the source and tarjet of a geodesic after the sprinkling). If the links are already
+        known, only the links of the past and future of the new point are updated (see InsertPointCSR), instead of being computed again;
+        the light cone index of the causet (see ConeIndex) is used to find them, and it is updated as well. Ids of later points are shifted
+        by one.
+
+        Parameters:
+            point (2D float tuple): point to be added.
+        """
+        point = tuple(float(x) for x in point)
+        C = self.Causet
+        if point in C: return
+        if not C.HasLinks(): #Nothing to update
+            C.add(point)
+            return
+
+        Points, indptr, indices, past, Index, _ = InsertPointCSR(self.Metric, C.Points, C.indptr, C.indices, point, TimeRange=self.TimeRange,
+                                                                 Past=C._Past, Index=self.ConeIndex().Index)
+        C.Points = Points
+        C.SetLinks(indptr, indices)
+        C._Past = past #The reversed links are updated as well (if they were known)
+        self._Index = CausalIndex(self.Metric, Points, TimeRange=self.TimeRange, Index=Index)
+
+    def RemovePoint(self, point: tuple[float]) -> None:
+        """
+        RemovePoint method
+
+        This method removes a point from the causet (if present). If the links are already known, only the links between the direct past
+        and the direct future of the point are updated (see DeletePointCSR), instead of being computed again; the light cone index of the
+        causet is updated as well (if it was built). Ids of later points are shifted by one.
+
+        Parameters:
+            point (2D float tuple): point to be removed.
+        """
+        point = tuple(float(x) for x in point)
+        C = self.Causet
+        if point not in C: return
+        if not C.HasLinks(): #Nothing to update
+            C.discard(point)
+            return
+
+        if self.Metric.ConformalTime is None: self.Metric.ConformalTable(self.TimeRange) #Conformal time table (reused if already built)
+        indexed = self._Index is not None and self._Index.Points is C.Points
+        Points, indptr, indices, past, Index = DeletePointCSR(self.Metric, C.Points, C.indptr, C.indices, *C.PastCSR(), C.Id(point),
+                                                              TimeRange=self.TimeRange, Index=self._Index.Index if indexed else None)
+        C.Points = Points
+        C.SetLinks(indptr, indices)
+        C._Past = past
+        if indexed: self._Index = CausalIndex(self.Metric, Points, TimeRange=self.TimeRange, Index=Index)
     
+    def ConeIndex(self) -> CausalIndex:
+        """
+        ConeIndex method
+
+        This method returns the light cone index of the causet (see CausalIndex), used by future, past and interval queries. It is built
+        once and reused until the points of the causet change.
+        """
+        if self._Index is None or self._Index.Points is not self.Causet.Points:
+            if self.Metric.ConformalTime is None: self.Metric.ConformalTable(self.TimeRange) #Conformal time table (reused if already built)
+            self._Index = CausalIndex(self.Metric, self.Causet.Points, TimeRange=self.TimeRange)
+        return self._Index
+
     def PrintCauset(self, directory: str = None) -> None: #Add save image in directory
         """
         PrintCauset method
@@ -191,13 +917,21 @@ class CausetSimulation():
         """
         PrintCauset(self.Causet, directory=directory)
     
-    def PrintHasseDiagram(self, directory: str = None)  -> None: #Add save image in directory
+    def PrintHasseDiagram(self, directory: str = None, Stream: bool = False, MaxMemory: int = 2**26)  -> None: #Add save image in directory
         """
         PrintHasseDiagram method
 
-        This method prints the Hasse Diagram of the Causet and saves it on a given directory
+        This method prints the Hasse Diagram of the Causet and saves it on a given directory. With Stream, the links are drawn as they are
+        generated (see StreamLinks), without being stored.
         """
-        PrintHaseDiagram(self.Links, directory=directory)
+        if Stream:
+            if self.Metric.ConformalTime is None: self.Metric.ConformalTable(self.TimeRange) #Conformal time table (if needed)
+            Points = self.Causet.Points
+            stream = StreamLinks(self.Metric, Points, TimeRange=self.TimeRange, MaxMemory=MaxMemory)
+            pairs = ((self.Causet.Point(j), [self.Causet.Point(i) for i in past]) for j, past in stream) #Each point and its direct past
+            PrintHaseDiagram(pairs, directory=directory, past=True)
+        else:
+            PrintHaseDiagram(self.Links, directory=directory)
     
     def PrintFuture(self, source: tuple[float], directory: str = None) -> None:
         """
@@ -206,11 +940,156 @@ class CausetSimulation():
         This method prints a spacetime diagram of positions of the causet, alongside a color-coded causal relation with the 
         source point: if green, the point is causally related with the sorce; red otherwise.
         """
-        future = ChronologicalFuture(source, self.Causet, self.Metric)
+        Points = self.Causet.Points #Causet as an array of points
+        ids = self.ConeIndex().Future(source) #Causal future of the source, from the light cone index
+        future = set(map(tuple, Points[ids].tolist()))
         PrintFuture(self.Links, future, directory=directory)
     
-    def Geodesics(self, source: tuple[float], tarjet: tuple[float]) -> list:
-        self.Geodesic = GetGeodesic(self.Links, source=source, target=tarjet)
+    def Geodesics(self, source: tuple[float], tarjet: tuple[float], AllChains: bool = True, Interval: bool = False,
+                  Stream: bool = False, MaxMemory: int = 2**26) -> list:
+        """
+        Geodesics method
+
+        This method computes the maximal chains (causet geodesics) between two points of the causet, saving them into the Geodesic
+        attribute and their length into the GeodesicLength attribute.
+
+        Parameters:
+            source (2D float tuple): starting point of the geodesic.
+            tarjet (2D float tuple): ending point of the geodesic.
+            AllChains (bool): if True every maximal chain is computed, otherwise only one of them (much cheaper for large causets).
+            Interval (bool): if True, only the causal (Alexandrov) interval between source and tarjet is considered: its points are
+                extracted with the causal relation, and links and chains are computed inside it (the links of the whole causet are not
+                needed). The result is the same, since every chain from source to tarjet lies inside this interval.
+            Stream (bool): if True, links are not stored: they are generated point after point (see StreamLinks) and consumed by the
+                longest chain computation as they are produced, with bounded memory.
+            MaxMemory (int): memory ceiling (in bytes) of the streaming link builder.
+        """
+        if Stream:
+            Points = self.Causet.Points
+            if Interval: Points = Points[self.ConeIndex().Interval(source, tarjet)]
+            C = CausetArray(Points)
+            if self.Metric.ConformalTime is None: self.Metric.ConformalTable(self.TimeRange) #Conformal time table (if needed)
+
+            s, t = C.Id(source), C.Id(tarjet)
+            stream = StreamLinks(self.Metric, C.Points, TimeRange=self.TimeRange, MaxMemory=MaxMemory)
+            length, pastptr, pastind = LongestChainStream(stream, len(C), s, t) #Links are consumed as they are generated
+            chains = MaximalChainIds(pastptr, pastind, length, s, t)
+
+            ids = list(chains) if AllChains else [chain for chain in [next(chains, None)] if chain is not None]
+            self.Geodesic = [[C.Point(i) for i in chain] for chain in ids]
+            self.GeodesicLength = len(self.Geodesic[0]) if self.Geodesic else 0
+            return
+
+        if Interval:
+            #Points in the future of the source and the past of the tarjet; links are computed only between them
+            C = CausetArray(self.Causet.Points[self.ConeIndex().Interval(source, tarjet)])
+            C.SetLinks(*GetLinksCSR(self.Metric, C.Points, TimeRange=self.TimeRange))
+        else:
+            C = self.Causet
+
+        if not C.HasLinks(): #Links were given as a dictionary (or the causet changed after computing them)
+            if AllChains:
+                self.Geodesic = GetGeodesic(self.Links, source=source, target=tarjet)
+            else:
+                chain = GetMaximalChain(self.Links, source=source, target=tarjet)
+                self.Geodesic = [chain] if chain else []
+
+        else: #The longest chains are computed directly on the CSR adjacency of the causet, no graph is built
+            s, t = C.Id(source), C.Id(tarjet)
+            length = LongestChainArray(C.indptr, C.indices, s, t) #Longest chain from source to every point up to the target
+            chains = MaximalChainIds(*C.PastCSR(), length, s, t) #Lazy generator of maximal chains
+
+            ids = list(chains) if AllChains else [chain for chain in [next(chains, None)] if chain is not None]
+            self.Geodesic = [[C.Point(i) for i in chain] for chain in ids]
+
+        self.GeodesicLength = len(self.Geodesic[0]) if self.Geodesic else 0
+
+    def BatchGeodesics(self, pairs: list[tuple[tuple[float]]] = None, source: tuple[float] = None,
+                       tarjets: list[tuple[float]] = None, AllChains: bool = False) -> tuple[list, list]:
+        """
+        BatchGeodesics method
+
+        This method computes the maximal chains (causet geodesics) of many pairs of points at once; either a list of (source, tarjet) pairs
+        or a single source and a list of tarjets. A single longest chain sweep over the causet is shared by all tarjets of the same source,
+        so many tarjets cost about the same as one. The Geodesic attribute is not modified.
+
+        Parameters:
+            pairs (list of (source, tarjet) tuples): pairs of points to be connected.
+            source (2D float tuple): starting point of the geodesics (if no pairs are given).
+            tarjets (list of 2D float tuples): ending points of the geodesics (if no pairs are given).
+            AllChains (bool): if True every maximal chain is computed, otherwise only one of them for each pair.
+
+        Returns:
+            Geodesics (list): for each pair, list of maximal chains (each one a list of points).
+            Lengths (list of int): for each pair, number of points in its maximal chains.
+        """
+        if pairs is None: pairs = [(source, tarjet) for tarjet in tarjets]
+
+        #The CSR adjacency of the causet is used (built from the Links dictionary if the causet has no links)
+        C = self.Causet if self.Causet.HasLinks() else CausetArray.FromLinks(self.Links)
+
+        ids = [(C.Id(s), C.Id(t)) for s, t in pairs]
+        chains, lengths = BatchMaximalChains(C.indptr, C.indices, *C.PastCSR(), ids, AllChains=AllChains)
+
+        return [[[C.Point(i) for i in chain] for chain in pair] for pair in chains], lengths
+
+    def GetGraph(self) -> 'nx.DiGraph':
+        """
+        GetGraph method
+
+        Exports the causal structure (links) of the causet as a networkx directed graph. networkx is only needed for this export.
+        """
+        return GetGraph(self.Links)
+
+    def Ensemble(self, source: tuple[float], tarjet: tuple[float], Replicas: int, Geodesic: list[list[float]] = None, seed: int = None,
+                 directory: str = None, workers: int = None, method: str = 'exact', AllChains: bool = False,
+                 Radius: 'callable' = None) -> list[dict]:
+        """
+        Ensemble method
+
+        This method runs an ensemble of independent sprinklings (replicas) of the simulation, computing the geodesics between source and
+        tarjet of each one (and their deviation from a continuum geodesic, if given). Replicas are computed in a process pool and their
+        results are written to a JSON lines file as they are completed (see RunEnsemble). The results are saved into the EnsembleResults
+        attribute.
+
+        Parameters:
+            source (2D float tuple): starting point of the geodesics.
+            tarjet (2D float tuple): ending point of the geodesics.
+            Replicas (int): number of replicas.
+            Geodesic (2D list of float lists): [T, X] continuum geodesic (i.e. ContinuumSimulation.Geodesic).
+            seed (int): seed of the ensemble, each replica has its own seed derived from it (the seed of the simulation, or of the results
+                file being resumed, if none is given).
+            directory (str): name of the file where results are written (if none is given, results are not saved).
+            workers (int): number of worker processes (if none is given, every available core is used).
+            method (str): sprinkling method (see CreateCauset).
+            AllChains (bool): if True every maximal chain of each replica is computed, otherwise only one of them.
+            Radius (callable): r(t) of the continuum geodesic (i.e. ContinuumSimulation.Radius), used instead of its points for the deviations.
+        """
+        self.EnsembleResults = RunEnsemble(self, source, tarjet, Replicas, Geodesic=Geodesic, seed=seed, directory=directory,
+                                           workers=workers, method=method, AllChains=AllChains, Radius=Radius)
+        return self.EnsembleResults
+
+    def Deviation(self, Geodesic: list[list[float]], sigma: float = 1.0, Ensemble: bool = False, Radius: 'callable' = None) -> dict:
+        """
+        Deviation method
+
+        This method compares the causet geodesics with a continuum geodesic, computing the RMS, chi squared, maximum deviation and endpoint
+        mismatch of every chain at once (see ChainsDeviation). Either the chains of the last computed geodesic or those of every replica of
+        the last computed ensemble are compared.
+
+        Parameters:
+            Geodesic (2D list of float lists): [T, X] continuum geodesic (i.e. ContinuumSimulation.Geodesic).
+            sigma (float): expected (spatial) deviation of a single point, the scale of the chi squared.
+            Ensemble (bool): if True, the chains of the EnsembleResults attribute are compared (see EnsembleDeviation), otherwise the ones of
+                the Geodesic attribute.
+            Radius (callable): r(t) of the continuum geodesic (i.e. ContinuumSimulation.Radius); if none is given, the points of the continuum
+                geodesic are interpolated.
+
+        Returns:
+            statistics (dict): float arrays of each statistic, with one value per chain.
+        """
+        if Ensemble: return EnsembleDeviation(self.EnsembleResults, Geodesic, sigma=sigma, Radius=Radius)
+        return ChainsDeviation(self.Geodesic, Geodesic, sigma=sigma, Radius=Radius)
     
 
 
@@ -235,9 +1114,12 @@ class ContinuumSimulation():
         tau_span (float list): proper time range for the integration method simulation
         type (str): Type of geodesic (timelike, null or lightlike, or spacelike)
         Geodesic([T,X] list, where X & Y are float lists): List describig spacetime coordinates along the geodesic 
+        Bundle ([T,X] list, where T & X are 2D float (masked) arrays): Spacetime coordinates along each geodesic of the last computed bundle
+        Radius (callable): Space coordinate r(t) of the geodesic as a function of time, from the dense output of the integration
     
     Class methods:
         ComputeGeodesic: Given a metric manifold and initial conditions, this function computes the corresponding geodesic.
+        ComputeBundle: Given many spacial velocities (and sources), this function computes all their geodesics at once.
         PrintGeodesic: Given a list of points describing a geodesic, this method prints the spacetime diagram of the trajectory.
     """
     def __init__(self, Metric: MetricTensor, source: tuple[float],
@@ -262,41 +1144,76 @@ class ContinuumSimulation():
         self.tau_span = tau_span #Proper time values to be considered
         self.type = g_type #Type of geodesic
         self.Geodesic = None #Points of the geodesic (to be computed)
+        self.Bundle = None #Points of a bundle of geodesics (to be computed)
+        self.Radius = None #r(t) of the geodesic (to be computed)
 
 
         
-    def ComputeGeodesic(self, TimeRange: tuple[float]=None, SpaceRange: tuple[float]=None):
+    def ComputeGeodesic(self, TimeRange: tuple[float]=None, SpaceRange: tuple[float]=None, Resolution: float = 1e-5,
+                        max_step: float = np.inf) -> None:
         """
         ComputeGeodesic method
 
             This function computes all the points allong the geodesic for the given proper time parameters and initial conditions.
-            The resulting set of points are cut to be withing a given temporal and spacial range to ensure consistency with rest of functions.
+            If temporal or spacial bounds are given, the integration stops (terminal event) when the geodesic leaves them, so the last point of
+            the geodesic (the tarjet) is its exact exit point, and the points are sampled from the dense output of the integrator, denser where
+            the geodesic bends (see ComputeGeodesicToBoundary); tau_span only bounds the proper time of the integration.
 
         Parameters: 
             TimeRange (2D float tuple): Lower and upper temporal bounds to be computed. (If non given this is not considered)
             SpaceRange (2D float tuple): Lower and upper spacial bounds to be computed. (If non given this is not considered)
+            Resolution (float): maximum distance between the geodesic and the segments joining its points (only with bounds).
+            max_step (float): maximum proper time step of the integrator (only with bounds).
 
         Returns:
-            Does not return anything; results are automatically saved on self.Geodesic attribute.
+            Does not return anything; results are automatically saved on self.Geodesic and self.Radius attributes.
         """
 
-        #The points alongside the proper time range are computed using the ComputeGeodesic function from Continuum_Geodesics.py module.
-        geodesic = ComputeGeodesic(Metric=self.Metric, source=self.source,
-                               Vr=self.Vr, Vt=self.Vt, t_span=self.tau_span)
-        
-        #The final point of the geodesic is then considered to be the point tarjet.
-
-        #If there are no temporal of spacial bounds, the final point is the tarjet
+        #If there are no temporal of spacial bounds, the points alongside the proper time range are computed using the ComputeGeodesicBundle
+        #function from Continuum_Geodesics.py module (see ComputeGeodesic), and the final point is the tarjet
         if TimeRange is None and SpaceRange is None:
-            self.Geodesic = geodesic
-            self.tarjet = (geodesic[0][-1], geodesic[1][-1])
-        
-        # If there are temporal or spacial bounds, only the last point within said bounds is considered
+            T, X, solution = ComputeGeodesicBundle(self.Metric, [self.source], [self.Vr], [self.Vt], self.tau_span)
+            self.Geodesic = [T[0], X[0]]
+
+        #If there are temporal or spacial bounds, the geodesic is integrated until it leaves them using the ComputeGeodesicToBoundary function
+        #from Continuum_Geodesics.py module, so the tarjet is the exit point
         else:
-            #To obtain the proper tarjet within bounds, the geodesic is cut using the CutGeodesic funcion from Continuum_Geodesics.py module.
-            self.Geodesic = CutGeodesic(Geodesic=geodesic, TimeRange=TimeRange, SpaceRange=SpaceRange)
-            self.tarjet = (self.Geodesic[0][-1], self.Geodesic[1][-1])
+            Geodesics, _, solution = ComputeGeodesicToBoundary(self.Metric, [self.source], [self.Vr], [self.Vt], (self.tau_span[0], self.tau_span[-1]),
+                                                               TimeRange=TimeRange, SpaceRange=SpaceRange, Resolution=Resolution, max_step=max_step)
+            self.Geodesic = Geodesics[0]
+
+        self.Radius = RadiusFunction(solution) #Exact r(t), to compare causet geodesics with (see CausetSimulation.Deviation)
+        self.tarjet = (self.Geodesic[0][-1], self.Geodesic[1][-1])
         
+    def ComputeBundle(self, SpacialVelocities: list[float], sources: list[tuple[float]] = None, Compiled: bool = False,
+                      method: str = 'DOP853', TimeRange: tuple[float] = None, SpaceRange: tuple[float] = None) -> None:
+        """
+        ComputeBundle method
+
+            This function computes a bundle of geodesics (i.e. a sweep of initial velocities) of the same type as this simulation, integrated
+            together as a single vectorized state over the proper time range (see ComputeGeodesicBundle). If temporal or spacial bounds are
+            given, each geodesic is cut when it first leaves them (see CutGeodesic), and the points outside are masked.
+
+        Parameters:
+            SpacialVelocities (float list): spacial initial velocity of each geodesic.
+            sources (list of 2D float tuples): initial point of each geodesic (the source of the simulation if none is given).
+            Compiled (bool): if True, the equations of motion are lambdified from the symbolic scale factor.
+            method (str): integration method of solve_ivp.
+            TimeRange (2D float tuple): Lower and upper temporal bounds to be computed. (If non given this is not considered)
+            SpaceRange (2D float tuple): Lower and upper spacial bounds to be computed. (If non given this is not considered)
+
+        Returns:
+            Does not return anything; results are automatically saved on self.Bundle attribute.
+        """
+        Vr = np.asarray(SpacialVelocities, dtype=np.float64)
+        if sources is None: sources = [self.source]*len(Vr)
+        Vt = [ComputeVt(Metric=self.Metric, source=source, Vr=v, g_type=self.type) for source, v in zip(sources, Vr)]
+
+        T, X, _ = ComputeGeodesicBundle(self.Metric, sources, Vr, Vt, self.tau_span, method=method, Compiled=Compiled)
+        if TimeRange is not None or SpaceRange is not None:
+            T, X = CutGeodesic([T, X], TimeRange or (-np.inf, np.inf), SpaceRange or (-np.inf, np.inf), FirstSegment=True)
+        self.Bundle = [T, X]
+
     def PrintGeodesic(self, directory: str = None): #Add save image in directory
         """
         PrinGeodesic method
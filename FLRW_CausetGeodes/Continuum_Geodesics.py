@@ -8,6 +8,13 @@ Functions:
     Equations_Motion: This function serves the numerical integration method, encoding the differential equations of the geodesic.
     ComputeVt: Since temporal and spacial velocity are correlated, only one is truly needed, with this function we compute Vt from Vr.
     ComputeGeodesic: Using numerical integration methods, we solve the equations of motion of the geodesic.
+    ScaleDerivatives: Given a metric, this function returns the scale factor and its first two derivatives as vectorized functions.
+    GeodesicEquations: Given a metric and a number of geodesics, this function returns the vectorized equations of motion and their Jacobian.
+    ComputeGeodesicBundle: Using numerical integration methods, we solve the equations of motion of many geodesics at once.
+    BoundaryDistance: Given a spacetime region and the states of a bundle of geodesics, this function computes how far inside the region they are.
+    ComputeGeodesicToBoundary: Using numerical integration methods, we solve the equations of motion of geodesics until they leave a region.
+    RadiusFunction: Given the solution of the equations of motion of a bundle, this function returns the exact r(t) of one of its geodesics.
+    GeodesicRadius: Given the dense output of a bundle, this function evaluates the space coordinate of one of its geodesics at given times.
     CutGeodesic: This function extracts all points of the geodesic inside a specific region of spacetime.
 
 Author: Cano Jones, Alejandro
@@ -21,8 +28,13 @@ from typing import TYPE_CHECKING #Dedicated to function typing
 if TYPE_CHECKING:
     from .Class_Objects import *
     
-from scipy.integrate import odeint #Numerical integration methods
+from scipy.integrate import solve_ivp #Numerical integration methods
+from scipy.optimize import brentq #Exit point of each geodesic
+from scipy.sparse import csc_matrix #Jacobian of a bundle of geodesics
+from sympy import symbols, sympify, diff, lambdify #Symbolic scale factor
 from math import sqrt #Usual square root
+from functools import partial #Picklable r(t) of a geodesic
+import numpy as np #Vectorized computations
 
 
 ###################################
@@ -99,7 +111,8 @@ def ComputeVt(Metric: MetricTensor, source: tuple[float], Vr: float, g_type: str
 def ComputeGeodesic(source: tuple[float], Vr: float, Vt: float, t_span: list, Metric: MetricTensor) -> list:
     """
     ComputeGeodesic function:
-        Numerical integration method designed to compute all points alongside a specific geodesic.
+        Numerical integration method designed to compute all points alongside a specific geodesic (a bundle of a single geodesic, see
+        ComputeGeodesicBundle).
 
     Parameters:
         source (2D float tuple): initial spacetime coordinates of the geodesic.
@@ -110,60 +123,368 @@ def ComputeGeodesic(source: tuple[float], Vr: float, Vt: float, t_span: list, Me
     Returns:
         _ (2D list of lists of points): List of spacetime coordinates alongside the geodesic.
     """
-    #We will use the scipy.odeint integration method, which  needs the initial state of the system in the following structure
-    S0 = [source[0], source[1], Vt, Vr]
 
-    #The integration of the geodesic is done in the following line
-    solution = odeint(Equations_Motion, S0, t_span, (Metric,))
+    T, X, _ = ComputeGeodesicBundle(Metric, [source], [Vr], [Vt], t_span)
     
-    return solution[:, 0], solution[:, 1] #We are interested in the temporal and Spacial coordinates alongside the geodesic
+    return T[0], X[0] #We are interested in the temporal and Spacial coordinates alongside the geodesic
 
 
 ###################################
 
 
-def CutGeodesic(Geodesic: list[list[float]], TimeRange: tuple[float], SpaceRange: tuple[float]) -> list:
+
+def ScaleDerivatives(Metric: MetricTensor) -> tuple['callable', 'callable', 'callable']:
+    """
+    ScaleDerivatives function:
+        Builds (from the symbolic form of the scale factor) vectorized functions of the scale factor and its first and second time derivatives,
+        the latter being needed by the Jacobian of the equations of motion.
+
+    Parameters:
+        Metric (MetricTensor class): class object encoding parameters of the metric manifold.
+    Returns:
+        a, da, dda (callables): vectorized scale factor and its derivatives (the result has the shape of the given times).
+    """
+
+    t = symbols('t')
+    a = sympify(Metric.Expression) #Symbolic scale factor
+    Vectorize = lambda f: (lambda x: np.broadcast_to(f(x), np.shape(x)).astype(np.float64)) #Constants are broadcasted to the shape of t
+
+    return tuple(Vectorize(lambdify(t, expression, 'numpy')) for expression in (a, diff(a, t), diff(a, t, 2)))
+
+
+###################################
+
+
+
+def GeodesicEquations(Metric: MetricTensor, M: int, Compiled: bool = False, Dense: bool = False) -> tuple['callable', 'callable']:
+    """
+    GeodesicEquations function:
+        Vectorized version of Equations_Motion for a bundle of M geodesics, integrated as a single state [t, r, dt, dr] (each block holding the
+        M geodesics). The scale factor and its derivative are evaluated once per step for the whole bundle. The analytic Jacobian of the
+        equations is block diagonal (each geodesic only depends on itself), so it is built as a sparse matrix with a fixed pattern.
+        With Compiled, the complete right hand side and Jacobian are written symbolically and lambdified into single numpy expressions
+        (common subexpressions are only evaluated once).
+
+    Parameters:
+        Metric (MetricTensor class): class object encoding parameters of the metric manifold.
+        M (int): number of geodesics of the bundle.
+        Compiled (bool): if True, the right hand side is lambdified from the symbolic scale factor.
+        Dense (bool): if True the Jacobian is returned as a dense array (as needed by LSODA), otherwise as a sparse matrix.
+    Returns:
+        Equations (callable): derivatives of the state, f(tau, state).
+        Jacobian (callable): Jacobian of the derivatives, J(tau, state).
+    """
+
+    k = Metric.kappa #Spacial curvature
+
+    if Compiled:
+        t, r, vt, vr = symbols('t r vt vr')
+        a = sympify(Metric.Expression).subs(symbols('t'), t) #Symbolic scale factor
+        da = diff(a, t)
+        F = [-da*a*vr**2/(1-k*r**2), -k*vr**2*r/(1-k*r**2)-2*da*vt*vr/a] #ddt, ddr
+        J = [diff(f, x) for f in F for x in (t, r, vt, vr)] #Derivatives of ddt and ddr with respect to the state
+        Accelerations = lambdify((t, r, vt, vr), F, 'numpy', cse=True)
+        Derivatives = lambdify((t, r, vt, vr), J, 'numpy', cse=True)
+    else:
+        a, da, dda = ScaleDerivatives(Metric)
+
+        def Accelerations(x1, y1, x2, y2):
+            A, dA = a(x1), da(x1) #Scale factor and its derivative, once per step
+            w = 1-k*y1*y1
+            return -dA*A*y2*y2/w, -k*y2*y2*y1/w-2*dA*x2*y2/A #ddt, ddr
+
+        def Derivatives(x1, y1, x2, y2):
+            A, dA, ddA = a(x1), da(x1), dda(x1)
+            w = 1-k*y1*y1
+            zero = np.zeros_like(x1)
+            return [-(ddA*A+dA*dA)*y2*y2/w, -2*k*dA*A*y2*y2*y1/(w*w), zero, -2*dA*A*y2/w, #Derivatives of ddt
+                    -2*x2*y2*(ddA*A-dA*dA)/(A*A), -k*y2*y2*(w+2*k*y1*y1)/(w*w), -2*dA*y2/A, -2*k*y2*y1/w-2*dA*x2/A] #Derivatives of ddr
+
+    #Sparsity pattern of the Jacobian: dt and dr depend on the velocities, ddt and ddr on the whole state of the same geodesic
+    diagonal = np.arange(M)
+    rows = np.concatenate([diagonal, M+diagonal]+[(2+i)*M+diagonal for i in range(2) for _ in range(4)])
+    cols = np.concatenate([2*M+diagonal, 3*M+diagonal]+[j*M+diagonal for _ in range(2) for j in range(4)])
+
+    def Equations(tau: float, state: np.ndarray) -> np.ndarray:
+        x1, y1, x2, y2 = state.reshape(4, M) #[x1,y1,x2,y2]=[t,r,dt,dr] of every geodesic
+        dx2, dy2 = Accelerations(x1, y1, x2, y2)
+        return np.concatenate((x2, y2, np.broadcast_to(dx2, (M,)), np.broadcast_to(dy2, (M,)))) #Values of the derivatives of the state
+
+    def Jacobian(tau: float, state: np.ndarray):
+        x1, y1, x2, y2 = state.reshape(4, M)
+        data = np.concatenate([np.ones(2*M)]+[np.broadcast_to(d, (M,)) for d in Derivatives(x1, y1, x2, y2)])
+        jacobian = csc_matrix((data, (rows, cols)), shape=(4*M, 4*M))
+        return jacobian.toarray() if Dense else jacobian
+
+    return Equations, Jacobian
+
+
+###################################
+
+
+
+def ComputeGeodesicBundle(Metric: MetricTensor, sources: list[tuple[float]], Vr: list[float], Vt: list[float], t_span: list,
+                          method: str = 'DOP853', rtol: float = 1e-10, atol: float = 1e-12, Compiled: bool = False) -> tuple:
+    """
+    ComputeGeodesicBundle function:
+        Numerical integration of a bundle of geodesics (many sources and initial velocities) as a single vectorized state, using
+        scipy.integrate.solve_ivp with an adaptive step. The analytic Jacobian is given to the implicit methods ('Radau', 'BDF', 'LSODA'),
+        and the solution is returned with dense output, so the geodesics can be evaluated at any proper time afterwards.
+
+    Parameters:
+        Metric (MetricTensor class): encoded information of the (1+1) FLRW metric manifold.
+        sources (list of 2D float tuples): initial spacetime coordinates of each geodesic.
+        Vr (float list): initial spacial velocity of each geodesic.
+        Vt (float list): initial temporal velocity of each geodesic.
+        t_span (list of float): proper time values at which the geodesics are sampled (the first one is the initial proper time).
+        method (str): integration method of solve_ivp.
+        rtol, atol (float): relative and absolute tolerances of the integration.
+        Compiled (bool): if True, the equations of motion are lambdified from the symbolic scale factor (see GeodesicEquations).
+    Returns:
+        T (2D float array): (M, n) time coordinate of each geodesic at each sampled proper time.
+        X (2D float array): (M, n) spacial coordinate of each geodesic at each sampled proper time.
+        solution (OdeResult): result of solve_ivp; solution.sol(tau) gives the state [t, r, dt, dr] (blocks of M) at any proper time.
+    """
+
+    S0 = _InitialState(sources, Vr, Vt)
+    M = len(S0)//4
+
+    t_span = np.asarray(t_span, dtype=np.float64)
+    Equations, Jacobian = GeodesicEquations(Metric, M, Compiled=Compiled, Dense=(method == 'LSODA'))
+    options = {'jac': Jacobian} if method in ('Radau', 'BDF', 'LSODA') else {}
+
+    solution = solve_ivp(Equations, (t_span[0], t_span[-1]), S0, method=method, t_eval=t_span, dense_output=True, rtol=rtol, atol=atol,
+                         **options)
+    states = solution.y.reshape(4, M, -1) #The integration stops early if the geodesics leave the domain of the metric
+
+    return states[0], states[1], solution
+
+
+def _InitialState(sources: list[tuple[float]], Vr: list[float], Vt: list[float]) -> np.ndarray:
+    """
+    _InitialState function:
+        Initial state [t, r, dt, dr] (blocks of M) of a bundle of geodesics.
+    """
+
+    sources = np.asarray(sources, dtype=np.float64).reshape(-1, 2)
+    M = len(sources)
+    return np.concatenate((sources[:, 0], sources[:, 1], np.broadcast_to(Vt, (M,)), np.broadcast_to(Vr, (M,)))).astype(np.float64)
+
+
+###################################
+
+
+
+def BoundaryDistance(state: np.ndarray, TimeRange: tuple[float], SpaceRange: tuple[float]) -> np.ndarray:
+    """
+    BoundaryDistance function:
+        Computes how far inside a spacetime region each geodesic of a bundle is: the smallest (coordinate) distance to the time and space
+        boundaries, which is negative once the geodesic has left the region.
+
+    Parameters:
+        state (float array): state [t, r, dt, dr] of a bundle of geodesics (blocks of M, possibly with a last axis of samples).
+        TimeRange (2D float tuple): lower and upper time bounds of the region.
+        SpaceRange (2D float tuple): lower and upper space bounds of the region.
+    Returns:
+        distance (float array): distance of each geodesic (and sample) to the boundaries of the region.
+    """
+
+    state = np.asarray(state)
+    x1, y1 = np.split(state, 4)[:2]
+    return np.minimum(np.minimum(x1-TimeRange[0], TimeRange[1]-x1), np.minimum(y1-SpaceRange[0], SpaceRange[1]-y1))
+
+
+###################################
+
+
+
+def ComputeGeodesicToBoundary(Metric: MetricTensor, sources: list[tuple[float]], Vr: list[float], Vt: list[float], t_span: tuple[float],
+                              TimeRange: tuple[float] = None, SpaceRange: tuple[float] = None, method: str = 'DOP853', rtol: float = 1e-10,
+                              atol: float = 1e-12, Compiled: bool = False, max_step: float = np.inf,
+                              Resolution: float = 1e-5) -> tuple[list, np.ndarray, 'OdeResult']:
+    """
+    ComputeGeodesicToBoundary function:
+        Numerical integration of a bundle of geodesics until every one of them leaves a spacetime region. A terminal event stops the
+        integration as soon as the last geodesic crosses the boundary, so no work is wasted past it, and the exit point of each geodesic is
+        then located exactly (root of its distance to the boundary, see BoundaryDistance, on the dense output). The geodesics are sampled from
+        the dense output: each step of the integrator is subdivided until the straight segments between samples are within Resolution of the
+        geodesic, so the samples are denser where the geodesic bends (see _RefineSteps), and they end at the exit point.
+
+    Parameters:
+        Metric (MetricTensor class): encoded information of the (1+1) FLRW metric manifold.
+        sources (list of 2D float tuples): initial spacetime coordinates of each geodesic (inside the region).
+        Vr (float list): initial spacial velocity of each geodesic.
+        Vt (float list): initial temporal velocity of each geodesic.
+        t_span (2D float tuple): initial and maximum proper time of the integration (geodesics still inside the region then are ended there).
+        TimeRange (2D float tuple): lower and upper time bounds of the region (unbounded if none is given).
+        SpaceRange (2D float tuple): lower and upper space bounds of the region (unbounded if none is given).
+        method (str): integration method of solve_ivp.
+        rtol, atol (float): relative and absolute tolerances of the integration.
+        Compiled (bool): if True, the equations of motion are lambdified from the symbolic scale factor (see GeodesicEquations).
+        max_step (float): maximum proper time step of the integrator.
+        Resolution (float): (approximate) maximum distance between the geodesic and the segments joining its samples (inf keeps only the steps
+            of the integrator).
+    Returns:
+        Geodesics (list of [T, X] float arrays): spacetime coordinates along each geodesic, up to its exit point.
+        Exits (2D float array): (M,2) exit point (t, r) of each geodesic (its last point).
+        solution (OdeResult): solution of solve_ivp, whose dense output (solution.sol) gives the state of the bundle at any proper time.
+    """
+
+    if TimeRange is None: TimeRange = (-np.inf, np.inf)
+    if SpaceRange is None: SpaceRange = (-np.inf, np.inf)
+
+    S0 = _InitialState(sources, Vr, Vt)
+    M = len(S0)//4
+    Equations, Jacobian = GeodesicEquations(Metric, M, Compiled=Compiled, Dense=(method == 'LSODA'))
+    options = {'jac': Jacobian} if method in ('Radau', 'BDF', 'LSODA') else {}
+
+    def Exit(tau: float, state: np.ndarray) -> float: #Zero when the last geodesic inside the region crosses its boundary
+        return np.max(BoundaryDistance(state, TimeRange, SpaceRange))
+    Exit.terminal, Exit.direction = True, -1
+
+    solution = solve_ivp(Equations, (t_span[0], t_span[-1]), S0, method=method, events=Exit, dense_output=True, rtol=rtol, atol=atol,
+                         max_step=max_step, **options)
+
+    distance = BoundaryDistance(solution.y, TimeRange, SpaceRange) #(M, steps) distance of each geodesic at each step
+    Geodesics, Exits = [], np.empty((M, 2))
+    for i in range(M):
+        outside = np.flatnonzero(distance[i] < 0)
+        if outside.size and outside[0] > 0: #Exit point between the last step inside and the first one outside
+            j = outside[0]
+            tau = brentq(lambda s: BoundaryDistance(solution.sol(s), TimeRange, SpaceRange)[i], solution.t[j-1], solution.t[j], xtol=1e-14)
+            steps = np.append(solution.t[:j], tau)
+        else: #The geodesic never leaves the region (or starts outside of it)
+            steps = solution.t
+
+        states = solution.sol(_RefineSteps(solution.sol, steps, i, M, Resolution)) if len(steps) > 1 else solution.sol(steps).reshape(-1, 1)
+        T, X = states[i], states[M+i]
+        Geodesics.append([T, X])
+        Exits[i] = T[-1], X[-1]
+
+    return Geodesics, Exits, solution
+
+
+def _RefineSteps(sol: 'callable', steps: np.ndarray, i: int, M: int, Resolution: float, MaxDivisions: int = 4096) -> np.ndarray:
+    """
+    _RefineSteps function:
+        Proper times sampling geodesic i of a bundle: each step is divided in equal parts, as many as needed for the segments joining them to
+        stay within Resolution of the geodesic. The distance of the dense output to the chord of the step is measured at three inner points,
+        and since it decreases as the square of the step, k parts reduce it by k^2.
+    """
+
+    if not np.isfinite(Resolution): return steps
+
+    n = len(steps)-1
+    probes = steps[:-1, None]+np.diff(steps)[:, None]*np.array([0.25, 0.5, 0.75]) #(n, 3) inner points of each step
+    inner = sol(probes.ravel())[[i, M+i]].reshape(2, n, 3)
+    ends = sol(steps)[[i, M+i]]
+
+    chord = (ends[:, 1:]-ends[:, :-1])[:, :, None]
+    relative = inner-ends[:, :-1, None]
+    length = np.hypot(*chord)
+    with np.errstate(invalid='ignore', divide='ignore'): #Steps whose ends coincide, the distance to the end is used
+        error = np.where(length > 0, np.abs(chord[0]*relative[1]-chord[1]*relative[0])/length, np.hypot(*relative)).max(axis=1)
+
+    k = np.clip(np.ceil(np.sqrt(error/Resolution)), 1, MaxDivisions).astype(np.int64) #Parts of each step
+    first = np.repeat(np.cumsum(k)-k, k)
+    return np.append(np.repeat(steps[:-1], k)+(np.arange(k.sum())-first)*np.repeat(np.diff(steps)/k, k), steps[-1])
+
+
+###################################
+
+
+
+def RadiusFunction(solution: 'OdeResult', i: int = 0, M: int = 1) -> 'callable':
+    """
+    RadiusFunction function:
+        Returns the space coordinate r(t) of a (timelike or null, future directed) geodesic of a bundle as a function of time, evaluated on the
+        dense output of the integration (see GeodesicRadius), so it is as accurate as the integration itself, unlike an interpolation between
+        samples of the geodesic. The function can be pickled (i.e. sent to the worker processes of an ensemble).
+
+    Parameters:
+        solution (OdeResult): solution of the bundle, with dense output (see ComputeGeodesicBundle, ComputeGeodesicToBoundary).
+        i (int): index of the geodesic in the bundle.
+        M (int): number of geodesics of the bundle.
+
+    Returns:
+        Radius (callable): vectorized r(t) of the geodesic.
+    """
+
+    return partial(GeodesicRadius, sol=solution.sol, i=i, M=M, Tau=np.asarray(solution.t), T=np.asarray(solution.y[i]))
+
+
+###################################
+
+
+
+def GeodesicRadius(t: np.ndarray, sol: 'callable', i: int, M: int, Tau: np.ndarray, T: np.ndarray, iterations: int = 4) -> np.ndarray:
+    """
+    GeodesicRadius function:
+        Evaluates the space coordinate of geodesic i of a bundle at given times. The proper time of each time is first interpolated between the
+        steps of the integrator and then refined with Newton iterations on the dense output (dt/dtau is the temporal velocity of the state).
+        Times beyond the integrated ones are given the first (last) point of the geodesic.
+
+    Parameters:
+        t (float array): times at which the geodesic is evaluated.
+        sol (callable): dense output of the bundle (OdeSolution), state at any proper time.
+        i (int): index of the geodesic in the bundle.
+        M (int): number of geodesics of the bundle.
+        Tau (float array): proper times of the steps of the integrator.
+        T (float array): (increasing) time of the geodesic at each step.
+        iterations (int): number of Newton iterations.
+
+    Returns:
+        r (float array): space coordinate of the geodesic at each time.
+    """
+
+    t = np.asarray(t, dtype=np.float64)
+    tau = np.interp(t.ravel(), T, Tau)
+    for _ in range(iterations):
+        state = sol(tau)
+        tau = np.clip(tau-(state[i]-t.ravel())/state[2*M+i], Tau[0], Tau[-1])
+
+    return sol(tau)[M+i].reshape(t.shape)
+
+
+###################################
+
+
+def CutGeodesic(Geodesic: list[list[float]], TimeRange: tuple[float], SpaceRange: tuple[float], FirstSegment: bool = False) -> tuple:
     """
     CutGeodesic function:
         Given a set of points representing a geodesic in a (1+1) FLRW metric manifold, this function aims to "clean" the data in such a way that
-        only points of the geodesic inside a particular region of spacetime is considered, thus "cutting it".
-    
+        only points of the geodesic inside a particular region of spacetime is considered, thus "cutting it". A single boolean mask selects the
+        points inside both ranges. A batch of geodesics (2D arrays, one geodesic per row, as given by ComputeGeodesicBundle) is cut at once:
+        since each geodesic keeps a different number of points, masked arrays are returned, where the points outside the region are masked.
+
     Parameters:
-        Geodesic (2D list of float lists): List of spacetime coordinates alongside a geodesic.
+        Geodesic (2D list of float lists): List of spacetime coordinates alongside a geodesic ([T, X] 2D arrays for a batch of geodesics).
         TimeRange (2D float tuple): Range of times for which to consider points.
         SpaceRange (2D float tuple): Range of space for which to consider points.
-    
+        FirstSegment (bool): if True, only the first contiguous set of points inside the region is kept (the geodesic is cut when it first
+            leaves the region, even if it enters it again), so its last point (i.e. the tarjet) is well defined.
+
     Returns:
-        _ (2D list of float lists): List of spacetime coordinates alongside a geodesic inside a region of spacetime.
+        _ (2D tuple of float arrays): spacetime coordinates alongside the geodesic inside the region of spacetime (views of the original arrays
+            when FirstSegment is True); masked arrays for a batch of geodesics.
     """
 
-    T , X = Geodesic #We separate the temporal and spacial coordinates alongside the geodesic
-    
-    #Two empty lists that will be added points of the geodesic inside the region of spacetime
-    T_new = []
-    X_new = []
-
-    #We add to the previous lists, the points inside the TimeRange section
-    for t in range(len(T)):
-        if T[t]>=TimeRange[0] and T[t]<=TimeRange[1]:
-            T_new.append(T[t])
-            X_new.append(X[t])
-    
-    #Original Points of the geodesic are rewriten so that only the ones inside TimeRange are considered
-    T = T_new
-    X = X_new
+    T, X = np.asarray(Geodesic[0]), np.asarray(Geodesic[1]) #We separate the temporal and spacial coordinates alongside the geodesic
+    inside = (T >= TimeRange[0]) & (T <= TimeRange[1]) & (X >= SpaceRange[0]) & (X <= SpaceRange[1]) #Points inside the region
+
+    if FirstSegment: #Points after the geodesic leaves the region for the first time are discarded
+        entered = np.logical_or.accumulate(inside, axis=-1)
+        inside &= ~np.logical_or.accumulate(entered & ~inside, axis=-1)
 
-    #New lists to be considered for the spacerange
-    T_new = []
-    X_new = []
+    if T.ndim > 1: #Batch of geodesics, points outside the region are masked (the data is not copied)
+        return np.ma.masked_array(T, mask=~inside, copy=False), np.ma.masked_array(X, mask=~inside, copy=False)
 
-    #We extract again, only the points inside SpaceRange
-    for x in range(len(X)):
-        if X[x]>=SpaceRange[0] and X[x]<=SpaceRange[1]:
-            T_new.append(T[x])
-            X_new.append(X[x])
+    if FirstSegment: #A contiguous segment is a slice
+        index = np.flatnonzero(inside)
+        segment = slice(index[0], index[-1]+1) if index.size else slice(0, 0)
+        return T[segment], X[segment]
 
-    return T_new, X_new #The ponts left must be inside TimeRange and SpaceRange
+    return T[inside], X[inside] #The ponts left must be inside TimeRange and SpaceRange
 
 
 
@@ -174,4 +495,4 @@ def CutGeodesic(Geodesic: list[list[float]], TimeRange: tuple[float], SpaceRange
 
 
 
-__all__ = ['ComputeGeodesic', 'CutGeodesic', 'ComputeVt']
\ No newline at end of file
+__all__ = ['ComputeGeodesic', 'CutGeodesic', 'ComputeVt', 'ComputeGeodesicBundle', 'GeodesicEquations', 'ScaleDerivatives', 'ComputeGeodesicToBoundary', 'BoundaryDistance', 'RadiusFunction', 'GeodesicRadius']
\ No newline at end of file
@@ -0,0 +1,364 @@
+"""
+Ensemble_Module.py module
+
+This module contains the functions used to study the path-geodesic correspondence statistically: instead of a single causet, an ensemble of
+independent sprinklings (replicas) of the same spacetime region is generated, and the causet geodesics of each replica are compared with the
+continuum geodesic. Replicas are computed in a pool of processes, and their results are written to disk (one JSON line per replica) as soon as
+they are completed, so long studies can be run unattended (and resumed, since already computed replicas are skipped). The first line of the
+file describes the ensemble (its seed and parameters), so a resumed study uses the same seeds and can not be mixed with a different one.
+
+Functions:
+    ReplicaSeeds: Given a seed and a number of replicas, this function computes an independent seed for each replica.
+    ChainDeviation: Given a causet geodesic and a continuum geodesic, this function computes the spatial deviation of every point of the chain.
+    ChainsDeviation: Given many causet geodesics and a continuum geodesic, this function computes the deviation statistics of every chain at once.
+    EnsembleDeviation: Given the results of an ensemble and a continuum geodesic, this function computes the deviation statistics of all its chains.
+    RunReplica: Given a simulation and a seed, this function sprinkles a causet and computes its geodesics and their deviations.
+    EnsembleHeader: Given a simulation, the endpoints of its geodesics and a seed, this function describes the ensemble written to disk.
+    RunEnsemble: Given a simulation and a number of replicas, this function runs every replica (in parallel) and streams the results to disk.
+    LoadEnsemble: Given the file written by RunEnsemble, this function reads the results of every replica.
+
+Author: Cano Jones, Alejandro
+linkedin: www.linkedin.com/in/alejandro-cano-jones-5b20a7136
+github: https://github.com/Cano-Jones
+"""
+
+#Libraries used
+from __future__ import annotations #Dedicated to function typing
+from typing import TYPE_CHECKING #Dedicated to function typing
+if TYPE_CHECKING:
+    from .Class_Objects import *
+
+import os #Files
+import json #Results are written as JSON lines
+import hashlib #Fingerprint of the continuum geodesic
+import numpy as np #Vectorized computations
+from concurrent.futures import ProcessPoolExecutor, as_completed #Process pool
+from .CausalSetTheory_Geodesics import SeedStream, ChildSeed #Random streams of each replica
+
+
+###################################
+
+
+
+def ReplicaSeeds(seed: 'int | np.random.SeedSequence', Replicas: int) -> list[np.random.SeedSequence]:
+    """
+    ReplicaSeeds function:
+        Computes the seed of each replica of an ensemble. The seeds are independent child streams (key (1, replica), see ChildSeed) of the
+        SeedSequence of the ensemble, so the seed of a replica only depends on the seed of the ensemble and its index (not on the number of
+        workers or the order in which replicas are computed), and it is the same seed given by CausetSimulation.Replica.
+
+    Parameters:
+        seed (int or SeedSequence): seed of the ensemble.
+        Replicas (int): number of replicas.
+
+    Returns:
+        seeds (list of SeedSequence): seed of each replica.
+    """
+
+    seq = SeedStream(seed)
+    return [ChildSeed(seq, 1, i) for i in range(Replicas)]
+
+
+###################################
+
+
+
+def ChainDeviation(Chain: list[tuple[float]], Geodesic: list[list[float]], Radius: 'callable' = None) -> np.ndarray:
+    """
+    ChainDeviation function:
+        Computes the spatial deviation of every point of a causet geodesic (chain) from the continuum geodesic at the same time, r - r_geo(t).
+        The continuum geodesic is evaluated exactly if its r(t) is given (see RadiusFunction), and otherwise it is linearly interpolated between
+        its points, so they must be dense enough (see ComputeGeodesicToBoundary) not to bias the deviation.
+
+    Parameters:
+        Chain (list of 2D tuples): ordered points (t, r) of a causet geodesic.
+        Geodesic (2D list of float lists): [T, X] lists of spacetime coordinates along a (timelike) continuum geodesic.
+        Radius (callable): vectorized r(t) of the continuum geodesic (i.e. ContinuumSimulation.Radius).
+
+    Returns:
+        deviation (float array): deviation of each point of the chain.
+    """
+
+    points = np.asarray(Chain, dtype=np.float64).reshape(-1, 2)
+    if Radius is not None: return points[:, 1]-Radius(points[:, 0])
+
+    T, X = np.asarray(Geodesic[0], dtype=np.float64), np.asarray(Geodesic[1], dtype=np.float64)
+    order = np.argsort(T) #Interpolation requires increasing times
+
+    return points[:, 1]-np.interp(points[:, 0], T[order], X[order])
+
+
+###################################
+
+
+
+def ChainsDeviation(Chains: list[list[tuple[float]]], Geodesic: list[list[float]], sigma: float = 1.0, Radius: 'callable' = None) -> dict:
+    """
+    ChainsDeviation function:
+        Computes the deviation statistics of many causet geodesics (chains) from a continuum geodesic at once: the points of every chain are
+        concatenated, their deviations are computed in a single interpolation (see ChainDeviation), and then reduced chain by chain.
+
+    Parameters:
+        Chains (list of lists of 2D tuples): ordered points (t, r) of each causet geodesic.
+        Geodesic (2D list of float lists): [T, X] lists of spacetime coordinates along a (timelike) continuum geodesic.
+        sigma (float): expected (spatial) deviation of a single point, the scale of the chi squared (i.e. the discreteness scale of the causet).
+        Radius (callable): vectorized r(t) of the continuum geodesic (if none is given, its points are interpolated, see ChainDeviation).
+
+    Returns:
+        statistics (dict): float arrays with one value per chain: 'RMS' (root mean square deviation), 'Chi2' (sum of the squared deviations
+            over sigma squared), 'MaxDeviation' (maximum absolute deviation) and 'EndpointMismatch' (distance between the last point of the
+            chain and the last point of the continuum geodesic); empty chains have NaN statistics.
+    """
+
+    lengths = np.array([len(chain) for chain in Chains], dtype=np.int64)
+    C = len(lengths)
+    points = np.concatenate([np.asarray(chain, dtype=np.float64).reshape(-1, 2) for chain in Chains]) if C else np.empty((0, 2))
+
+    deviation = ChainDeviation(points, Geodesic, Radius=Radius)
+    chain = np.repeat(np.arange(C), lengths) #Chain of each point
+
+    with np.errstate(invalid='ignore', divide='ignore'): #Empty chains
+        SquareSum = np.bincount(chain, weights=deviation**2, minlength=C)
+        MaxDeviation = np.full(C, -np.inf)
+        np.maximum.at(MaxDeviation, chain, np.abs(deviation))
+        MaxDeviation[lengths == 0] = np.nan
+
+        last = points[np.maximum(np.cumsum(lengths)-1, 0)] if len(points) else np.full((C, 2), np.nan) #Last point of each chain
+        end = np.array([Geodesic[0][-1], Geodesic[1][-1]], dtype=np.float64)
+        EndpointMismatch = np.where(lengths > 0, np.hypot(*(last-end).T), np.nan)
+
+        return {'RMS': np.sqrt(SquareSum/lengths), 'Chi2': np.where(lengths > 0, SquareSum/sigma**2, np.nan), 'MaxDeviation': MaxDeviation,
+                'EndpointMismatch': EndpointMismatch}
+
+
+###################################
+
+
+
+def EnsembleDeviation(results: list[dict], Geodesic: list[list[float]], sigma: float = 1.0, Radius: 'callable' = None) -> dict:
+    """
+    EnsembleDeviation function:
+        Computes the deviation statistics (see ChainsDeviation) of every chain of every replica of an ensemble (as given by RunEnsemble or
+        LoadEnsemble) from a continuum geodesic, all of them in a single batch. The continuum geodesic does not need to be the one given to
+        the ensemble (if any), so a stored ensemble can be compared with any geodesic.
+
+    Parameters:
+        results (list of dict): results of every replica of the ensemble.
+        Geodesic (2D list of float lists): [T, X] lists of spacetime coordinates along a (timelike) continuum geodesic.
+        sigma (float): expected (spatial) deviation of a single point, the scale of the chi squared.
+        Radius (callable): vectorized r(t) of the continuum geodesic (if none is given, its points are interpolated, see ChainDeviation).
+
+    Returns:
+        statistics (dict): float arrays with one value per chain of the ensemble (see ChainsDeviation), and 'Replica' (int array) with the
+            replica of each chain.
+    """
+
+    Chains = [chain for result in results for chain in result['Chains']]
+    statistics = ChainsDeviation(Chains, Geodesic, sigma=sigma, Radius=Radius)
+    statistics['Replica'] = np.array([result['Replica'] for result in results for _ in result['Chains']], dtype=np.int64)
+
+    return statistics
+
+
+###################################
+
+
+
+def RunReplica(sim: CausetSimulation, source: tuple[float], tarjet: tuple[float], Geodesic: list[list[float]] = None,
+               seed: np.random.SeedSequence = None, Replica: int = 0, method: str = 'exact', AllChains: bool = False,
+               Radius: 'callable' = None) -> dict:
+    """
+    RunReplica function:
+        Computes a single replica of an ensemble: a causet is sprinkled (CreateCauset), the source and tarjet points are added, its links are
+        computed (GetLinks) and then its geodesics (Geodesics). If a continuum geodesic is given, the deviation of every causet geodesic from
+        it is also computed.
+
+    Parameters:
+        sim (CausetSimulation class): simulation (metric, spacetime region, point number) to be replicated; it is not modified.
+        source (2D float tuple): starting point of the geodesics.
+        tarjet (2D float tuple): ending point of the geodesics.
+        Geodesic (2D list of float lists): [T, X] continuum geodesic from source to tarjet (deviations are not computed if none is given).
+        seed (SeedSequence): seed of the random sprinkling of the replica (see ReplicaSeeds).
+        Replica (int): index of the replica.
+        method (str): sprinkling method (see CausetSimulation.CreateCauset).
+        AllChains (bool): if True every maximal chain is computed, otherwise only one of them.
+        Radius (callable): vectorized r(t) of the continuum geodesic (see ChainDeviation).
+
+    Returns:
+        result (dict): results of the replica: 'Replica', 'Points' (number of points of the causet), 'GeodesicLength', 'Chains' and, if a
+            continuum geodesic is given, the 'RMS', 'Chi2' (with unit sigma), 'MaxDeviation' and 'EndpointMismatch' of each chain.
+    """
+
+    replica = type(sim)(sim.Metric, sim.TimeRange, sim.SpaceRange, sim.PointNumber, sim.Divisions, seed=seed) #Empty copy of the simulation
+    replica.CreateCauset(method=method)
+    replica.Causet.add(tuple(source)) #Source and tarjet must belong to the causet
+    replica.Causet.add(tuple(tarjet))
+    replica.GetLinks()
+    replica.Geodesics(tuple(source), tuple(tarjet), AllChains=AllChains)
+
+    result = {'Replica': int(Replica), 'Points': len(replica.Causet), 'GeodesicLength': replica.GeodesicLength,
+              'Chains': [[list(p) for p in chain] for chain in replica.Geodesic]}
+
+    if Geodesic is not None:
+        statistics = ChainsDeviation(replica.Geodesic, Geodesic, Radius=Radius) #Deviation of every chain at once
+        for key, values in statistics.items():
+            result[key] = [float(value) for value in values]
+
+    return result
+
+
+###################################
+
+
+
+def EnsembleHeader(sim: CausetSimulation, source: tuple[float], tarjet: tuple[float], seed: np.random.SeedSequence,
+                   Geodesic: list[list[float]] = None, method: str = 'exact', AllChains: bool = False, Radius: bool = False) -> dict:
+    """
+    EnsembleHeader function:
+        Describes an ensemble (see RunEnsemble): its seed (entropy and spawn key, from which the seed of every replica is derived) and every
+        parameter its results depend on, i.e. the metric, spacetime region, point number and divisions of the simulation, the endpoints of the
+        geodesics, the sprinkling method and the continuum geodesic (as a hash of its points). It is written as the first line of the results
+        file, so a resumed ensemble can recover its seed and check that it is the same study.
+
+    Parameters:
+        sim (CausetSimulation class): simulation (metric, spacetime region, point number) to be replicated.
+        source (2D float tuple): starting point of the geodesics.
+        tarjet (2D float tuple): ending point of the geodesics.
+        seed (SeedSequence): seed of the ensemble.
+        Geodesic (2D list of float lists): [T, X] continuum geodesic from source to tarjet (if any).
+        method (str): sprinkling method (see CausetSimulation.CreateCauset).
+        AllChains (bool): if True every maximal chain is computed, otherwise only one of them.
+        Radius (bool): if True, deviations are computed from the exact r(t) of the continuum geodesic instead of its points.
+
+    Returns:
+        header (dict): JSON serializable description of the ensemble.
+    """
+
+    entropy = int(seed.entropy) if np.ndim(seed.entropy) == 0 else [int(e) for e in seed.entropy] #Entropy can be an int or a sequence of ints
+    if Geodesic is not None:
+        digest = hashlib.sha256()
+        for coordinates in Geodesic[:2]: digest.update(np.ascontiguousarray(np.ma.getdata(coordinates), dtype=np.float64).tobytes())
+        Geodesic = digest.hexdigest()
+
+    return {'Ensemble': 1, 'seed': [entropy, [int(k) for k in seed.spawn_key]], 'kappa': int(sim.Metric.kappa), 'a': sim.Metric.Expression,
+            'TimeRange': [float(t) for t in sim.TimeRange], 'SpaceRange': [float(r) for r in sim.SpaceRange],
+            'PointNumber': float(sim.PointNumber), 'Divisions': [int(d) for d in sim.Divisions], 'source': [float(x) for x in source],
+            'tarjet': [float(x) for x in tarjet], 'Geodesic': Geodesic, 'method': method, 'AllChains': bool(AllChains),
+            'Radius': bool(Radius)}
+
+
+###################################
+
+
+
+def RunEnsemble(sim: CausetSimulation, source: tuple[float], tarjet: tuple[float], Replicas: int, Geodesic: list[list[float]] = None,
+                seed: int = None, directory: str = None, workers: int = None, method: str = 'exact', AllChains: bool = False,
+                Radius: 'callable' = None) -> list[dict]:
+    """
+    RunEnsemble function:
+        Runs an ensemble of independent replicas of a simulation (see RunReplica) in a pool of processes. Each result is appended to a JSON
+        lines file as soon as its replica is completed, after a first line describing the ensemble (see EnsembleHeader). Replicas already
+        present in the file are not computed again, so an interrupted study can be resumed by calling this function with the same parameters:
+        if no seed is given, the one of the file is used; any other difference with the file raises an error.
+
+    Parameters:
+        sim (CausetSimulation class): simulation (metric, spacetime region, point number) to be replicated.
+        source (2D float tuple): starting point of the geodesics.
+        tarjet (2D float tuple): ending point of the geodesics.
+        Replicas (int): number of replicas.
+        Geodesic (2D list of float lists): [T, X] continuum geodesic from source to tarjet (deviations are not computed if none is given).
+        seed (int): seed of the ensemble, the seed of each replica is derived from it (see ReplicaSeeds). If none is given, the seed of the
+            simulation is used (the seed of the results file when resuming, or a random one if there is none).
+        directory (str): name of the JSON lines file where results are written (if none is given, results are not saved).
+        workers (int): number of worker processes (if none is given, the number of available cores is used; 1 runs in this process).
+        method (str): sprinkling method (see CausetSimulation.CreateCauset).
+        AllChains (bool): if True every maximal chain is computed, otherwise only one of them.
+        Radius (callable): vectorized r(t) of the continuum geodesic, used for the deviations (see ChainDeviation).
+
+    Returns:
+        results (list of dict): results of every replica, sorted by replica index.
+    """
+
+    if workers is None: workers = os.cpu_count() or 1
+    sim = type(sim)(sim.Metric, sim.TimeRange, sim.SpaceRange, sim.PointNumber, sim.Divisions, seed=sim.SeedSequence) #Empty copy (the causet is not sent to workers)
+
+    header, results = LoadEnsemble(directory, Header=True) if directory is not None and os.path.exists(directory) else (None, [])
+    if header is None and results:
+        raise ValueError(f'{directory} has no ensemble description, its replicas can not be resumed.')
+
+    if seed is None: seed = sim.SeedSequence
+    if seed is None and header is not None: #The seed of the ensemble being resumed
+        entropy, key = header['seed']
+        seed = np.random.SeedSequence(entropy, spawn_key=tuple(key))
+    seed = SeedStream(seed) if seed is not None else np.random.SeedSequence()
+
+    description = EnsembleHeader(sim, source, tarjet, seed, Geodesic=Geodesic, method=method, AllChains=AllChains, Radius=Radius is not None)
+    if header is not None and header != description:
+        different = sorted(key for key in description if header.get(key) != description[key])
+        raise ValueError(f'{directory} belongs to a different ensemble (it differs in {", ".join(different)}).')
+
+    done = {result['Replica'] for result in results} #Replicas already computed
+    seeds = ReplicaSeeds(seed, Replicas)
+    pending = [i for i in range(Replicas) if i not in done]
+
+    file = open(directory, 'a') if directory is not None else None
+    if file is not None and file.tell() > 0:
+        with open(directory, 'rb') as previous: #A line interrupted while being written is closed, so it does not corrupt the next one
+            previous.seek(-1, os.SEEK_END)
+            if previous.read(1) != b'\n': file.write('\n')
+    try:
+        if file is not None and header is None: #The ensemble is described before its first result
+            file.write(json.dumps(description)+'\n')
+            file.flush()
+
+        def Save(result: dict) -> None: #Results are written (and flushed) as soon as they are completed
+            results.append(result)
+            if file is not None:
+                file.write(json.dumps(result)+'\n')
+                file.flush()
+
+        arguments = dict(Geodesic=Geodesic, method=method, AllChains=AllChains, Radius=Radius)
+        if workers <= 1:
+            for i in pending:
+                Save(RunReplica(sim, source, tarjet, seed=seeds[i], Replica=i, **arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(RunReplica, sim, source, tarjet, seed=seeds[i], Replica=i, **arguments) for i in pending]
+                for future in as_completed(futures):
+                    Save(future.result())
+    finally:
+        if file is not None: file.close()
+
+    return sorted(results, key=lambda result: result['Replica'])
+
+
+###################################
+
+
+
+def LoadEnsemble(directory: str, Header: bool = False) -> list[dict]:
+    """
+    LoadEnsemble function:
+        Reads the results of an ensemble written by RunEnsemble (lines that were interrupted while being written are ignored).
+
+    Parameters:
+        directory (str): name of the JSON lines file.
+        Header (bool): if True, the description of the ensemble (see EnsembleHeader) is returned too.
+
+    Returns:
+        header (dict): description of the ensemble (None if the file has none), only if Header is True.
+        results (list of dict): results of every replica, sorted by replica index.
+    """
+
+    header, results = None, []
+    with open(directory) as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError: #Empty lines, or lines interrupted while being written
+                continue
+            if 'Ensemble' in entry: header = entry
+            elif 'Replica' in entry: results.append(entry)
+
+    results = sorted(results, key=lambda result: result['Replica'])
+    return (header, results) if Header else results
@@ -0,0 +1,244 @@
+"""
+Metric_Module.py module
+
+This module contains the functions used by the MetricTensor class to analyse its scale factor. Knowing the functional form of the scale factor
+(constant, power law, exponential) allows the rest of the library to replace numerical integrations by closed form expressions.
+
+Functions:
+    ClassifyScaleFactor: Given a symbolic scale factor, this function determines its functional form and parameters.
+    ConformalTimeFunctions: Given the functional form of a scale factor, this function returns the closed form conformal time and its inverse.
+    ConformalTable: Given a scale factor and a time range, this function tabulates the conformal time (and its inverse) to a given tolerance.
+    ScaleIntegralFunction: Given the functional form of a scale factor, this function returns the closed form time integral of the scale factor.
+    SpaceIntegral: Given the space curvature and radial coordinates, this function computes the space integral of the volume element.
+    ExpressionScaleFactor: Given a scale factor written as a string, this function evaluates it (symbolically) at a given time.
+
+Author: Cano Jones, Alejandro
+linkedin: www.linkedin.com/in/alejandro-cano-jones-5b20a7136
+github: https://github.com/Cano-Jones
+"""
+
+#Libraries used
+from sympy import symbols, sympify, simplify, diff #Symbolic computation
+import numpy as np #Vectorized computations
+import warnings #Tables that do not reach the requested tolerance
+from scipy.integrate import quad #Numerical integration
+from scipy.interpolate import CubicHermiteSpline #Interpolation of the conformal time table
+
+
+###################################
+
+
+
+def ClassifyScaleFactor(a: 'callable') -> tuple[str, dict]:
+    """
+    ClassifyScaleFactor function:
+        Determines the functional form of a scale factor written with sympy functions. The recognized forms are:
+            'constant': a(t) = a0
+            'power': a(t) = c*t^p
+            'exponential': a(t) = c*exp(H*t)
+            'generic': any other scale factor.
+
+    Parameters:
+        a (callable symbolic): scale factor (time-coordinate function) written with sympy functions.
+
+    Returns:
+        ScaleType (str): functional form of the scale factor.
+        ScaleParameters (dict): parameters of the functional form (empty dictionary for generic scale factors).
+    """
+
+    t = symbols('t')
+    expression = sympify(a(t)) #Symbolic expression of the scale factor
+    derivative = diff(expression, t) #Symbolic time derivative of the scale factor
+
+    try:
+        #Constant scale factor: its derivative is zero
+        if simplify(derivative) == 0:
+            return 'constant', {'a0': float(expression)}
+
+        #Exponential scale factor: the logarithmic derivative a'/a is constant
+        H = simplify(derivative/expression)
+        if t not in H.free_symbols:
+            return 'exponential', {'c': float(simplify(expression.subs(t, 0))), 'H': float(H)}
+
+        #Power law scale factor: the logarithmic derivative times t, t*a'/a, is constant
+        p = simplify(t*derivative/expression)
+        if t not in p.free_symbols:
+            c = simplify(expression/t**p)
+            if t not in c.free_symbols:
+                return 'power', {'c': float(c), 'p': float(p)}
+
+    except (TypeError, ValueError): #Expressions that can not be converted into numbers (i.e. extra symbols)
+        pass
+
+    return 'generic', {}
+
+
+###################################
+
+
+
+def ConformalTimeFunctions(ScaleType: str, ScaleParameters: dict) -> tuple['callable', 'callable']:
+    """
+    ConformalTimeFunctions function:
+        Returns the conformal time eta(t) = int dt/a(t) (up to an additive constant) and its inverse as vectorized closed form functions.
+
+    Parameters:
+        ScaleType (str): functional form of the scale factor (see ClassifyScaleFactor).
+        ScaleParameters (dict): parameters of the functional form.
+
+    Returns:
+        ConformalTime (callable): eta(t), None if there is no closed form.
+        InverseConformalTime (callable): t(eta), None if there is no closed form.
+    """
+
+    if ScaleType == 'constant':
+        a0 = ScaleParameters['a0']
+        return (lambda t: np.asarray(t)/a0), (lambda eta: a0*np.asarray(eta))
+
+    if ScaleType == 'power':
+        c, p = ScaleParameters['c'], ScaleParameters['p']
+        if p == 1: #Logarithmic conformal time
+            return (lambda t: np.log(t)/c), (lambda eta: np.exp(c*np.asarray(eta)))
+        return (lambda t: np.power(t, 1-p)/(c*(1-p))), (lambda eta: np.power(c*(1-p)*np.asarray(eta), 1/(1-p)))
+
+    if ScaleType == 'exponential':
+        c, H = ScaleParameters['c'], ScaleParameters['H']
+        return (lambda t: -np.exp(-H*np.asarray(t))/(c*H)), (lambda eta: -np.log(-c*H*np.asarray(eta))/H)
+
+    return None, None #Generic scale factors have no closed form conformal time
+
+
+###################################
+
+
+
+def ConformalTable(a: 'callable', TimeRange: tuple[float], tol: float = 1e-10, MaxKnots: int = 2**16) -> tuple['callable', 'callable']:
+    """
+    ConformalTable function:
+        Tabulates the conformal time eta(t) = int_{T_inf}^{t} dt/a(t) over a time range, so that conformal time differences can be evaluated
+        without any numerical integration. The values at the knots are cumulative (adaptive) quadratures, and since the derivative of the
+        conformal time is known exactly (1/a), the table is interpolated with a cubic Hermite spline (error of order h^4). The inverse t(eta)
+        is interpolated in the same way (its derivative being a). The number of knots is doubled until the error at the middle points of the
+        table (which become the new knots) is smaller than the requested tolerance. If the maximum number of knots is reached first, a warning
+        reports the error of the table.
+
+    Parameters:
+        a (callable): vectorized scale factor.
+        TimeRange (2D float tuple): lower and upper time bounds of the table.
+        tol (float): requested absolute error of the table.
+        MaxKnots (int): maximum number of intervals of the table.
+
+    Returns:
+        Eta (callable): vectorized conformal time eta(t) (CubicHermiteSpline).
+        InverseEta (callable): vectorized inverse conformal time t(eta) (CubicHermiteSpline).
+    """
+
+    inv_a = lambda t: 1/a(t)
+    T_inf, T_sup = TimeRange
+
+    n = 16 #Initial number of intervals
+    knots = np.linspace(T_inf, T_sup, n+1)
+    eta = np.concatenate(([0.0], np.cumsum([quad(inv_a, knots[i], knots[i+1])[0] for i in range(n)]))) #Cumulative conformal time
+
+    while True:
+        Eta = CubicHermiteSpline(knots, eta, inv_a(knots))
+        InverseEta = CubicHermiteSpline(eta, knots, a(knots))
+
+        #Conformal time at the middle points of the table, computed by quadrature from the previous knot
+        middle = (knots[:-1]+knots[1:])/2
+        eta_middle = eta[:-1]+np.array([quad(inv_a, knots[i], middle[i])[0] for i in range(n)])
+
+        error = max(np.max(np.abs(Eta(middle)-eta_middle)), np.max(np.abs(InverseEta(eta_middle)-middle)/a(middle)))
+        if error <= tol: break
+        if 2*n > MaxKnots: #The table can not be refined any more, its error is reported
+            warnings.warn(f'Conformal time table stopped at {n} intervals (MaxKnots={MaxKnots}) with an error of {error:.3g}, above the '
+                          f'requested tolerance {tol:.3g}.', RuntimeWarning, stacklevel=2)
+            break
+
+        #The middle points become new knots of the table
+        knots = np.insert(knots, np.arange(1, n+1), middle)
+        eta = np.insert(eta, np.arange(1, n+1), eta_middle)
+        n *= 2
+
+    return Eta, InverseEta
+
+
+###################################
+
+
+
+def ScaleIntegralFunction(ScaleType: str, ScaleParameters: dict) -> 'callable':
+    """
+    ScaleIntegralFunction function:
+        Returns the time integral of the scale factor, A(t) = int a(t) dt (up to an additive constant), as a vectorized closed form function.
+        Together with SpaceIntegral, it gives the volume of any rectangular region, since the FLRW volume element a(t)/sqrt(1-k*r^2) is
+        separable.
+
+    Parameters:
+        ScaleType (str): functional form of the scale factor (see ClassifyScaleFactor).
+        ScaleParameters (dict): parameters of the functional form.
+
+    Returns:
+        ScaleIntegral (callable): A(t), None if there is no closed form.
+    """
+
+    if ScaleType == 'constant':
+        a0 = ScaleParameters['a0']
+        return lambda t: a0*np.asarray(t, dtype=np.float64)
+
+    if ScaleType == 'power':
+        c, p = ScaleParameters['c'], ScaleParameters['p']
+        if p == -1: #Logarithmic integral
+            return lambda t: c*np.log(t)
+        return lambda t: c*np.power(t, p+1)/(p+1)
+
+    if ScaleType == 'exponential':
+        c, H = ScaleParameters['c'], ScaleParameters['H']
+        return lambda t: c*np.exp(H*np.asarray(t, dtype=np.float64))/H
+
+    return None #Generic scale factors have no closed form integral
+
+
+###################################
+
+
+
+def SpaceIntegral(kappa: int, r: 'np.ndarray') -> 'np.ndarray':
+    """
+    SpaceIntegral function:
+        Closed form space integral of the volume element, S(r) = int dr/sqrt(1-k*r^2), which is r, asinh(r) or asin(r) for kappa = 0, -1, 1
+        respectively (the conformal distance).
+
+    Parameters:
+        kappa (int): space curvature constant (-1,0,1).
+        r (float array): radial coordinates.
+
+    Returns:
+        S (float array): space integral at each radial coordinate.
+    """
+
+    r = np.asarray(r, dtype=np.float64)
+    if kappa == 0: return r
+    if kappa == -1: return np.arcsinh(r)
+    return np.arcsin(r)
+
+
+###################################
+
+
+
+def ExpressionScaleFactor(expression: str, t: 'symbol') -> 'expression':
+    """
+    ExpressionScaleFactor function:
+        Evaluates a scale factor written as a string (i.e. str(a(t))) at a given (symbolic) time. Unlike the lambda functions given by the
+        user, functools.partial(ExpressionScaleFactor, expression) can be pickled, so a MetricTensor can be sent to other processes.
+
+    Parameters:
+        expression (str): scale factor written with sympy functions of the time 't'.
+        t (symbol): (symbolic) time at which the scale factor is evaluated.
+
+    Returns:
+        _ (symbolic expression): scale factor at time t.
+    """
+
+    return sympify(expression).subs(symbols('t'), t)
@@ -0,0 +1,179 @@
+"""
+Parallel_Module.py module
+
+This module contains the process pool version of the link construction of a causet. The (time sorted) points are mapped to conformal
+coordinates once, and both the coordinates and the bit packed causal matrix are placed in shared memory, so that the worker processes read
+and write them directly instead of receiving pickled copies. The causal matrix is computed by blocks of rows, and then each block of points is
+transitively reduced in parallel; results are merged in the order of the blocks, so the CSR adjacency is the same as the serial one.
+
+Functions:
+    SharedArray: Given a shape and a data type, this function creates a numpy array placed in shared memory.
+    AttachArray: Given the description of a shared array, this function maps it into the memory of the current process.
+    ParallelLinksCSR: Given a manifold metric and a sorted array of points, this function computes the links of the causet using a process pool.
+
+Author: Cano Jones, Alejandro
+linkedin: www.linkedin.com/in/alejandro-cano-jones-5b20a7136
+github: https://github.com/Cano-Jones
+"""
+
+#Libraries used
+from __future__ import annotations #Dedicated to function typing
+from typing import TYPE_CHECKING #Dedicated to function typing
+if TYPE_CHECKING:
+    from .Class_Objects import *
+
+import os #Number of available cores
+import numpy as np #Vectorized computations
+from concurrent.futures import ProcessPoolExecutor #Process pool
+from multiprocessing import shared_memory #Arrays shared between processes
+from .Causal_Structure import ConformalCoordinates, CausalMatrixRows, TransitiveReductionRows, GetLinksCSR
+
+_Shared = {} #Shared arrays attached by each worker process (filled by _InitWorker)
+
+
+###################################
+
+
+
+def SharedArray(shape: tuple[int], dtype: type) -> tuple[shared_memory.SharedMemory, np.ndarray, tuple]:
+    """
+    SharedArray function:
+        Creates a zero filled numpy array placed in a shared memory block, which other processes can map with AttachArray.
+
+    Parameters:
+        shape (int tuple): shape of the array.
+        dtype (numpy type): data type of the array.
+
+    Returns:
+        block (SharedMemory): shared memory block (it must be closed and unlinked by the creator once it is no longer needed).
+        array (numpy array): array placed in the shared memory block.
+        spec (tuple): (name, shape, dtype) description of the array, to be sent to other processes.
+    """
+
+    size = max(1, int(np.prod(shape))*np.dtype(dtype).itemsize) #Shared memory blocks can not be empty
+    block = shared_memory.SharedMemory(create=True, size=size)
+    array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    array[...] = 0
+
+    return block, array, (block.name, shape, np.dtype(dtype).str)
+
+
+###################################
+
+
+
+def AttachArray(spec: tuple) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    AttachArray function:
+        Maps into the current process an array created with SharedArray (no data is copied).
+
+    Parameters:
+        spec (tuple): (name, shape, dtype) description of the shared array.
+
+    Returns:
+        block (SharedMemory): shared memory block (it must be kept alive while the array is used).
+        array (numpy array): array placed in the shared memory block.
+    """
+
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+###################################
+
+
+
+def _InitWorker(specs: dict) -> None:
+    """
+    _InitWorker function:
+        Initializer of the worker processes, it attaches every shared array once per process.
+
+    Parameters:
+        specs (dict): description of each shared array (see SharedArray), by name.
+    """
+
+    for key, spec in specs.items():
+        _Shared[key] = AttachArray(spec)
+
+
+def _MatrixWorker(kappa: int, start: int, stop: int) -> None:
+    """
+    _MatrixWorker function:
+        Computes a block of rows of the causal matrix and writes it into the shared matrix.
+    """
+
+    eta, chi, Matrix = _Shared['eta'][1], _Shared['chi'][1], _Shared['Matrix'][1]
+    Matrix[start:stop] = CausalMatrixRows(kappa, eta, chi, start, stop)
+
+
+def _ReductionWorker(start: int, stop: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    _ReductionWorker function:
+        Computes the links of a block of points from the shared causal matrix.
+    """
+
+    return TransitiveReductionRows(_Shared['Matrix'][1], start, stop)
+
+
+###################################
+
+
+
+def ParallelLinksCSR(Metric: MetricTensor, Points: np.ndarray, TimeRange: tuple[float] = None, BlockSize: int = None,
+                     workers: int = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ParallelLinksCSR function:
+        Computes the links of a causet (sorted by time) as a CSR adjacency, distributing the work among a pool of processes. First, every
+        worker computes blocks of rows of the (bit packed) causal matrix into shared memory; then, every worker reduces blocks of points
+        (see TransitiveReductionRows). Early points have larger futures, so the points are split in many more blocks than workers, which are
+        taken by the workers as they become free. The blocks are merged in order, so the result is identical to GetLinksCSR.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time (see SortCauset).
+        TimeRange (2D float tuple): time range of the simulation, used to select the conformal time table (if there is no closed form).
+        BlockSize (int): number of rows of the causal matrix computed by each task.
+        workers (int): number of worker processes (if none is given, the number of available cores is used).
+
+    Returns:
+        indptr (int array): CSR index pointer, the links of point i are indices[indptr[i]:indptr[i+1]].
+        indices (int array): CSR indices, (time sorted) index of the future point of each link.
+    """
+
+    if workers is None: workers = os.cpu_count() or 1
+    N = len(Points)
+    if workers <= 1 or N < 2: return GetLinksCSR(Metric, Points, TimeRange=TimeRange, BlockSize=BlockSize) #Serial computation
+
+    if BlockSize is None: BlockSize = max(1, 2**20//N) #Small blocks keep the temporary arrays in cache
+    chunk = max(1, -(-N//(16*workers))) #Points reduced by each task
+
+    eta, chi = ConformalCoordinates(Metric, Points, TimeRange) #The metric itself is not sent to the workers
+
+    blocks, specs = [], {}
+    try:
+        for key, shape, dtype in (('eta', (N,), np.float64), ('chi', (N,), np.float64), ('Matrix', (N, (N+7)//8), np.uint8)):
+            block, array, specs[key] = SharedArray(shape, dtype)
+            blocks.append(block)
+            if key == 'eta': array[:] = eta
+            elif key == 'chi': array[:] = chi
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_InitWorker, initargs=(specs,)) as pool:
+            #Causal matrix, by blocks of rows
+            starts = range(0, N, BlockSize)
+            list(pool.map(_MatrixWorker, [Metric.kappa]*len(starts), starts, [min(start+BlockSize, N) for start in starts]))
+
+            #Transitive reduction, by blocks of points (map returns the results in the order of the blocks)
+            starts = range(0, N, chunk)
+            results = list(pool.map(_ReductionWorker, starts, [min(start+chunk, N) for start in starts]))
+
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    indptr = np.zeros(N+1, dtype=np.int64)
+    np.cumsum(np.concatenate([counts for counts, _ in results]), out=indptr[1:])
+    indices = np.concatenate([links for _, links in results])
+
+    return indptr, indices
@@ -64,7 +64,7 @@ def PrintCauset(Causet: set=set(), directory: str = None) -> None:
 ###################################################
 
 
-def PrintHaseDiagram(links: dict={}, directory: str = None):
+def PrintHaseDiagram(links: dict={}, directory: str = None, past: bool = False):
     """
     PrintHaseDiagram function
         This functions draws a grafical representation (Hase Diagram) of the causal relation between causet points. If an arrow connects two
@@ -73,14 +73,19 @@ def PrintHaseDiagram(links: dict={}, directory: str = None):
     
         Parameters:
             links (dict): dictionary describing causal links. For a given point (the key) the value of the dictionary is a set of points causaly connected to.
+                An iterable of (point, linked points) pairs is also accepted, so links can be drawn as they are generated (see StreamLinks).
             directory (str): Name of the directory for the image to be saved on (if none is given, the image is not saved, only showed).
+            past (bool): If True, the linked points are in the past of each point (as generated by StreamLinks), instead of in its future.
 
     """
     
+    pairs = links.items() if isinstance(links, dict) else links #Each point and its linked points
+
     #In this loop we draw the arros connecting points
-    for p in links.keys(): #For each point in the causet
-        for link in links[p]: #For each point causally conected to point p
-            plt.arrow(p[1], p[0], link[1]-p[1], link[0]-p[0], length_includes_head=True, alpha=0.1) #Arrow drawn
+    for p, linked in pairs: #For each point in the causet
+        for link in linked: #For each point causally conected to point p
+            start, end = (link, p) if past else (p, link) #Arrows always point to the future
+            plt.arrow(start[1], start[0], end[1]-start[1], end[0]-start[0], length_includes_head=True, alpha=0.1) #Arrow drawn
 
     #Axis labeling and format
     plt.axis('equal')
@@ -0,0 +1,311 @@
+"""
+Storage_Module.py module
+
+This module contains the functions of the on-disk storage of causets and links: memory mapped arrays, which let causets larger than the
+available memory be processed by blocks, and an on-disk cache of causets and links. Every entry is a .npz file named after a hash of its content
+description: a sprinkled causet is identified by the parameters of its simulation (metric, spacetime region, point number, divisions, seed
+and sprinkling method), and its links by the metric and the points of the causet themselves (so that points added after the sprinkling, as
+the source and tarjet of a geodesic, give a different entry). Entries are evicted in least recently used order once the cache exceeds a
+given size.
+
+Functions:
+    SimulationKey: Given a simulation and a sprinkling method, this function computes the key of its causet.
+    LinksKey: Given a manifold metric and an array of points, this function computes the key of their links.
+    CacheLoad: Given a cache directory and a key, this function loads the arrays of the entry (if it exists).
+    CacheSave: Given a cache directory, a key and some arrays, this function stores them as a new entry.
+    CacheEvict: Given a cache directory and a maximum size, this function removes the least recently used entries.
+    MappedArray: Given a directory, a name, a shape and a data type, this function creates a memory mapped .npy array.
+    StreamArray: Given a directory, a name and an iterable of arrays, this function writes them consecutively into a memory mapped .npy array.
+    OpenArray: Given a directory and a name, this function opens a stored .npy array as a memory map.
+    SaveArray: Given a directory, a name and an array, this function stores the array as a .npy file (unless it is already mapped from it).
+
+Author: Cano Jones, Alejandro
+linkedin: www.linkedin.com/in/alejandro-cano-jones-5b20a7136
+github: https://github.com/Cano-Jones
+"""
+
+#Libraries used
+from __future__ import annotations #Dedicated to function typing
+from typing import TYPE_CHECKING #Dedicated to function typing
+if TYPE_CHECKING:
+    from .Class_Objects import *
+
+import os #Files of the cache
+import json #Canonical description of the keys
+import hashlib #Content addressing
+import numpy as np #Arrays of the entries
+
+
+###################################
+
+
+
+def SimulationKey(sim: CausetSimulation, method: str) -> str:
+    """
+    SimulationKey function:
+        Computes the key of the causet sprinkled by a simulation: a hash of the metric (kappa and the symbolic form of the scale factor), the
+        spacetime region, the point number, the divisions, the seed and the sprinkling method. Simulations without seed are not reproducible,
+        so they have no key.
+
+    Parameters:
+        sim (CausetSimulation class): simulation whose causet is identified.
+        method (str): sprinkling method (see CausetSimulation.CreateCauset).
+
+    Returns:
+        key (str): hexadecimal key of the causet (None if the simulation has no seed).
+    """
+
+    seq = sim.SeedSequence
+    if seq is None: return None
+
+    entropy = int(seq.entropy) if np.ndim(seq.entropy) == 0 else [int(e) for e in seq.entropy] #Entropy can be an int or a sequence of ints
+    description = {'Causet': 1, 'kappa': int(sim.Metric.kappa), 'a': sim.Metric.Expression,
+                   'TimeRange': [float(t) for t in sim.TimeRange], 'SpaceRange': [float(r) for r in sim.SpaceRange],
+                   'PointNumber': float(sim.PointNumber), 'Divisions': [int(d) for d in sim.Divisions],
+                   'seed': [entropy, [int(k) for k in seq.spawn_key]], 'method': method}
+
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+###################################
+
+
+
+def LinksKey(Metric: MetricTensor, Points: np.ndarray) -> str:
+    """
+    LinksKey function:
+        Computes the key of the links of a causet: a hash of the metric (kappa and the symbolic form of the scale factor) and of the (time
+        sorted) points of the causet.
+
+    Parameters:
+        Metric (MetricTensor class): class description of the (1+1) FLRW metric manifold.
+        Points (2D float array): (N,2) array of points sorted by time.
+
+    Returns:
+        key (str): hexadecimal key of the links.
+    """
+
+    description = {'Links': 1, 'kappa': int(Metric.kappa), 'a': Metric.Expression}
+    digest = hashlib.sha256(json.dumps(description, sort_keys=True).encode())
+    digest.update(np.ascontiguousarray(Points, dtype=np.float64).tobytes()) #The points themselves are part of the key
+
+    return digest.hexdigest()
+
+
+###################################
+
+
+
+def CacheLoad(directory: str, key: str) -> dict:
+    """
+    CacheLoad function:
+        Loads the arrays of a cache entry. The access time of the entry is updated, so it becomes the most recently used one.
+
+    Parameters:
+        directory (str): directory of the cache.
+        key (str): key of the entry.
+
+    Returns:
+        arrays (dict): arrays of the entry, by name (None if the entry does not exist).
+    """
+
+    if key is None: return None
+    path = os.path.join(directory, key+'.npz')
+
+    try:
+        with np.load(path) as entry:
+            arrays = {name: entry[name] for name in entry.files}
+        os.utime(path) #Most recently used entry
+    except FileNotFoundError: #Missing (or evicted) entry
+        return None
+
+    return arrays
+
+
+###################################
+
+
+
+def CacheSave(directory: str, key: str, MaxSize: int = None, **arrays: np.ndarray) -> None:
+    """
+    CacheSave function:
+        Stores some arrays as a cache entry (.npz file). The file is written under a temporary name and then renamed, so an interrupted write
+        never leaves a corrupted entry. The least recently used entries are removed if the cache exceeds its maximum size.
+
+    Parameters:
+        directory (str): directory of the cache (created if needed).
+        key (str): key of the entry.
+        MaxSize (int): maximum size of the cache in bytes (if none is given, entries are never removed).
+        arrays (numpy arrays): arrays of the entry, by name.
+    """
+
+    if key is None: return
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, key+'.npz')
+
+    temporary = path+f'.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        np.savez(file, **arrays)
+    os.replace(temporary, path)
+
+    if MaxSize is not None: CacheEvict(directory, MaxSize, keep=key)
+
+
+###################################
+
+
+
+def CacheEvict(directory: str, MaxSize: int, keep: str = None) -> None:
+    """
+    CacheEvict function:
+        Removes the least recently used entries of a cache until its size is below a maximum.
+
+    Parameters:
+        directory (str): directory of the cache.
+        MaxSize (int): maximum size of the cache in bytes.
+        keep (str): key of an entry that must not be removed (i.e. the one just stored).
+    """
+
+    if not os.path.isdir(directory): return
+
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith('.npz'):
+            try:
+                status = os.stat(os.path.join(directory, name))
+            except FileNotFoundError: #Removed by another process
+                continue
+            entries.append((status.st_mtime, status.st_size, name))
+
+    size = sum(entry[1] for entry in entries)
+    for _, entry_size, name in sorted(entries): #Oldest entries first
+        if size <= MaxSize: break
+        if name == f'{keep}.npz': continue
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError: #Removed by another process
+            pass
+        size -= entry_size
+
+
+###################################
+
+
+
+def MappedArray(directory: str, name: str, shape: tuple[int], dtype: type) -> np.memmap:
+    """
+    MappedArray function:
+        Creates a (zero filled) array stored in a .npy file and mapped into memory: only the pages being used are kept in RAM, so it can be
+        larger than the available memory.
+
+    Parameters:
+        directory (str): directory of the file (created if needed).
+        name (str): name of the array (the file is name.npy).
+        shape (int tuple): shape of the array.
+        dtype (numpy type): data type of the array.
+
+    Returns:
+        array (memmap): writable memory mapped array.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name+'.npy')
+    if os.path.exists(path): os.remove(path) #A previous array is unlinked (not truncated), so existing memory maps of it remain valid
+
+    return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=tuple(shape))
+
+
+###################################
+
+
+
+def StreamArray(directory: str, name: str, blocks: 'iterable', dtype: type, BlockSize: int = 2**20) -> np.memmap:
+    """
+    StreamArray function:
+        Writes a sequence of 1D arrays (of unknown total length) consecutively into a memory mapped .npy array. Blocks are first appended to a
+        raw file, and once the total length is known they are copied into the .npy file by chunks, so only one block is in memory at a time.
+
+    Parameters:
+        directory (str): directory of the file (created if needed).
+        name (str): name of the array (the file is name.npy).
+        blocks (iterable of arrays): consecutive parts of the array.
+        dtype (numpy type): data type of the array.
+        BlockSize (int): number of elements copied at once.
+
+    Returns:
+        array (memmap): read only memory mapped array.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    raw = os.path.join(directory, name+'.raw')
+
+    size = 0
+    with open(raw, 'wb') as file:
+        for block in blocks:
+            block = np.ascontiguousarray(block, dtype=dtype)
+            file.write(block.tobytes())
+            size += block.size
+
+    array = MappedArray(directory, name, (size,), dtype)
+    if size:
+        source = np.memmap(raw, dtype=dtype, mode='r', shape=(size,))
+        for start in range(0, size, BlockSize):
+            array[start:start+BlockSize] = source[start:start+BlockSize]
+        del source
+    array.flush()
+    del array
+    os.remove(raw)
+
+    return OpenArray(directory, name)
+
+
+###################################
+
+
+
+def OpenArray(directory: str, name: str, mode: str = 'r') -> np.memmap:
+    """
+    OpenArray function:
+        Opens an array stored in a .npy file as a memory map (no data is read until it is used).
+
+    Parameters:
+        directory (str): directory of the file.
+        name (str): name of the array (the file is name.npy).
+        mode (str): 'r' (read only), 'r+' (read and write) or 'c' (copy on write).
+
+    Returns:
+        array (memmap): memory mapped array (None if the file does not exist).
+    """
+
+    path = os.path.join(directory, name+'.npy')
+    if not os.path.exists(path): return None
+    return np.load(path, mmap_mode=mode)
+
+
+###################################
+
+
+
+def SaveArray(directory: str, name: str, array: np.ndarray) -> None:
+    """
+    SaveArray function:
+        Stores an array in a .npy file, which can then be opened as a memory map (see OpenArray). If the array is already a memory map of that
+        same file, it is only flushed (overwriting the file would destroy the data being read).
+
+    Parameters:
+        directory (str): directory of the file (created if needed).
+        name (str): name of the array (the file is name.npy).
+        array (numpy array): array to be stored.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name+'.npy')
+
+    if isinstance(array, np.memmap) and array.filename is not None and os.path.abspath(array.filename) == os.path.abspath(path):
+        if array.mode != 'r': array.flush()
+        return
+
+    temporary = path+f'.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        np.save(file, array)
+    os.replace(temporary, path)
@@ -12,7 +12,11 @@ factor and space curvature), simulation parameters (incluiding point number, spa
 spacetime subdivisions) & a continuum geodesic (can be computed using the provided functions).
 
 A proper expansion of this project should include a Xi^2 study prooving the correspondence
-between the continuum and the causet simulation; this is not provided in this library.
+between the continuum and the causet simulation. The Ensemble method of CausetSimulation (see
+Ensemble_Module) runs the independent sprinklings such study needs, recording the deviation of
+the causet geodesics from the continuum one for each of them, and the Deviation method computes
+the RMS, Xi^2, maximum deviation and endpoint mismatch of every chain (of a causet or of a whole
+ensemble) at once.
 
 Author: Cano Jones, Alejandro
 linkedin: www.linkedin.com/in/alejandro-cano-jones-5b20a7136